@@ -0,0 +1,42 @@
+# compare the previous .loc based clean_df with the schema-driven encoder on large frames
+# usage: python bench/bench_clean_df.py [rows]
+
+import sys
+import time
+import pandas as pd
+from src.core.model.conversion import BINARY_COLUMNS, clean_df
+
+def legacy_clean_df(df: pd.DataFrame) -> pd.DataFrame:
+    df_clean = df.copy()
+    for col in BINARY_COLUMNS:
+        df_clean.loc[df_clean[col] == "yes", col] = "1"
+        df_clean.loc[df_clean[col] == "no", col] = "0"
+    return df_clean
+
+def timed(func, repeat: int = 3) -> tuple:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def memory_mb(frame: pd.DataFrame) -> float:
+    return frame.memory_usage(deep=True).sum() / 1e6
+
+def main(rows: int) -> None:
+    housing = pd.read_csv("src/config/housing.csv")
+    frame = pd.concat([housing] * (rows // len(housing) + 1), ignore_index=True).iloc[:rows].copy()
+
+    legacy_time, legacy = timed(lambda: legacy_clean_df(frame))
+    copy_time, encoded = timed(lambda: clean_df(frame))
+    inplace_time, _ = timed(lambda: clean_df(frame.copy(), inplace=True), repeat=1)
+
+    print(f"rows={rows} input={memory_mb(frame):.1f}MB")
+    print(f"legacy .loc + object strings: {legacy_time * 1000:8.1f} ms  output={memory_mb(legacy):8.1f}MB")
+    print(f"schema encoder (shallow copy): {copy_time * 1000:7.1f} ms  output={memory_mb(encoded):8.1f}MB  ({legacy_time / copy_time:.1f}x)")
+    print(f"schema encoder (inplace, incl. copy): {inplace_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,43 @@
+# artifact size, serialize time and load time of a fitted model for every format and compression
+# usage: python bench/bench_model_serialization.py [features] [targets]
+
+import sys
+import time
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from src.core.model.serialization import deserialize, lz4, serialize, zstandard
+
+def timed(func, repeat: int = 5) -> tuple:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def specs() -> list:
+    codecs = ["none", "zlib-1", "zlib-6"]
+    if lz4 is not None:
+        codecs += ["lz4-0", "lz4-9"]
+    if zstandard is not None:
+        codecs += ["zstd-1", "zstd-3", "zstd-9"]
+    return [{"format": fmt, "compression": codec} for fmt in ("joblib", "npz") for codec in codecs]
+
+def main(features: int, targets: int) -> None:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(features + 100, features))
+    # rounded coefficients, like a model trained on integer prices, leave the codecs something to find
+    y = x @ np.round(rng.normal(size=(features, targets)), 2)
+    model = LinearRegression().fit(x, y)
+    print(f"LinearRegression features={features} targets={targets} coef={model.coef_.nbytes / 1e6:.1f}MB")
+    print(f"{'format':8} {'compression':12} {'size MB':>9} {'write ms':>9} {'load ms':>9}")
+
+    for spec in specs():
+        write_time, data = timed(lambda: serialize(model, spec))
+        load_time, loaded = timed(lambda: deserialize(data, spec))
+        assert np.array_equal(loaded.coef_, model.coef_)
+        print(f"{spec['format']:8} {spec['compression']:12} {len(data) / 1e6:9.2f} {write_time * 1000:9.1f} {load_time * 1000:9.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,44 @@
+# compare parse time and peak memory of the ingestion csv read: inferred dtypes vs the declared schema
+# usage: python bench/bench_read_csv.py [rows]
+
+import io
+import multiprocessing
+import resource
+import sys
+import time
+import pandas as pd
+from src.core.dataset.schema import read_dataset
+from src.core.model.train_test_split import FEATURE_COLUMNS
+
+VARIANTS = {
+    "inferred, all columns (previous)": lambda body: pd.read_csv(body),
+    "schema, training columns, c": lambda body: read_dataset(body, columns=FEATURE_COLUMNS + ["price"], engine="c"),
+    "schema, training columns, pyarrow": lambda body: read_dataset(body, columns=FEATURE_COLUMNS + ["price"], engine="pyarrow"),
+    "schema, all columns, pyarrow": lambda body: read_dataset(body, engine="pyarrow")
+}
+
+def run(name: str, raw: bytes, results) -> None:
+    # each variant runs in a fresh process so ru_maxrss is its own peak
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    frame = VARIANTS[name](io.BytesIO(raw))
+    elapsed = time.perf_counter() - start
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024
+    results.put((name, elapsed, peak, frame.memory_usage(deep=True).sum() / 1e6))
+
+def main(rows: int) -> None:
+    housing = pd.read_csv("src/config/housing.csv")
+    raw = pd.concat([housing] * (rows // len(housing) + 1), ignore_index=True).iloc[:rows].to_csv(index=False).encode()
+    print(f"rows={rows} csv={len(raw) / 1e6:.1f}MB")
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    for name in VARIANTS:
+        process = context.Process(target=run, args=(name, raw, results))
+        process.start()
+        name, elapsed, peak, frame_mb = results.get()
+        process.join()
+        print(f"{name:36s} {elapsed * 1000:8.1f} ms  peak +{peak:7.1f}MB  frame={frame_mb:7.1f}MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,39 @@
+# compare default fastapi json serialization with FastJSONResponse, and gzip vs zstd payload sizes
+# usage: python bench/bench_serialization.py [rows]
+
+import gzip
+import sys
+import time
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from src.config.compression import FastJSONResponse, zstandard
+
+def timed(func, repeat: int = 5) -> tuple:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(rows: int) -> None:
+    housing = pd.read_csv("src/config/housing.csv", dtype=str, keep_default_na=False)
+    frame = pd.concat([housing] * (rows // len(housing) + 1), ignore_index=True).iloc[:rows]
+    payload = {"row_count": len(frame), "values": frame.to_dict(orient="records")}
+
+    default_time, default_body = timed(lambda: JSONResponse(jsonable_encoder(payload)).body)
+    fast_time, fast_body = timed(lambda: FastJSONResponse(payload).body)
+    print(f"rows={rows} body={len(fast_body) / 1e6:.1f}MB")
+    print(f"default JSONResponse + jsonable_encoder: {default_time * 1000:8.1f} ms")
+    print(f"FastJSONResponse (orjson):               {fast_time * 1000:8.1f} ms  ({default_time / fast_time:.1f}x)")
+
+    gzip_time, gzipped = timed(lambda: gzip.compress(fast_body, compresslevel=6), repeat=3)
+    print(f"gzip level 6: {gzip_time * 1000:8.1f} ms  {len(gzipped) / 1e6:.2f}MB")
+    if zstandard is not None:
+        zstd_time, zstded = timed(lambda: zstandard.ZstdCompressor(level=3).compress(fast_body), repeat=3)
+        print(f"zstd level 3: {zstd_time * 1000:8.1f} ms  {len(zstded) / 1e6:.2f}MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
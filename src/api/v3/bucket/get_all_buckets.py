@@ -1,14 +1,18 @@
 from fastapi import APIRouter
 from src.config.client import config
+from src.config.storage import cached_io
 
 router = APIRouter(prefix="/bucket", tags=["buckets"])
 
+def list_bucket_names(s3_client) -> list:
+    response = s3_client.list_buckets()
+    return [bucket["Name"] for bucket in response.get("Buckets", [])]
+
 @router.get("/get-all-buckets")
 async def get_all_buckets():
     clients=config()
     s3_client = clients["s3"]
     
-    response = s3_client.list_buckets()
-    buckets = [bucket["Name"] for bucket in response.get("Buckets", [])]
+    buckets = await cached_io(("buckets",), list_bucket_names, s3_client)
     
-    return {"buckets": buckets}
\ No newline at end of file
+    return {"buckets": buckets}
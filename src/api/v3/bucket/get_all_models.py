@@ -1,24 +1,69 @@
-from fastapi import APIRouter
-from src.config.client import config
+import asyncio
+from fastapi import APIRouter, Query
+from src.config.client import config, env_number
+from src.config.compression import FastJSONResponse
+from src.config.logger import get_logger
+from src.config.storage import cached_io
+from src.api.v3.bucket.get_all_buckets import list_bucket_names
 
 router = APIRouter(prefix="/bucket", tags=["buckets"])
 
+def list_bucket_objects(s3_client, bucket_name: str, prefix: str = "", suffix: str = None) -> list:
+    # the paginator follows continuation tokens, a single list_objects_v2 call stops at 1000 keys
+    paginator = s3_client.get_paginator("list_objects_v2")
+    objects = []
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            if suffix and not obj["Key"].endswith(suffix):
+                continue
+            last_modified = obj.get("LastModified")
+            objects.append({
+                "bucket": bucket_name,
+                "model": obj["Key"],
+                "size": obj.get("Size"),
+                "last_modified": last_modified.isoformat() if last_modified else None,
+                "etag": obj.get("ETag", "").strip('"') or None
+            })
+    return objects
+
 @router.get("/get-all-models")
-async def get_all_models():
+async def get_all_models(
+    prefix: str = "",
+    suffix: str = Query(None, description="only keep keys ending with it, e.g. .joblib"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(None, ge=1)
+):
+    logger = get_logger("get-all-models")
     clients=config()
     s3_client = clients["s3"]
     
-    response = s3_client.list_buckets()
-    buckets = [bucket["Name"] for bucket in response.get("Buckets", [])]
-    
+    buckets = await cached_io(("buckets",), list_bucket_names, s3_client)
+
+    semaphore = asyncio.Semaphore(env_number("listing_concurrency", 8))
+
+    async def list_bucket(bucket_name: str) -> list:
+        async with semaphore:
+            return await cached_io(("models", bucket_name, prefix, suffix), list_bucket_objects, s3_client, bucket_name, prefix, suffix)
+
+    listings = await asyncio.gather(*[list_bucket(bucket_name) for bucket_name in buckets], return_exceptions=True)
+
     all_models = []
-    for bucket_name in buckets:
-        try:
-            objects = s3_client.list_objects_v2(Bucket=bucket_name)
-            if 'Contents' in objects:
-                models = [obj['Key'] for obj in objects['Contents']]
-                all_models.extend([{"bucket": bucket_name, "model": model} for model in models])
-        except Exception:
+    errors = []
+    for bucket_name, listing in zip(buckets, listings):
+        if isinstance(listing, Exception):
+            logger.warning(f"could not list bucket {bucket_name} - {listing}")
+            errors.append({"bucket": bucket_name, "error": str(listing)})
             continue
+        all_models.extend(listing)
+
+    end = offset + limit if limit else None
+    next_offset = end if end is not None and end < len(all_models) else None
     
-    return {"models": all_models}
\ No newline at end of file
+    return FastJSONResponse({
+        "models": all_models[offset:end],
+        "total": len(all_models),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset,
+        "errors": errors
+    })
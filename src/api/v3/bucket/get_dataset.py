@@ -1,30 +1,101 @@
-from fastapi import APIRouter
-from src.config.client import config
-import csv
-from io import StringIO
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from src.config.client import config, env_number
+from src.config.compression import FastJSONResponse
+from src.config.storage import run_io
+from src.api.v3.conditional import representation_etag, cache_headers, not_modified
+from src.core.dataset.formats import MEDIA_TYPES, BINARY_FORMATS, ENCODERS, negotiate, infer_types, to_columnar
+from src.core.dataset.cache import cached_dataset, dataset_cache, load_dataset
+from src.core.dataset.parquet import read_parquet_rows
+from src.core.dataset.query import parse_columns, parse_filters, query_frame
+from src.core.dataset.reader import read_rows, stream_ndjson
 
 router = APIRouter(prefix="/bucket", tags=["buckets"])
 
+def response_headers(metadata: dict, variant: tuple) -> dict:
+    headers = cache_headers(metadata, representation_etag(metadata.get("ETag"), *variant))
+    headers["Vary"] = "Accept"
+    return headers
+
+def json_response(result: dict, rows, output: str, headers: dict) -> FastJSONResponse:
+    # shaping the rows and rendering the body are both proportional to the result size, so they run on the io pool
+    if output == "columnar":
+        result.update(to_columnar(infer_types(rows)))
+        return FastJSONResponse(result, media_type=MEDIA_TYPES["columnar"], headers=headers)
+    result["values"] = rows.to_dict(orient="records")
+    return FastJSONResponse(result, headers=headers)
+
 @router.get("/dataset")
-async def get_dataset():
+async def get_dataset(
+    request: Request,
+    bucket: str = "local-ml-flow-data",
+    key: str = "housing.csv",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(None, ge=1),
+    columns: str = Query(None, description="comma separated list of columns to return"),
+    filters: list[str] = Query([], alias="filter", description="predicate such as bedrooms>=3 or mainroad=yes, repeatable"),
+    output: str = Query(None, alias="format", pattern="^(json|ndjson|columnar|arrow|parquet)$", description="overrides the Accept header")
+):
+    output = output or negotiate(request.headers.get("accept"))
+    try:
+        query = {"columns": parse_columns(columns), "filters": parse_filters(filters), "offset": offset, "limit": limit}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     clients = config()
     s3_client = clients["s3"]
-        
-    bucket_name = "local-ml-flow-data"
-    key = "housing.csv"
-        
-    response = s3_client.get_object(Bucket=bucket_name, Key=key)
-    data = response['Body'].read().decode('utf-8')
-                
-    csv_reader = csv.DictReader(StringIO(data))
-    values = list(csv_reader)
-        
-    return {
-        "dataset_name": "housing.csv",
-        "bucket": bucket_name,
+    variant = (output, columns, tuple(filters), offset, limit)
+
+    head = None
+    if request.headers.get("if-none-match"):
+        head = await run_io(s3_client.head_object, Bucket=bucket, Key=key)
+        unchanged = not_modified(request, representation_etag(head.get("ETag"), *variant), head)
+        if unchanged is not None:
+            unchanged.headers["Vary"] = "Accept"
+            return unchanged
+
+    try:
+        if output == "ndjson":
+            # rows are parsed and sent chunk by chunk, the body is never fully held in memory
+            response = await run_io(s3_client.get_object, Bucket=bucket, Key=key)
+            parts = await stream_ndjson(response["Body"], **query)
+            return StreamingResponse(parts, media_type=MEDIA_TYPES["ndjson"], headers=response_headers(response, variant))
+
+        rows, frame = None, None
+        if dataset_cache().enabled:
+            head = head or await run_io(s3_client.head_object, Bucket=bucket, Key=key)
+            frame, metadata = cached_dataset(bucket, key, "raw", head), head
+        selective = query["columns"] is not None or query["filters"] or query["limit"] is not None
+        if frame is None and selective and env_number("dataset_parquet", 1):
+            # a fresh parquet copy answers projected, filtered or paged queries with ranged reads of what they need,
+            # full reads go through the csv so the parsed frame lands in the dataset cache
+            head = head or await run_io(s3_client.head_object, Bucket=bucket, Key=key)
+            rows, metadata = await run_io(read_parquet_rows, s3_client, bucket, key, head, **query), head
+        if rows is None and dataset_cache().enabled:
+            if frame is None:
+                frame, metadata = await run_io(load_dataset, s3_client, bucket, key, read_rows, "raw", head)
+            # masks and slices over a cached multi-MB frame are cpu work, kept off the event loop
+            rows = await run_io(query_frame, frame, **query)
+        elif rows is None:
+            metadata = await run_io(s3_client.get_object, Bucket=bucket, Key=key)
+            rows = await run_io(read_rows, metadata["Body"], **query)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = response_headers(metadata, variant)
+
+    if output in BINARY_FORMATS:
+        try:
+            content = await run_io(ENCODERS[output], infer_types(rows))
+        except ImportError:
+            raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=f"{output} output requires pyarrow")
+        return Response(content=content, media_type=MEDIA_TYPES[output], headers=headers)
+
+    result = {
+        "dataset_name": key.rsplit("/", 1)[-1],
+        "bucket": bucket,
         "key": key,
-        "row_count": len(values),
-        "values": values
+        "offset": offset,
+        "limit": limit,
+        "row_count": len(rows)
     }
-    
-
+    return await run_io(json_response, result, rows, output, headers)
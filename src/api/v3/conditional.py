@@ -0,0 +1,37 @@
+# http conditional request helpers (ETag / If-None-Match / 304) backed by s3 object metadata
+
+import hashlib
+from email.utils import formatdate
+from fastapi import Request, Response, status
+from src.config.client import env_number
+
+def representation_etag(object_etag: str, *variant) -> str:
+    # same object served with different query / format must not share an etag
+    if not object_etag:
+        return None
+    if not any(variant):
+        return object_etag
+    digest = hashlib.sha1(repr(variant).encode()).hexdigest()[:12]
+    return f'"{object_etag.strip(chr(34))}-{digest}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match or not etag:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # weak comparison, as required for If-None-Match
+    return "*" in candidates or etag.removeprefix("W/") in [candidate.removeprefix("W/") for candidate in candidates]
+
+def cache_headers(metadata: dict, etag: str = None) -> dict:
+    headers = {"Cache-Control": f"max-age={env_number('http_cache_max_age', 0)}, must-revalidate"}
+    etag = etag or metadata.get("ETag")
+    if etag:
+        headers["ETag"] = etag
+    last_modified = metadata.get("LastModified")
+    if last_modified is not None and hasattr(last_modified, "timestamp"):
+        headers["Last-Modified"] = formatdate(last_modified.timestamp(), usegmt=True)
+    return headers
+
+def not_modified(request: Request, etag: str, metadata: dict) -> Response:
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(metadata, etag))
+    return None
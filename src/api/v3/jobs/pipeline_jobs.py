@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from src.core.jobs.queue import JobQueueFull, job_queue
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+def submit(kind: str, priority: str, force: bool, response: Response) -> dict:
+    # force reruns every stage even when the stage fingerprints match the last run
+    params = {"force": True} if force else {}
+    try:
+        job, created = job_queue().submit(kind, params, priority=priority)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e), headers={"Retry-After": "5"})
+
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return {**job, "deduplicated": not created}
+
+@router.post("/ingest")
+def post_ingest_job(response: Response, priority: str = Query("normal", pattern="^(high|normal|low)$"), force: bool = False):
+    return submit("ingest", priority, force, response)
+
+@router.post("/inference")
+def post_inference_job(response: Response, priority: str = Query("normal", pattern="^(high|normal|low)$"), force: bool = False):
+    return submit("inference", priority, force, response)
+
+@router.get("")
+def get_jobs():
+    return {"jobs": job_queue().list(), "stats": job_queue().stats()}
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    job = job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"unknown job '{job_id}'")
+    return job
@@ -1,14 +1,19 @@
 from fastapi import APIRouter
 from src.config.client import config
+from src.config.storage import cached_io
 
 router = APIRouter(prefix="/lambda", tags=["lambdas"])
 
+def list_function_names(lambda_client) -> list:
+    # list_functions returns at most 50 functions per call, the paginator follows NextMarker
+    paginator = lambda_client.get_paginator("list_functions")
+    return [lambdaa["FunctionName"] for page in paginator.paginate() for lambdaa in page.get("Functions", [])]
+
 @router.get("/get-all-lambdas")
 async def get_all_lambdas():
     clients=config()
     lambda_client = clients["lambda"]
     
-    response = lambda_client.list_functions()
-    lambdas = [lambdaa["FunctionName"] for lambdaa in response.get("Functions", [])]
+    lambdas = await cached_io(("lambdas",), list_function_names, lambda_client)
     
-    return {"lambdas": lambdas}
\ No newline at end of file
+    return {"lambdas": lambdas}
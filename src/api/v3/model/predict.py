@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Body, HTTPException, Query, status
+from src.config.compression import FastJSONResponse
+from src.core.model.batching import prediction_batcher
+
+router = APIRouter(prefix="/model", tags=["model"])
+
+@router.post("/predict")
+async def predict(
+    rows: list[dict] = Body(..., embed=True, description="raw housing rows, yes/no values as in housing.csv"),
+    model: str = Query("latest", description="registry alias (latest, champion, ...) or version id")
+):
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="rows must not be empty")
+
+    # concurrent requests are coalesced into one predict call by the micro-batcher
+    try:
+        batcher = await prediction_batcher(model)
+        predictions, served = await batcher.submit(rows)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FastJSONResponse({
+        "model": served["key"],
+        "version": served["version"],
+        "etag": served["etag"],
+        "count": len(predictions),
+        "predictions": predictions.tolist()
+    })
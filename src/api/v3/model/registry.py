@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, status
+from src.config.client import config
+from src.config.storage import run_io
+from src.core.model.registry import load_manifest, set_alias
+
+router = APIRouter(prefix="/model", tags=["model"])
+
+@router.get("/versions")
+async def get_model_versions():
+    clients = config()
+    s3_client = clients["s3"]
+
+    return await run_io(load_manifest, s3_client)
+
+@router.put("/aliases/{alias}")
+async def put_model_alias(alias: str, version: str):
+    try:
+        manifest = await run_io(set_alias, alias, version)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return {"alias": alias, "version": version, "aliases": manifest["aliases"]}
@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from src.core.model.batching import batching_stats
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+@router.get("/batching")
+async def get_batching_stats():
+    return {"predictions": batching_stats()}
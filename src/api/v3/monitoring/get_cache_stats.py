@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from src.config.cache import metadata_cache
+from src.core.dataset.cache import dataset_cache
+from src.core.model.serving import artifact_cache
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+@router.get("/cache")
+async def get_cache_stats():
+    return {"metadata": metadata_cache().stats(), "datasets": dataset_cache().stats(), "models": artifact_cache().stats()}
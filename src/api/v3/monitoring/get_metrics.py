@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.config.metrics import CONTENT_TYPE, render
+
+router = APIRouter(tags=["monitoring"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
@@ -1,16 +1,26 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from src.config.client import config
+from src.config.storage import run_io, read_body
+from src.api.v3.conditional import cache_headers, not_modified
 
 router = APIRouter(prefix="/result", tags=["result"])
 
 @router.get("/{bucket_name}")
-async def get_result_file(bucket_name: str):
+async def get_result_file(bucket_name: str, request: Request, http_response: Response):
     clients = config()
     s3_client = clients["s3"]
         
     try:
-        response = s3_client.get_object(Bucket=bucket_name, Key="score.txt")
-        content = response["Body"].read().decode("utf-8")
+        if request.headers.get("if-none-match"):
+            # a HEAD is enough to answer a revalidation, the body is only fetched when it changed
+            head = await run_io(s3_client.head_object, Bucket=bucket_name, Key="score.txt")
+            unchanged = not_modified(request, head.get("ETag"), head)
+            if unchanged is not None:
+                return unchanged
+
+        response = await run_io(s3_client.get_object, Bucket=bucket_name, Key="score.txt")
+        content = (await read_body(response)).decode("utf-8")
+        http_response.headers.update(cache_headers(response))
         return {"content": content}
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
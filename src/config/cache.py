@@ -0,0 +1,79 @@
+# in-process ttl cache for s3 / lambda listings that rarely change
+
+import threading
+import time
+from collections import OrderedDict
+from src.config.client import env_number
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key) -> tuple:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, match: tuple) -> int:
+        # drops every key starting with match, ("models", "bucket") removes all listings of that bucket
+        with self._lock:
+            keys = [key for key in self._entries if key[:len(match)] == match]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+_metadata_cache = None
+_lock = threading.Lock()
+
+def metadata_cache() -> TTLCache:
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _lock:
+            if _metadata_cache is None:
+                _metadata_cache = TTLCache(
+                    ttl=env_number("metadata_cache_ttl", 30, float),
+                    maxsize=env_number("metadata_cache_size", 1024)
+                )
+    return _metadata_cache
+
+def invalidate_bucket(bucket_name: str) -> None:
+    metadata_cache().invalidate(("models", bucket_name))
@@ -1,29 +1,78 @@
 import os
+import threading
 import boto3
+from botocore.config import Config
 from dotenv import load_dotenv
 from src.config.logger import get_logger
+from src.config.metrics import instrument_client
 
-def config() -> dict:
-    logger = get_logger("client-configuration")
-    load_dotenv()
-    logger.info("loaded dotenv, attempting to create AWS clients")
+# clients are created once per process and shared between requests / warm lambda invocations
+SERVICES = ("s3", "lambda")
 
-    endpoint = os.getenv("AWS_ENDPOINT_URL") or os.getenv("endpoint_url")
-    clients={}
+_clients = {}
+_lock = threading.Lock()
+_env_loaded = False
 
+def env_number(name: str, default, cast=int):
+    value = os.getenv(name)
     try:
-        common_config = {
-            "endpoint_url": endpoint,
-            "aws_access_key_id": os.getenv("aws_access_key_id"),
-            "aws_secret_access_key": os.getenv("aws_secret_access_key"),
-            "region_name": os.getenv("region_name")
-        }
-        clients["s3"] = boto3.client("s3", **common_config)
-        clients["lambda"] = boto3.client("lambda", **common_config)
-        logger.info("successfully created clients")
-
-    except Exception as e:
-        logger.error(f"error while creating AWS clients - {e}")
-        raise
-
-    return clients
\ No newline at end of file
+        return cast(value) if value else default
+    except ValueError:
+        return default
+
+def _load_env(logger) -> None:
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+        logger.info("loaded dotenv, attempting to create AWS clients")
+
+def client_config() -> Config:
+    return Config(
+        max_pool_connections=env_number("max_pool_connections", 50),
+        connect_timeout=env_number("connect_timeout", 5, float),
+        read_timeout=env_number("read_timeout", 60, float),
+        retries={"max_attempts": env_number("max_attempts", 3), "mode": "standard"},
+        tcp_keepalive=True
+    )
+
+def get_client(service: str, logger=None):
+    client = _clients.get(service)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(service)
+        if client is None:
+            logger = logger or get_logger("client-configuration")
+            _load_env(logger)
+            endpoint = os.getenv("AWS_ENDPOINT_URL") or os.getenv("endpoint_url")
+
+            try:
+                client = boto3.client(
+                    service,
+                    endpoint_url=endpoint,
+                    aws_access_key_id=os.getenv("aws_access_key_id"),
+                    aws_secret_access_key=os.getenv("aws_secret_access_key"),
+                    region_name=os.getenv("region_name"),
+                    config=client_config()
+                )
+                instrument_client(client)
+                _clients[service] = client
+                logger.info(f"successfully created {service} client")
+
+            except Exception as e:
+                logger.error(f"error while creating AWS clients - {e}")
+                raise
+
+    return client
+
+def config() -> dict:
+    logger = get_logger("client-configuration")
+    return {service: get_client(service, logger) for service in SERVICES}
+
+def reset_clients() -> None:
+    global _env_loaded
+    with _lock:
+        _clients.clear()
+        _env_loaded = False
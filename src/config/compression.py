@@ -0,0 +1,174 @@
+# negotiated response compression (zstd or gzip) and a fast json response class
+
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class FastJSONResponse(JSONResponse):
+    # orjson serializes large row lists several times faster than json.dumps and maps NaN to null
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+# bodies that are already compressed gain nothing from a second pass
+PRECOMPRESSED_TYPES = ("application/vnd.apache.parquet", "application/x-parquet", "application/zstd", "application/gzip", "application/zip")
+# event streams must reach the client chunk by chunk
+PASSTHROUGH_TYPES = ("text/event-stream",) + PRECOMPRESSED_TYPES
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    # a compressed body is another representation, it must not share the identity body's strong validator
+    prefix = "W/" if etag.startswith("W/") else ""
+    return f'{prefix}"{etag.removeprefix("W/").strip(chr(34))}-{encoding}"'
+
+def strip_encoded_etags(if_none_match: str, encoding: str) -> tuple:
+    # routes compare against the identity etag, so the suffix added on the way out is removed on the way in
+    suffix = f'-{encoding}"'
+    tags, stripped = [], False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.endswith(suffix):
+            tag, stripped = tag[:-len(suffix)] + '"', True
+        tags.append(tag)
+    return ", ".join(tags), stripped
+
+class GzipEncoder:
+    def __init__(self, level: int = 6) -> None:
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def encode(self, body: bytes, more_body: bool) -> bytes:
+        # a sync flush lets a streamed chunk reach the client without closing the gzip member
+        return self.compressor.compress(body) + self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+class ZstdEncoder:
+    def __init__(self, level: int = 3) -> None:
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def encode(self, body: bytes, more_body: bool) -> bytes:
+        compressed = self.compressor.compress(body)
+        if more_body:
+            return compressed + self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return compressed + self.compressor.flush()
+
+class CompressionResponder:
+    # holds back http.response.start until the first body chunk shows whether the response is worth compressing
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, encoder, revalidated: bool = False) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.encoder = encoder
+        self.revalidated = revalidated
+        self.send = None
+        self.start = None
+        self.passthrough = False
+        self.compressing = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_encoded)
+
+    async def send_encoded(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or headers.get("content-type", "").startswith(PASSTHROUGH_TYPES)
+            return
+        if message["type"] != "http.response.body":
+            # pathsend and anything else this middleware does not know is forwarded untouched
+            await self._send_start()
+            await self.send(message)
+            return
+        if self.start is None:
+            # a chunk after the first one in a compressed stream
+            if self.compressing:
+                message = {**message, "body": self.encoder.encode(message.get("body", b""), message.get("more_body", False))}
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start["headers"])
+        if not self.passthrough and (more_body or len(body) >= self.minimum_size):
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoder is not None:
+                self.compressing = True
+                message = {**message, "body": self.encoder.encode(body, more_body)}
+                headers["Content-Encoding"] = self.encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(message["body"]))
+        etag = headers.get("etag")
+        if etag and (self.compressing or (self.start["status"] == 304 and self.revalidated)):
+            # only bodies compressed here, and 304s answering a validator handed out here
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+        await self._send_start()
+        await self.send(message)
+
+    async def _send_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+def accepted_encodings(accept_encoding: str) -> dict:
+    encodings = {}
+    for part in (accept_encoding or "").split(","):
+        name, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            encodings[name.lower()] = quality
+    return encodings
+
+def choose_encoding(accept_encoding: str) -> str:
+    encodings = accepted_encodings(accept_encoding)
+    available = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+    candidates = [(encodings.get(name, encodings.get("*", 0.0)), -rank, name) for rank, name in enumerate(available)]
+    quality, _, name = max(candidates)
+    return name if quality > 0 else "identity"
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding"))
+        if encoding == "zstd":
+            encoder = ZstdEncoder(self.zstd_level)
+        elif encoding == "gzip":
+            encoder = GzipEncoder(self.gzip_level)
+        else:
+            await CompressionResponder(self.app, self.minimum_size, encoding, None)(scope, receive, send)
+            return
+
+        revalidated = False
+        if request_headers.get("if-none-match"):
+            if_none_match, revalidated = strip_encoded_etags(request_headers["if-none-match"], encoding)
+            # rewritten in place: the router sets scope["route"] on this same dict for the metrics middleware outside
+            scope["headers"] = [(name, value) for name, value in scope["headers"] if name != b"if-none-match"] + [(b"if-none-match", if_none_match.encode("latin-1"))]
+
+        await CompressionResponder(self.app, self.minimum_size, encoding, encoder, revalidated)(scope, receive, send)
@@ -1,17 +1,82 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
-def get_logger(name: str = "root") -> logging.Logger:
-    logger=logging.getLogger(name)
+# records are queued by the calling thread and written to stdout by a single listener thread
+FORMAT = '[%(asctime)s][%(levelname)s]: %(name)s - %(message)s'
 
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
+_queue = queue.SimpleQueue()
+_listener = None
+_lock = threading.Lock()
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class lazy:
+    # defers an expensive diagnostic until a handler actually formats the record
+    def __init__(self, func):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
+
+def log_level(name: str) -> int:
+    levels = dict(
+        item.strip().split("=", 1) for item in (os.getenv("log_levels") or "").split(",") if "=" in item
+    )
+    level = logging.getLevelName((levels.get(name) or os.getenv("log_level") or "INFO").strip().upper())
+    return level if isinstance(level, int) else logging.INFO
 
-        formatter=logging.Formatter('[%(asctime)s][%(levelname)s]: %(name)s - %(message)s')
+def output_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if (os.getenv("log_format") or "").lower() == "json" else logging.Formatter(FORMAT))
+    return handler
 
-        console_handler=logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
+def listener() -> QueueListener:
+    global _listener
+    if _listener is None:
+        with _lock:
+            if _listener is None:
+                _listener = QueueListener(_queue, output_handler(), respect_handler_level=False)
+                _listener.start()
+    return _listener
 
-        logger.addHandler(console_handler)
+class ListenerQueueHandler(QueueHandler):
+    # a warm lambda invocation logs again after the previous one flushed, so the listener is restarted on demand
+    def emit(self, record: logging.LogRecord) -> None:
+        listener()
+        super().emit(record)
+
+def flush_logs() -> None:
+    # stopping drains the queue, lambda handlers call this before the runtime freezes the process
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+atexit.register(flush_logs)
+
+def get_logger(name: str = "root") -> logging.Logger:
+    logger=logging.getLogger(name)
+
+    if not logger.handlers:
+        logger.setLevel(log_level(logger.name))
+        logger.addHandler(ListenerQueueHandler(_queue))
 
-    return logger
\ No newline at end of file
+    return logger
@@ -0,0 +1,165 @@
+# in-process prometheus style metrics: http routes, bytes on the wire and every s3 / lambda call
+
+import threading
+import time
+from bisect import bisect_left
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list:
+        with self._lock:
+            return [f"{self.name}{format_labels(self.labels, labels)} {value}" for labels, value in sorted(self._values.items())]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, *labels, value: float) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def value(self, *labels) -> dict:
+        entry = self._values.get(labels)
+        return {"count": entry[1], "sum": entry[2]} if entry else {"count": 0, "sum": 0.0}
+
+    def samples(self) -> list:
+        lines = []
+        with self._lock:
+            for labels, (counts, count, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {count}")
+                lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {count}")
+                lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {total}")
+        return lines
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route, method and status", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+HTTP_REQUEST_BYTES = Counter("http_request_bytes_total", "HTTP request body bytes received", ("method", "route"))
+HTTP_RESPONSE_BYTES = Counter("http_response_bytes_total", "HTTP response body bytes sent, after compression", ("method", "route"))
+AWS_CALLS = Counter("aws_client_calls_total", "AWS client calls by service, operation and outcome", ("service", "operation", "outcome"))
+AWS_LATENCY = Histogram("aws_client_call_duration_seconds", "AWS client call latency including retries", ("service", "operation"))
+AWS_RESPONSE_BYTES = Counter("aws_client_response_bytes_total", "Content-Length of AWS responses", ("service", "operation"))
+
+METRICS = (HTTP_REQUESTS, HTTP_LATENCY, HTTP_REQUEST_BYTES, HTTP_RESPONSE_BYTES, AWS_CALLS, AWS_LATENCY, AWS_RESPONSE_BYTES)
+
+def render() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+def reset_metrics() -> None:
+    for metric in METRICS:
+        metric.clear()
+
+def _before_call(model, context, **kwargs) -> None:
+    context["metrics_started"] = time.perf_counter()
+
+def _record_call(service: str, operation: str, context: dict, outcome: str) -> None:
+    started = context.pop("metrics_started", None)
+    if started is not None:
+        AWS_LATENCY.observe(service, operation, value=time.perf_counter() - started)
+    AWS_CALLS.inc(service, operation, outcome)
+
+def _after_call(http_response, model, context, **kwargs) -> None:
+    service = model.service_model.service_id.hyphenize()
+    outcome = "error" if http_response.status_code >= 400 else "success"
+    _record_call(service, model.name, context, outcome)
+    length = http_response.headers.get("content-length")
+    if length and length.isdigit():
+        AWS_RESPONSE_BYTES.inc(service, model.name, amount=int(length))
+
+def _after_call_error(exception, context, **kwargs) -> None:
+    # connection failures never reach after-call, the event name carries service and operation instead
+    _, service, operation = kwargs["event_name"].split(".", 2)
+    _record_call(service, operation, context, "exception")
+
+def instrument_client(client) -> None:
+    events = client.meta.events
+    events.register("before-call.*.*", _before_call, unique_id="metrics-before-call")
+    events.register("after-call.*.*", _after_call, unique_id="metrics-after-call")
+    events.register("after-call-error.*.*", _after_call_error, unique_id="metrics-after-call-error")
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = {"status": 500, "received": 0, "sent": 0}
+
+        async def counting_receive() -> Message:
+            message = await receive()
+            state["received"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["sent"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            # the route template keeps label cardinality bounded, /jobs/{job_id} rather than every id
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_LATENCY.observe(method, route, value=time.perf_counter() - started)
+            HTTP_REQUESTS.inc(method, route, str(state["status"]))
+            HTTP_REQUEST_BYTES.inc(method, route, amount=state["received"])
+            HTTP_RESPONSE_BYTES.inc(method, route, amount=state["sent"])
@@ -0,0 +1,43 @@
+# run blocking boto3 calls off the event loop on a bounded thread pool
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config.client import env_number
+from src.config.cache import metadata_cache
+
+_executor = None
+_lock = threading.Lock()
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # one worker per pooled connection so threads never queue on the http pool
+                workers = env_number("io_max_workers", env_number("max_pool_connections", 50))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-io")
+    return _executor
+
+async def run_io(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+async def cached_io(key: tuple, func, *args, **kwargs):
+    found, value = metadata_cache().lookup(key)
+    if found:
+        return value
+    value = await run_io(func, *args, **kwargs)
+    metadata_cache().set(key, value)
+    return value
+
+async def read_body(response: dict) -> bytes:
+    return await run_io(response["Body"].read)
+
+def shutdown_executor() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,98 @@
+# byte budgeted lru cache of parsed datasets, keyed on the s3 object etag
+
+import threading
+from collections import OrderedDict
+import pandas as pd
+from src.config.client import env_number
+from src.config.logger import get_logger
+
+class DatasetCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key, count_miss: bool = True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += count_miss
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, frame: pd.DataFrame) -> None:
+        size = int(frame.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (frame, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+_dataset_cache = None
+_lock = threading.Lock()
+
+def dataset_cache() -> DatasetCache:
+    global _dataset_cache
+    if _dataset_cache is None:
+        with _lock:
+            if _dataset_cache is None:
+                _dataset_cache = DatasetCache(max_bytes=env_number("dataset_cache_mb", 256) * 1024 * 1024)
+    return _dataset_cache
+
+def cached_dataset(bucket_name: str, key: str, variant: str, head: dict) -> pd.DataFrame:
+    # a lookup only, callers that go on to load_dataset would otherwise count the miss twice
+    if not dataset_cache().enabled:
+        return None
+    return dataset_cache().get((bucket_name, key, head.get("ETag"), variant), count_miss=False)
+
+def load_dataset(s3_client, bucket_name: str, key: str, parser, variant: str, head: dict = None) -> tuple:
+    # cached frames are shared between callers and must be treated as read only
+    logger = get_logger("dataset-cache")
+    cache = dataset_cache()
+    if not cache.enabled:
+        response = s3_client.get_object(Bucket=bucket_name, Key=key)
+        return parser(response["Body"]), response
+
+    head = head or s3_client.head_object(Bucket=bucket_name, Key=key)
+    frame = cache.get((bucket_name, key, head.get("ETag"), variant))
+    if frame is not None:
+        logger.info(f"dataset s3://{bucket_name}/{key} served from cache")
+        return frame, head
+
+    response = s3_client.get_object(Bucket=bucket_name, Key=key)
+    frame = parser(response["Body"])
+    cache.put((bucket_name, key, response.get("ETag") or head.get("ETag"), variant), frame)
+    return frame, response
@@ -0,0 +1,79 @@
+# typed, column oriented encodings of a dataset (columnar json, arrow ipc stream, parquet)
+
+import io
+import pandas as pd
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "columnar": "application/vnd.local-ml-flow.columnar+json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet"
+}
+FORMATS = {media_type: name for name, media_type in MEDIA_TYPES.items()}
+FORMATS["application/x-parquet"] = "parquet"
+BINARY_FORMATS = ("arrow", "parquet")
+
+def negotiate(accept: str = None, default: str = "json") -> str:
+    candidates = []
+    for position, part in enumerate((accept or "").split(",")):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in FORMATS:
+            return FORMATS[media_type]
+        if media_type in ("*/*", "application/*"):
+            return default
+    return default
+
+def infer_types(df: pd.DataFrame) -> pd.DataFrame:
+    typed = {}
+    for column in df.columns:
+        try:
+            typed[column] = pd.to_numeric(df[column])
+        except (ValueError, TypeError):
+            typed[column] = df[column]
+    return pd.DataFrame(typed, index=df.index)
+
+def _json_values(series: pd.Series) -> list:
+    # empty csv cells end up as NaN in numeric columns, which json cannot represent
+    if series.hasnans:
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+def to_columnar(df: pd.DataFrame) -> dict:
+    return {
+        "dtypes": {column: str(dtype) for column, dtype in df.dtypes.items()},
+        "columns": {column: _json_values(df[column]) for column in df.columns}
+    }
+
+def _to_table(df: pd.DataFrame):
+    # pyarrow is optional, install the "arrow" extra to enable binary formats
+    import pyarrow as pa
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def to_arrow(df: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+    table = _to_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def to_parquet(df: pd.DataFrame) -> bytes:
+    import pyarrow.parquet as pq
+    buffer = io.BytesIO()
+    pq.write_table(_to_table(df), buffer)
+    return buffer.getvalue()
+
+ENCODERS = {"arrow": to_arrow, "parquet": to_parquet}
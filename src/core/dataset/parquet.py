@@ -0,0 +1,203 @@
+# typed parquet copy of each ingested csv, read back with s3 range requests and row group pruning
+
+import io
+import pandas as pd
+from botocore.exceptions import ClientError
+from src.config.cache import invalidate_bucket, metadata_cache
+from src.config.client import env_number
+from src.config.logger import get_logger
+from src.core.dataset.query import OPERATORS, ORDERED_OPERATORS, _as_number, required_columns, select_rows
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+SOURCE_ETAG = "source-etag"
+DEFAULT_ROW_GROUP_ROWS = 65536
+
+def parquet_writable() -> bool:
+    # neither image installs the arrow extra, without it there is no copy to write
+    return pq is not None
+
+def parquet_key(key: str) -> str:
+    return f"{key}.parquet"
+
+class S3RangeFile(io.RawIOBase):
+    # a seekable read-only file over one s3 object, every read is a ranged get_object
+    def __init__(self, s3_client, bucket: str, key: str, size: int):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.position = 0
+        self.requests = 0
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size is None or size < 0 else min(self.size, self.position + size)
+        if end <= self.position:
+            return b""
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={self.position}-{end - 1}")
+        data = response["Body"].read()
+        self.requests += 1
+        self.bytes_read += len(data)
+        self.position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def write_parquet(frame: pd.DataFrame, row_group_rows: int = None) -> bytes:
+    buffer = io.BytesIO()
+    frame.to_parquet(
+        buffer,
+        engine="pyarrow",
+        index=False,
+        compression="zstd",
+        row_group_size=row_group_rows or env_number("parquet_row_group_rows", DEFAULT_ROW_GROUP_ROWS),
+        write_statistics=True
+    )
+    return buffer.getvalue()
+
+def materialize_parquet(s3_client, bucket: str, key: str, frame: pd.DataFrame, source_etag: str) -> str:
+    # frame must hold every column, read with flags="category" so the yes/no text round trips
+    logger = get_logger("dataset-parquet")
+    if not parquet_writable():
+        logger.warning("pyarrow is not installed, no parquet copy written")
+        return None
+
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=parquet_key(key),
+        Body=write_parquet(frame),
+        ContentType="application/vnd.apache.parquet",
+        Metadata={SOURCE_ETAG: source_etag}
+    )
+    invalidate_bucket(bucket)
+    metadata_cache().invalidate(("parquet", bucket, key))
+    logger.info(f"wrote s3://{bucket}/{parquet_key(key)} for source etag {source_etag}")
+    return parquet_key(key)
+
+def _head_parquet(s3_client, bucket: str, key: str) -> dict:
+    try:
+        return s3_client.head_object(Bucket=bucket, Key=parquet_key(key))
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+def fresh_parquet(s3_client, bucket: str, key: str, source_head: dict) -> dict:
+    # a copy is fresh when it was written from the csv version that is currently stored
+    source_etag = source_head.get("ETag")
+    cache_key = ("parquet", bucket, key, source_etag)
+    found, head = metadata_cache().lookup(cache_key)
+    if not found:
+        head = _head_parquet(s3_client, bucket, key)
+        metadata_cache().set(cache_key, head)
+    if head is None or not source_etag or head.get("Metadata", {}).get(SOURCE_ETAG) != source_etag:
+        return None
+    return head
+
+def _statistic_allows(statistics, op: str, value) -> bool:
+    if statistics is None or not statistics.has_min_max:
+        return True
+    low, high = statistics.min, statistics.max
+    try:
+        if op in ("=", "=="):
+            return low <= value <= high
+        if op == "!=":
+            return not (low == high == value)
+        if op == ">":
+            return high > value
+        if op == ">=":
+            return high >= value
+        if op == "<":
+            return low < value
+        if op == "<=":
+            return low <= value
+    except TypeError:
+        return True
+    return True
+
+def prune_row_groups(metadata, filters: list) -> list:
+    positions = {metadata.schema.column(index).name: index for index in range(metadata.num_columns)}
+    kept = []
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        keep = True
+        for column, op, value in filters:
+            if column not in positions or op not in OPERATORS:
+                continue
+            number = _as_number(value)
+            if number is None and op in ORDERED_OPERATORS:
+                continue
+            statistics = row_group.column(positions[column]).statistics
+            if not _statistic_allows(statistics, op, number if number is not None else value):
+                keep = False
+                break
+        if keep:
+            kept.append(group)
+    return kept
+
+def open_parquet(s3_client, bucket: str, key: str, head: dict):
+    source = S3RangeFile(s3_client, bucket, parquet_key(key), head["ContentLength"])
+    footer_key = ("parquet-footer", bucket, key, head.get("ETag"))
+    found, metadata = metadata_cache().lookup(footer_key)
+    # pre_buffer coalesces the column chunks of a row group into a single ranged get
+    parquet_file = pq.ParquetFile(source, metadata=metadata if found else None, pre_buffer=True)
+    if not found:
+        metadata_cache().set(footer_key, parquet_file.metadata)
+    return parquet_file, source
+
+def iter_row_groups(parquet_file, columns: list = None, filters: list = ()):
+    for group in prune_row_groups(parquet_file.metadata, filters):
+        frame = parquet_file.read_row_group(group, columns=columns).to_pandas()
+        # the csv route serves raw text values, typed columns are turned back into their csv spelling
+        yield frame.astype(str)
+
+def read_parquet_rows(s3_client, bucket: str, key: str, source_head: dict, columns: list = None, filters: list = (), offset: int = 0, limit: int = None) -> pd.DataFrame:
+    if pq is None:
+        return None
+    head = fresh_parquet(s3_client, bucket, key, source_head)
+    if head is None:
+        return None
+
+    parquet_file, source = open_parquet(s3_client, bucket, key, head)
+    projection = required_columns(columns, filters)
+    available = set(parquet_file.schema_arrow.names)
+    unknown = [column for column in projection or [] if column not in available]
+    if unknown:
+        raise ValueError(f"unknown column(s): {unknown}")
+
+    chunks = list(select_rows(iter_row_groups(parquet_file, projection, filters), columns, filters, offset, limit))
+    get_logger("dataset-parquet").info(f"read s3://{bucket}/{parquet_key(key)} with {source.requests} ranged get(s), {source.bytes_read} bytes")
+    if not chunks:
+        return pd.DataFrame(columns=columns or parquet_file.schema_arrow.names)
+    return pd.concat(chunks, ignore_index=True)
+
+def read_parquet_columns(s3_client, bucket: str, key: str, source_head: dict, columns: list) -> pd.DataFrame:
+    # whole columns for training, with the yes/no categories left for clean_df to encode
+    if pq is None:
+        return None
+    head = fresh_parquet(s3_client, bucket, key, source_head)
+    if head is None:
+        return None
+    parquet_file, _ = open_parquet(s3_client, bucket, key, head)
+    return parquet_file.read(columns=columns).to_pandas()
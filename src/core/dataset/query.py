@@ -0,0 +1,86 @@
+# server side row filtering, column projection and pagination over dataframe chunks
+
+import re
+import operator
+import pandas as pd
+
+OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    "==": operator.eq,
+    "=": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt
+}
+ORDERED_OPERATORS = {">=", "<=", ">", "<"}
+FILTER_PATTERN = re.compile(r"^\s*([^<>=!]+?)\s*(>=|<=|!=|==|=|>|<)\s*(.*?)\s*$")
+
+def parse_columns(raw: str = None) -> list:
+    if not raw:
+        return None
+    columns = [column.strip() for column in raw.split(",") if column.strip()]
+    return list(dict.fromkeys(columns)) or None
+
+def parse_filters(expressions: list = None) -> list:
+    filters = []
+    for expression in expressions or []:
+        match = FILTER_PATTERN.match(expression)
+        if match is None:
+            raise ValueError(f"invalid filter '{expression}', expected <column><op><value> with op in {list(OPERATORS)}")
+        filters.append(match.groups())
+    return filters
+
+def required_columns(columns: list = None, filters: list = ()) -> list:
+    if columns is None:
+        return None
+    return list(dict.fromkeys(columns + [column for column, _, _ in filters]))
+
+def _as_number(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def filter_mask(df: pd.DataFrame, filters: list) -> pd.Series:
+    missing = [column for column, _, _ in filters if column not in df.columns]
+    if missing:
+        raise ValueError(f"unknown filter column(s): {missing}")
+
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        number = _as_number(value)
+        if number is not None:
+            # non numeric cells become NaN and never match
+            mask &= OPERATORS[op](pd.to_numeric(df[column], errors="coerce"), number)
+        elif op in ORDERED_OPERATORS:
+            raise ValueError(f"operator '{op}' needs a numeric value, got '{value}'")
+        else:
+            mask &= OPERATORS[op](df[column].astype(str), value)
+    return mask
+
+def select_rows(chunks, columns: list = None, filters: list = (), offset: int = 0, limit: int = None):
+    to_skip = offset
+    remaining = limit
+    for chunk in chunks:
+        if filters:
+            chunk = chunk[filter_mask(chunk, filters).to_numpy()]
+        if to_skip:
+            skipped = min(to_skip, len(chunk))
+            chunk = chunk.iloc[skipped:]
+            to_skip -= skipped
+        if remaining is not None:
+            chunk = chunk.iloc[:remaining]
+            remaining -= len(chunk)
+        if columns is not None:
+            missing = [column for column in columns if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"unknown column(s): {missing}")
+            chunk = chunk[columns]
+        yield chunk
+        if remaining is not None and remaining <= 0:
+            # stop before pulling the next chunk, which would cost another read
+            break
+
+def query_frame(frame: pd.DataFrame, columns: list = None, filters: list = (), offset: int = 0, limit: int = None) -> pd.DataFrame:
+    return next(select_rows([frame], columns, filters, offset, limit), frame.iloc[0:0])
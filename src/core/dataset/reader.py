@@ -0,0 +1,50 @@
+# read a csv object from s3 incrementally, one dataframe chunk at a time
+
+import pandas as pd
+from src.config.client import env_number
+from src.config.storage import run_io
+from src.core.dataset.query import select_rows, required_columns
+
+DEFAULT_CHUNK_ROWS = 10000
+
+def read_csv_chunks(body, chunk_rows: int = None, usecols: list = None):
+    # every value is kept as the raw csv string, like csv.DictReader does
+    return pd.read_csv(
+        body,
+        dtype=str,
+        keep_default_na=False,
+        usecols=usecols,
+        chunksize=chunk_rows or env_number("dataset_chunk_rows", DEFAULT_CHUNK_ROWS)
+    )
+
+def iter_rows(body, columns: list = None, filters: list = (), offset: int = 0, limit: int = None, chunk_rows: int = None):
+    reader = read_csv_chunks(body, chunk_rows, usecols=required_columns(columns, filters))
+    try:
+        # stops pulling from s3 as soon as the requested page is complete
+        yield from select_rows(reader, columns, filters, offset, limit)
+    finally:
+        reader.close()
+        body.close()
+
+def read_rows(body, **query) -> pd.DataFrame:
+    chunks = list(iter_rows(body, **query))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+def to_ndjson(chunk: pd.DataFrame) -> str:
+    lines = chunk.to_json(orient="records", lines=True, force_ascii=False)
+    return lines if lines.endswith("\n") else lines + "\n"
+
+async def _ndjson_parts(rows, chunk):
+    try:
+        while chunk is not None:
+            if len(chunk):
+                yield to_ndjson(chunk)
+            chunk = await run_io(next, rows, None)
+    finally:
+        rows.close()
+
+async def stream_ndjson(body, **query):
+    rows = iter_rows(body, **query)
+    # the first chunk is read eagerly so bad columns or filters fail before the response starts
+    first = await run_io(next, rows, None)
+    return _ndjson_parts(rows, first)
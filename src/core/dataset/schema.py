@@ -0,0 +1,55 @@
+# declared schema of housing.csv, so ingestion parses only what it needs with compact dtypes
+
+import os
+import pandas as pd
+from src.config.logger import get_logger
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+HOUSING_DTYPES = {
+    "price": "int64",
+    "area": "int32",
+    "bedrooms": "int8",
+    "bathrooms": "int8",
+    "stories": "int8",
+    "mainroad": "bool",
+    "guestroom": "bool",
+    "basement": "bool",
+    "hotwaterheating": "bool",
+    "airconditioning": "bool",
+    "parking": "int8",
+    "prefarea": "bool",
+    "furnishingstatus": "category"
+}
+TRUE_VALUES = ["yes"]
+FALSE_VALUES = ["no"]
+
+def csv_engine(engine: str = None) -> str:
+    # the pyarrow engine parses with several threads, the c engine is the fallback without pyarrow
+    engine = engine or os.getenv("csv_engine") or "pyarrow"
+    return "c" if engine == "pyarrow" and pyarrow is None else engine
+
+def schema_options(columns: list = None, flags: str = "bool") -> dict:
+    # without a column list every column of the file is read, declared ones with their schema dtype
+    unknown = [column for column in columns or [] if column not in HOUSING_DTYPES]
+    if unknown:
+        raise ValueError(f"column(s) not in the housing schema: {unknown}")
+    declared = columns or list(HOUSING_DTYPES)
+    if flags == "category":
+        # keeps the original yes/no text, dictionary encoded, for copies that must round trip to the csv values
+        dtypes = {column: "category" if HOUSING_DTYPES[column] == "bool" else HOUSING_DTYPES[column] for column in declared}
+        return {"usecols": columns, "dtype": dtypes}
+    return {
+        "usecols": columns,
+        "dtype": {column: HOUSING_DTYPES[column] for column in declared},
+        "true_values": TRUE_VALUES,
+        "false_values": FALSE_VALUES
+    }
+
+def read_dataset(body, columns: list = None, engine: str = None, flags: str = "bool") -> pd.DataFrame:
+    engine = csv_engine(engine)
+    get_logger("dataset-schema").info(f"parsing {len(columns or HOUSING_DTYPES)} declared column(s) with the {engine} engine")
+    return pd.read_csv(body, engine=engine, **schema_options(columns, flags))
@@ -0,0 +1,189 @@
+# run ingestion / inference pipelines in-process on a bounded, prioritized worker pool
+
+import heapq
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from src.config.client import env_number
+from src.config.logger import get_logger
+from src.core.lambdas.ingestion import ingest
+from src.core.lambdas.inference import inference
+
+RUNNERS = {"ingest": ingest, "inference": inference}
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+class JobQueueFull(Exception):
+    pass
+
+def dedup_key(kind: str, params: dict) -> tuple:
+    return kind, json.dumps(params, sort_keys=True)
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class JobQueue:
+    def __init__(self, runners: dict, workers: int = 2, max_pending: int = 100, history: int = 500):
+        self.runners = runners
+        self.workers = workers
+        self.max_pending = max_pending
+        self.history = history
+        self._queue = []
+        self._jobs = OrderedDict()
+        self._pending = {}
+        self._threads = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        # pipelines of one kind share s3 state (registry manifest, test split, stage records), so they never overlap
+        self._busy_kinds = set()
+
+    def submit(self, kind: str, params: dict = None, priority: str = "normal") -> tuple:
+        if kind not in self.runners:
+            raise KeyError(f"unknown job kind '{kind}'")
+        params = params or {}
+        key = dedup_key(kind, params)
+
+        with self._lock:
+            job_id = self._pending.get(key)
+            if job_id is not None:
+                # an identical job is still queued, hand back that one instead of running the pipeline twice
+                job = self._jobs[job_id]
+                if PRIORITIES[priority] < PRIORITIES[job["priority"]]:
+                    job["priority"] = priority
+                    self._put((PRIORITIES[priority], next(self._sequence), job_id))
+                return dict(job), False
+
+            if len(self._pending) >= self.max_pending:
+                raise JobQueueFull(f"{len(self._pending)} jobs already pending")
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "kind": kind,
+                "params": params,
+                "priority": priority,
+                "status": "queued",
+                "submitted_at": now(),
+                "started_at": None,
+                "finished_at": None,
+                "duration_seconds": None,
+                "error": None,
+                "result": None
+            }
+            self._jobs[job["id"]] = job
+            self._pending[key] = job["id"]
+            self._start_workers()
+            self._put((PRIORITIES[priority], next(self._sequence), job["id"]))
+            return dict(job), True
+
+    def _put(self, entry: tuple) -> None:
+        heapq.heappush(self._queue, entry)
+        self._ready.notify_all()
+
+    def _take(self) -> dict:
+        # the first entry in priority order whose kind is free, jobs of a busy kind wait without holding a worker
+        with self._ready:
+            while True:
+                for entry in sorted(self._queue):
+                    job_id = entry[2]
+                    job = self._jobs.get(job_id)
+                    # a priority bump leaves a stale entry behind, anything no longer queued is dropped
+                    if job_id is not None and (job is None or job["status"] != "queued"):
+                        self._queue.remove(entry)
+                        continue
+                    if job_id is not None and job["kind"] in self._busy_kinds:
+                        continue
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    if job_id is None:
+                        return None
+                    self._busy_kinds.add(job["kind"])
+                    self._pending.pop(dedup_key(job["kind"], job["params"]), None)
+                    job["status"] = "running"
+                    job["started_at"] = now()
+                    return job
+                heapq.heapify(self._queue)
+                self._ready.wait()
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"pipeline-job-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        logger = get_logger("job-queue")
+        while True:
+            job = self._take()
+            if job is None:
+                return
+
+            logger.info(f"running {job['kind']} job {job['id']}")
+            started = time.monotonic()
+            try:
+                result = self.runners[job["kind"]](**job["params"])
+                status, error = "succeeded", None
+            except Exception as e:
+                logger.error(f"{job['kind']} job {job['id']} failed - {e}")
+                result, status, error = None, "failed", str(e)
+
+            with self._ready:
+                # the pipelines return their stage profile, kept on the job for polling clients
+                job.update(status=status, error=error, result=result, finished_at=now(), duration_seconds=round(time.monotonic() - started, 3))
+                self._busy_kinds.discard(job["kind"])
+                self._trim()
+                self._ready.notify_all()
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("succeeded", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> dict:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list(self) -> list:
+        with self._lock:
+            return [dict(job) for job in reversed(self._jobs.values())]
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {status: 0 for status in ("queued", "running", "succeeded", "failed")}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+            return {"workers": self.workers, "max_pending": self.max_pending, **counts}
+
+    def shutdown(self) -> None:
+        # sentinels sort after every real job so queued work is drained first
+        with self._ready:
+            for _ in self._threads:
+                self._put((len(PRIORITIES), next(self._sequence), None))
+            self._threads = []
+
+_job_queue = None
+_lock = threading.Lock()
+
+def job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        with _lock:
+            if _job_queue is None:
+                _job_queue = JobQueue(
+                    RUNNERS,
+                    workers=env_number("job_workers", 2),
+                    max_pending=env_number("job_max_pending", 100),
+                    history=env_number("job_history", 500)
+                )
+    return _job_queue
+
+def shutdown_jobs() -> None:
+    global _job_queue
+    with _lock:
+        if _job_queue is not None:
+            _job_queue.shutdown()
+            _job_queue = None
@@ -0,0 +1,78 @@
+# stage fingerprints from input etags, code version and config, with a record of the outputs produced for each one
+
+import hashlib
+import importlib.util
+import json
+import os
+from functools import lru_cache
+from botocore.exceptions import ClientError
+from src.config.cache import invalidate_bucket
+from src.config.client import env_number
+from src.config.logger import get_logger
+from src.core.model.registry import is_missing
+
+STAGES_BUCKET = "local-ml-flow-data"
+# modules whose source decides what the pipeline stages produce
+CODE_MODULES = [
+    "src.core.dataset.schema",
+    "src.core.model.conversion",
+    "src.core.model.train_test_split",
+    "src.core.model.train",
+    "src.core.model.sweep",
+    "src.core.model.streaming",
+    "src.core.model.evaluation",
+    "src.core.model.serialization",
+    "src.core.lambdas.ingestion",
+    "src.core.lambdas.inference"
+]
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    # a deploy can pin it (git sha), otherwise the source of the pipeline modules is hashed once per process
+    if os.getenv("code_version"):
+        return os.getenv("code_version")
+    digest = hashlib.sha256()
+    for name in CODE_MODULES:
+        with open(importlib.util.find_spec(name).origin, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+def fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32]
+
+def stage_cache_enabled(force: bool = False) -> bool:
+    return not force and bool(env_number("stage_cache", 1))
+
+def stage_key(pipeline: str, stage: str, stage_fingerprint: str) -> str:
+    return f"stages/{pipeline}/{stage}/{stage_fingerprint}.json"
+
+def object_etag(s3_client, bucket: str, key: str) -> str:
+    try:
+        return s3_client.head_object(Bucket=bucket, Key=key).get("ETag")
+    except ClientError as e:
+        if is_missing(e):
+            return None
+        raise
+
+def load_stage(s3_client, pipeline: str, stage: str, stage_fingerprint: str) -> dict:
+    logger = get_logger("stage-cache")
+    key = stage_key(pipeline, stage, stage_fingerprint)
+    try:
+        response = s3_client.get_object(Bucket=STAGES_BUCKET, Key=key)
+        return json.loads(response["Body"].read())
+    except ClientError as e:
+        if not is_missing(e):
+            logger.warning(f"could not read stage record {key} - {e}")
+    except Exception as e:
+        # a lookup that fails only means the stage runs again
+        logger.warning(f"could not read stage record {key} - {e}")
+    return None
+
+def save_stage(s3_client, pipeline: str, stage: str, stage_fingerprint: str, outputs: dict) -> None:
+    logger = get_logger("stage-cache")
+    key = stage_key(pipeline, stage, stage_fingerprint)
+    try:
+        s3_client.put_object(Bucket=STAGES_BUCKET, Key=key, Body=json.dumps(outputs).encode("utf-8"), ContentType="application/json")
+        invalidate_bucket(STAGES_BUCKET)
+    except Exception as e:
+        logger.warning(f"could not save stage record {key} - {e}")
@@ -1,51 +1,101 @@
 # download the binary, download the test dataset, make the prediction and get the score
 
-import joblib
-import io
-from src.config.logger import get_logger
+import json
+import tempfile
+from src.config.logger import get_logger, flush_logs
 from src.config.client import config
+from src.config.cache import invalidate_bucket
+from src.core.model.arrays import load_array
 from src.core.model.evaluation import r2
+from src.core.model.serialization import deserialize
+from src.core.lambdas.profiling import StageProfiler, track_client, save_run_record
+from src.core.lambdas.fingerprint import code_version, fingerprint, load_stage, object_etag, save_stage, stage_cache_enabled
 
-def inference() -> None:
+REUSED_STAGES = ["load_model", "load_test_data", "predict", "r2", "save_score"]
+
+def reusable_score(s3_client, bucket_name: str, evaluation_fingerprint: str) -> dict:
+    record = load_stage(s3_client, "inference", "evaluation", evaluation_fingerprint)
+    # the recorded score only counts while score.txt is still the one that run wrote
+    if record is None or object_etag(s3_client, bucket_name, "score.txt") != record["score"]:
+        return None
+    return record
+
+def inference(force: bool = False) -> dict:
     logger = get_logger("lambda-inference")
     clients = config()
     s3_client = clients["s3"]
     model_bucket_name = "local-ml-flow-models"
     data_bucket_name = "local-ml-flow-data"
     obj_name = "model.joblib"
-    x_test_name = "x_test.joblib"
-    y_test_name = "y_test.joblib"
+    x_test_name = "x_test.npy"
+    y_test_name = "y_test.npy"
+    profiler = StageProfiler("inference")
+    track_client(s3_client)
 
     try:
+        # the score only depends on the model, the test split and the code that computes it
+        evaluation_fingerprint = fingerprint(
+            "evaluation",
+            object_etag(s3_client, model_bucket_name, obj_name),
+            object_etag(s3_client, data_bucket_name, x_test_name),
+            object_etag(s3_client, data_bucket_name, y_test_name),
+            code_version()
+        )
+        cached = reusable_score(s3_client, data_bucket_name, evaluation_fingerprint) if stage_cache_enabled(force) else None
+        if cached is not None:
+            logger.info("model and test data unchanged, reusing the last score")
+            for stage in REUSED_STAGES:
+                profiler.reuse(stage, evaluation_fingerprint)
+            report = profiler.report()
+            report.update({"r2": cached["r2"], "fingerprint": evaluation_fingerprint})
+            save_run_record(s3_client, report)
+            return report
+
         logger.info("attempting to get the binary (model)")
-        model_res = s3_client.get_object(Bucket=model_bucket_name, Key=obj_name)
-        model = joblib.load(io.BytesIO(model_res["Body"].read()))
+        with profiler.stage("load_model"):
+            model_res = s3_client.get_object(Bucket=model_bucket_name, Key=obj_name)
+            model = deserialize(model_res["Body"].read(), model_res.get("Metadata"))
 
-        logger.info("attempting to retrieve test dataset(s) and testing model")
-        x_res = s3_client.get_object(Bucket=data_bucket_name, Key = x_test_name)
-        y_res = s3_client.get_object(Bucket=data_bucket_name, Key= y_test_name)
-        
-        x_test = joblib.load(io.BytesIO(x_res["Body"].read()))
-        y_test = joblib.load(io.BytesIO(y_res["Body"].read()))
+        with tempfile.TemporaryDirectory(prefix="inference-") as directory:
+            logger.info("attempting to retrieve test dataset(s) and testing model")
+            with profiler.stage("load_test_data"):
+                x_test = load_array(s3_client, data_bucket_name, x_test_name, directory)
+                y_test = load_array(s3_client, data_bucket_name, y_test_name, directory)
 
-        y_pred = model.predict(x_test)
+            with profiler.stage("predict"):
+                y_pred = model.predict(x_test)
 
-        logger.info("calculating R2")
-        r2_score = r2(y_test, y_pred)
+            logger.info("calculating R2")
+            with profiler.stage("r2"):
+                r2_score = r2(y_test, y_pred)
+            del x_test, y_test
 
         logger.info("putting the score as %")
         r2_percentage = str(r2_score * 100) + "%"
 
         logger.info("saving the score in a textfile in the bucket")
-        s3_client.put_object(Bucket=data_bucket_name, Key="score.txt", Body=r2_percentage)
+        with profiler.stage("save_score"):
+            score_response = s3_client.put_object(Bucket=data_bucket_name, Key="score.txt", Body=r2_percentage)
+            invalidate_bucket(data_bucket_name)
+
+        save_stage(s3_client, "inference", "evaluation", evaluation_fingerprint, {"r2": float(r2_score), "score": score_response.get("ETag")})
     except Exception as e:
         logger.error(f"error while inference - {e}")
+        save_run_record(s3_client, profiler.report("failed", str(e)))
         raise
 
+    report = profiler.report()
+    report.update({"r2": float(r2_score), "fingerprint": evaluation_fingerprint})
+    save_run_record(s3_client, report)
+    return report
+
 def handler(event, context) -> dict:
     try:
-        inference()
-        return {"statusCode": 200, "body": "success"}
+        report = inference(force=bool(event.get("force")) if isinstance(event, dict) else False)
+        return {"statusCode": 200, "body": json.dumps({"status": "success", "profile": report})}
 
     except Exception as e:
         return {"statusCode": 500, "body": str(e)}
+
+    finally:
+        flush_logs()
\ No newline at end of file
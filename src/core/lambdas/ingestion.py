@@ -1,64 +1,202 @@
 # load the dataset, split, train and save model/test data
 
+import json
+import os
 import pandas as pd
-import joblib
-import io
-from src.config.logger import get_logger
-from src.config.client import config
+from src.config.logger import get_logger, flush_logs
+from src.config.client import config, env_number
+from src.config.cache import invalidate_bucket
+from src.core.dataset.cache import load_dataset
 from src.core.model.conversion import clean_df
-from src.core.model.train_test_split import split
-from src.core.model.train import train
-from src.core.model.save_model import save_model
+from src.core.dataset.parquet import materialize_parquet, parquet_writable, read_parquet_columns
+from src.core.dataset.schema import read_dataset
+from src.core.model.train_test_split import FEATURE_COLUMNS, SPLIT_PARAMS, split
+from src.core.model.train import hyperparameters, train
+from src.core.model.arrays import save_array
+from src.core.model.streaming import stream_fit
+from src.core.model.sweep import best_candidate, default_candidates, sweep
+from src.core.model.registry import load_manifest, register_model
+from src.core.model.serialization import NPZ_ESTIMATORS, serialization_spec
+from src.core.lambdas.profiling import StageProfiler, track_client, save_run_record
+from src.core.lambdas.fingerprint import code_version, fingerprint, load_stage, object_etag, save_stage, stage_cache_enabled
+
+X_TEST_KEY = "x_test.npy"
+Y_TEST_KEY = "y_test.npy"
+# a parsed frame takes a few times the csv size, larger objects are streamed in auto mode
+CSV_EXPANSION = 4
+# every stage a cache hit skips, with the fingerprint that covers it
+REUSED_STAGES = {
+    "memory": {"load_dataset": "clean_df", "clean_df": "clean_df", "split": "split", "sweep": "train", "train": "train", "register_model": "train", "save_test_data": "split"},
+    "streaming": {"stream_fit": "train", "register_model": "train", "save_test_data": "train"}
+}
 
 def save_test_data(s3_client, x_test, y_test) -> None:
     bucket_name = "local-ml-flow-data"
-    x_buffer = io.BytesIO()
-    joblib.dump(x_test, x_buffer)
-    x_buffer.seek(0)
-    s3_client.put_object(Bucket=bucket_name, Key="x_test.joblib", Body=x_buffer.getvalue())
-    
-    y_buffer = io.BytesIO()
-    joblib.dump(y_test, y_buffer)
-    y_buffer.seek(0)
-    s3_client.put_object(Bucket=bucket_name, Key="y_test.joblib", Body=y_buffer.getvalue())
-
-def ingest() -> None:
+    save_array(s3_client, bucket_name, X_TEST_KEY, x_test)
+    save_array(s3_client, bucket_name, Y_TEST_KEY, y_test)
+    invalidate_bucket(bucket_name)
+
+TRAINING_COLUMNS = FEATURE_COLUMNS + ["price"]
+
+def read_training_columns(body) -> pd.DataFrame:
+    # split only needs the features and the target, the other columns are never parsed
+    return read_dataset(body, columns=TRAINING_COLUMNS)
+
+def read_all_columns(body) -> pd.DataFrame:
+    # every column with the yes/no text kept, so the same frame trains the model and becomes the parquet copy
+    return read_dataset(body, flags="category")
+
+def memory_budget() -> int:
+    # lambda exposes its configured memory, ingest_memory_mb overrides it elsewhere
+    return env_number("ingest_memory_mb", env_number("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", 1024)) * 1024 * 1024
+
+def ingestion_mode(s3_client, bucket_name: str, obj_name: str, mode: str = None, head: dict = None) -> str:
+    mode = (mode or os.getenv("ingest_mode") or "memory").lower()
+    if mode == "auto":
+        size = (head or s3_client.head_object(Bucket=bucket_name, Key=obj_name))["ContentLength"]
+        mode = "streaming" if size * CSV_EXPANSION > memory_budget() else "memory"
+    if mode not in ("memory", "streaming"):
+        raise ValueError(f"unknown ingestion mode '{mode}'")
+    return mode
+
+def sweep_candidates(mode: str, enabled: bool = None) -> list:
+    enabled = bool(env_number("train_sweep", 0)) if enabled is None else enabled
+    # streaming only keeps the sufficient statistics of the linear model, there is nothing to sweep over
+    if not enabled or mode != "memory":
+        return None
+    candidates = default_candidates()
+    if serialization_spec()["format"] == "npz":
+        # ensembles cannot be stored without pickle, a winner among them would only fail once it is registered
+        candidates = [candidate for candidate in candidates if candidate["estimator"] in NPZ_ESTIMATORS]
+    return candidates or None
+
+def ingestion_fingerprints(etag: str, mode: str, candidates: list = None) -> dict:
+    # each stage chains on the previous one, so a new csv or code version invalidates everything downstream
+    clean = fingerprint("clean_df", etag, code_version(), mode)
+    split_fingerprint = fingerprint("split", clean, SPLIT_PARAMS)
+    train_fingerprint = fingerprint("train", split_fingerprint, candidates or hyperparameters(), serialization_spec())
+    return {"clean_df": clean, "split": split_fingerprint, "train": train_fingerprint}
+
+def reusable_run(s3_client, train_fingerprint: str) -> dict:
+    record = load_stage(s3_client, "ingestion", "train", train_fingerprint)
+    if record is None:
+        return None
+    # the outputs must still be the live ones: the version still latest and the test split not overwritten since
+    if load_manifest(s3_client)["aliases"].get("latest") != record["version"]:
+        return None
+    bucket_name = "local-ml-flow-data"
+    if object_etag(s3_client, bucket_name, X_TEST_KEY) != record["x_test"] or object_etag(s3_client, bucket_name, Y_TEST_KEY) != record["y_test"]:
+        return None
+    return record
+
+def ingest(mode: str = None, force: bool = False, sweep_models: bool = None) -> dict:
     logger=get_logger("lambda-ingestion")
     clients = config()
     s3_client = clients["s3"]
     bucket_name = "local-ml-flow-data"
     obj_name = "housing.csv"
+    profiler = StageProfiler("ingestion")
+    track_client(s3_client)
 
     try:
-        logger.info("attempting to retrieve dataset")
-        response = s3_client.get_object(Bucket=bucket_name, Key=obj_name)
-        base_df = pd.read_csv(response["Body"])
+        head = s3_client.head_object(Bucket=bucket_name, Key=obj_name)
+        mode = ingestion_mode(s3_client, bucket_name, obj_name, mode, head)
+        candidates = sweep_candidates(mode, sweep_models)
+        fingerprints = ingestion_fingerprints(head.get("ETag"), mode, candidates)
+        cached = reusable_run(s3_client, fingerprints["train"]) if stage_cache_enabled(force) else None
+        if cached is not None:
+            logger.info(f"dataset, code and config unchanged, reusing model version {cached['version']}")
+            for stage, covered_by in REUSED_STAGES[mode].items():
+                if stage != "sweep" or candidates:
+                    profiler.reuse(stage, fingerprints[covered_by])
+            report = profiler.report()
+            report.update({"mode": mode, "version": cached["version"], "fingerprints": fingerprints})
+            save_run_record(s3_client, report)
+            return report
+
+        results, metadata = None, None
+        if mode == "streaming":
+            logger.info("streaming dataset, training incrementally chunk by chunk")
+            with profiler.stage("stream_fit"):
+                response = s3_client.get_object(Bucket=bucket_name, Key=obj_name)
+                model_object, scaler, x_test, y_test = stream_fit(response["Body"], memory_budget())
+        else:
+            logger.info("attempting to retrieve dataset")
+            with profiler.stage("load_dataset"):
+                # a fresh parquet copy only costs ranged reads of the training columns
+                base_df = read_parquet_columns(s3_client, bucket_name, obj_name, head, TRAINING_COLUMNS)
+                stale = base_df is None
+                # every column is only worth parsing when the parquet copy can be written from the frame
+                materialize = stale and parquet_writable()
+                if materialize:
+                    base_df, response = load_dataset(s3_client, bucket_name, obj_name, profiler.wrap("read_csv", read_all_columns), "all-columns", head)
+                elif stale:
+                    base_df, _ = load_dataset(s3_client, bucket_name, obj_name, profiler.wrap("read_csv", read_training_columns), "training", head)
 
-        logger.info("retrieved dataset, now cleaning it")
-        housing = clean_df(df=base_df)
+            logger.info("retrieved dataset, now cleaning it")
+            with profiler.stage("clean_df"):
+                housing = clean_df(df=base_df)
 
-        logger.info("splitting into train and test data")
-        x_train, x_test, y_train, y_test = split(dataset=housing)
+            logger.info("splitting into train and test data")
+            with profiler.stage("split"):
+                x_train, x_test, y_train, y_test, scaler = split(dataset=housing, return_scaler=True)
 
-        logger.info("training model on training data")
-        model_object = train(x_train=x_train, y_train=y_train)
+            winner = {"estimator": "LinearRegression", "params": None}
+            if candidates:
+                logger.info(f"sweeping {len(candidates)} candidate regressors")
+                with profiler.stage("sweep"):
+                    # the test split is kept for the score inference publishes, selecting on it would inflate that score
+                    results = sweep(x_train, y_train, candidates)
+                    winner = best_candidate(results)
+                logger.info(f"best candidate {winner['estimator']} {winner['params']} with validation r2 {winner['r2']:.4f}")
+                metadata = {"validation_r2": winner["r2"], "params": winner["params"], "candidates": len(results)}
 
-        logger.info("saving model")
-        save_model(model=model_object)
+            logger.info("training model on training data")
+            with profiler.stage("train"):
+                # the winner is refitted here rather than shipped back from its worker
+                model_object = train(x_train=x_train, y_train=y_train, params=winner["params"], estimator=winner["estimator"])
+
+            if materialize:
+                logger.info("writing the parquet copy of the dataset")
+                with profiler.stage("materialize_parquet"):
+                    try:
+                        materialize_parquet(s3_client, bucket_name, obj_name, base_df, response.get("ETag") or head.get("ETag"))
+                    except Exception as e:
+                        # the copy only speeds up later reads, the csv stays the source of truth
+                        logger.warning(f"could not write parquet copy - {e}")
+
+        logger.info("registering model")
+        with profiler.stage("register_model"):
+            version = register_model(model=model_object, scaler=scaler, metadata=metadata)
 
         logger.info("saving test data for inference")
-        save_test_data(s3_client, x_test, y_test)
+        with profiler.stage("save_test_data"):
+            save_test_data(s3_client, x_test, y_test)
+
+        save_stage(s3_client, "ingestion", "train", fingerprints["train"], {
+            "version": version,
+            "x_test": object_etag(s3_client, bucket_name, X_TEST_KEY),
+            "y_test": object_etag(s3_client, bucket_name, Y_TEST_KEY)
+        })
 
     except Exception as e:
         logger.error(f"error while ingest - {e}")
+        save_run_record(s3_client, profiler.report("failed", str(e)))
         raise
 
-    return None
+    report = profiler.report()
+    report.update({"mode": mode, "version": version, "fingerprints": fingerprints, "sweep": results})
+    save_run_record(s3_client, report)
+    return report
 
 def handler(event, context) -> dict:
     try:
-        ingest()
-        return {"statusCode": 200, "body": "success"}
+        event = event if isinstance(event, dict) else {}
+        report = ingest(mode=event.get("mode"), force=bool(event.get("force")), sweep_models=event.get("sweep"))
+        return {"statusCode": 200, "body": json.dumps({"status": "success", "profile": report})}
 
     except Exception as e:
-        return {"statusCode": 500, "body": str(e)}
\ No newline at end of file
+        return {"statusCode": 500, "body": str(e)}
+
+    finally:
+        flush_logs()
\ No newline at end of file
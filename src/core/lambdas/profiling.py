@@ -0,0 +1,177 @@
+# per-stage wall time, cpu time, memory and s3 bytes for the pipeline runs, persisted as a json run record
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from src.config.cache import invalidate_bucket
+from src.config.client import env_number
+from src.config.logger import get_logger
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+RUNS_BUCKET = "local-ml-flow-data"
+MB = 1024 * 1024
+
+_active = threading.local()
+# tracemalloc is process wide: overlapping profilers share one tracing session, the last one out stops it
+_tracing = {"users": 0, "started": False}
+_tracing_lock = threading.Lock()
+
+def acquire_tracing() -> None:
+    with _tracing_lock:
+        if _tracing["users"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing["started"] = True
+        _tracing["users"] += 1
+
+def release_tracing() -> None:
+    with _tracing_lock:
+        _tracing["users"] -= 1
+        # tracing someone else started before any profiler is left running
+        if _tracing["users"] == 0 and _tracing["started"]:
+            tracemalloc.stop()
+            _tracing["started"] = False
+
+def max_rss_mb() -> float:
+    if resource is None:
+        return None
+    # ru_maxrss is reported in KiB on linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+
+def body_size(body) -> int:
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return memoryview(body).nbytes
+    try:
+        # file objects are measured from where the upload starts reading, then put back
+        position = body.tell()
+        end = body.seek(0, os.SEEK_END)
+        body.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+def _count_sent(params, **kwargs) -> None:
+    # botocore wraps the body into a chunked stream before sending, the caller's body is the one with a size
+    stage = getattr(_active, "stage", None)
+    if stage is not None and params.get("Body") is not None:
+        stage["bytes_written"] += body_size(params["Body"])
+
+def _count_received(http_response, **kwargs) -> None:
+    stage = getattr(_active, "stage", None)
+    length = http_response.headers.get("content-length")
+    if stage is not None and length and length.isdigit():
+        stage["bytes_read"] += int(length)
+
+def track_client(client) -> None:
+    # unique ids keep the shared, cached client from collecting one handler per run
+    client.meta.events.register("provide-client-params.s3.*", _count_sent, unique_id="profiling-bytes-written")
+    client.meta.events.register("after-call.s3.*", _count_received, unique_id="profiling-bytes-read")
+
+class StageProfiler:
+    def __init__(self, pipeline: str, trace_memory: bool = None):
+        self.pipeline = pipeline
+        self.run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        # tracing slows every allocation in the process, including requests served next to an in-process job, so it is opt-in
+        self.trace_memory = bool(env_number("profile_tracemalloc", 0)) if trace_memory is None else trace_memory
+        self.stages = []
+        self._stack = []
+        self._tracing = False
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        parent = self._stack[-1] if self._stack else None
+        if self.trace_memory and not self._tracing:
+            acquire_tracing()
+            self._tracing = True
+        if self.trace_memory and parent is not None:
+            # resetting the peak for the child would hide what the parent allocated so far
+            parent["_peak"] = max(parent["_peak"], tracemalloc.get_traced_memory()[1])
+        if self.trace_memory:
+            # with overlapping profilers the peak also covers the other runs' allocations
+            tracemalloc.reset_peak()
+
+        record = {"name": name, "parent": parent["name"] if parent else None, "bytes_read": 0, "bytes_written": 0, "_peak": 0}
+        self._stack.append(record)
+        previous, _active.stage = getattr(_active, "stage", None), record
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = round(time.perf_counter() - wall, 6)
+            record["cpu_seconds"] = round(time.process_time() - cpu, 6)
+            peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1]) if self.trace_memory else None
+            record["peak_traced_mb"] = round(peak / MB, 3) if peak is not None else None
+            record["max_rss_mb"] = max_rss_mb()
+            self._stack.pop()
+            _active.stage = previous
+            if parent is not None:
+                parent["_peak"] = max(parent["_peak"], peak or 0)
+                parent["bytes_read"] += record["bytes_read"]
+                parent["bytes_written"] += record["bytes_written"]
+            self.stages.append(record)
+
+    def reuse(self, name: str, stage_fingerprint: str) -> None:
+        # a skipped stage still shows up in the report, with the fingerprint whose outputs were reused
+        self.stages.append({
+            "name": name,
+            "parent": None,
+            "reused": True,
+            "fingerprint": stage_fingerprint,
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "wall_seconds": 0.0,
+            "cpu_seconds": 0.0,
+            "peak_traced_mb": None,
+            "max_rss_mb": None
+        })
+
+    def wrap(self, name: str, func):
+        def profiled(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return profiled
+
+    def report(self, status: str = "success", error: str = None) -> dict:
+        if self._tracing and not self._stack:
+            release_tracing()
+            self._tracing = False
+        top_level = [stage for stage in self.stages if stage["parent"] is None]
+        return {
+            "run_id": self.run_id,
+            "pipeline": self.pipeline,
+            "status": status,
+            "error": error,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "cpu_seconds": round(time.process_time() - self._cpu_started, 6),
+            "bytes_read": sum(stage["bytes_read"] for stage in top_level),
+            "bytes_written": sum(stage["bytes_written"] for stage in top_level),
+            "max_rss_mb": max_rss_mb(),
+            "reused": [stage["name"] for stage in self.stages if stage.get("reused")],
+            "stages": self.stages
+        }
+
+def save_run_record(s3_client, report: dict) -> str:
+    logger = get_logger("run-record")
+    key = f"runs/{report['pipeline']}/{report['run_id']}.json"
+    try:
+        s3_client.put_object(Bucket=RUNS_BUCKET, Key=key, Body=json.dumps(report, indent=2).encode("utf-8"), ContentType="application/json")
+        invalidate_bucket(RUNS_BUCKET)
+        logger.info(f"run record saved to s3://{RUNS_BUCKET}/{key}")
+    except Exception as e:
+        # the record is diagnostics only, losing it must not fail the pipeline
+        logger.warning(f"could not save run record - {e}")
+        return None
+    return key
@@ -0,0 +1,41 @@
+# test split artifacts as raw .npy arrays: no pickle, streamed to a local file and memory mapped on load
+
+import io
+import os
+import shutil
+import numpy as np
+from src.config.logger import get_logger
+
+NPY_FORMAT = "npy-1.0"
+COPY_CHUNK_BYTES = 1024 * 1024
+
+def save_array(s3_client, bucket: str, key: str, array) -> int:
+    array = np.ascontiguousarray(np.asarray(array))
+    if array.dtype.hasobject:
+        raise ValueError(f"{key} holds python objects, only numeric arrays can be stored without pickle")
+
+    buffer = io.BytesIO()
+    np.lib.format.write_array(buffer, array, version=(1, 0), allow_pickle=False)
+    size = buffer.tell()
+    # the buffer itself is uploaded, getvalue() would hold a second full copy of the array
+    buffer.seek(0)
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=buffer,
+        ContentType="application/octet-stream",
+        Metadata={"format": NPY_FORMAT, "dtype": array.dtype.str, "shape": "x".join(map(str, array.shape))}
+    )
+    return size
+
+def load_array(s3_client, bucket: str, key: str, directory: str) -> np.ndarray:
+    logger = get_logger("load-array")
+    path = os.path.join(directory, os.path.basename(key))
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+
+    # the body is copied to disk in fixed chunks, never held in memory as one bytes object
+    with open(path, "wb") as file:
+        shutil.copyfileobj(response["Body"], file, COPY_CHUNK_BYTES)
+    logger.info(f"downloaded s3://{bucket}/{key} to {path}")
+
+    return np.load(path, mmap_mode="r", allow_pickle=False)
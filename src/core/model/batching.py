@@ -0,0 +1,119 @@
+# coalesce concurrent prediction requests into a single vectorized predict call
+
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from src.config.client import env_number
+from src.config.logger import get_logger
+from src.config.storage import run_io
+from src.core.model.serving import serve_batch, serving_version
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_rows: int = 1024, max_latency_ms: float = 5):
+        self.predict_fn = predict_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_latency = max_latency_ms / 1000
+        self._pending = []
+        self._pending_rows = 0
+        self._timer = None
+        self._tasks = set()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.full_batches = 0
+
+    async def submit(self, rows: list):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((rows, future))
+        self._pending_rows += len(rows)
+
+        if self._pending_rows >= self.max_batch_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list) -> None:
+        rows = [row for request_rows, _ in batch for row in request_rows]
+        try:
+            predictions, metadata = await run_io(self.predict_fn, rows)
+        except Exception as e:
+            if len(batch) > 1:
+                # one bad request must not fail the others, retry them one by one
+                get_logger("micro-batcher").warning(f"batch of {len(batch)} requests failed, retrying individually - {e}")
+                for request in batch:
+                    await self._run([request])
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        self.rows += len(rows)
+        self.full_batches += len(rows) >= self.max_batch_rows
+
+        start = 0
+        for request_rows, future in batch:
+            if not future.done():
+                future.set_result((predictions[start:start + len(request_rows)], metadata))
+            start += len(request_rows)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_rows": self.max_batch_rows,
+            "max_latency_ms": self.max_latency * 1000,
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "full_batches": self.full_batches,
+            "avg_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+            "avg_fill_ratio": self.rows / (self.batches * self.max_batch_rows) if self.batches else 0.0
+        }
+
+_batchers = OrderedDict()
+_lock = threading.Lock()
+
+async def prediction_batcher(ref: str = "latest") -> MicroBatcher:
+    # one batcher per resolved model version, aliases of the same version share it and a batch is always scored by a single model
+    # unknown refs raise here, before a batcher exists for them
+    version = await run_io(serving_version, ref)
+    with _lock:
+        batcher = _batchers.get(version)
+        if batcher is None:
+            batcher = MicroBatcher(
+                functools.partial(serve_batch, ref=version),
+                max_batch_rows=env_number("batch_max_rows", 1024),
+                max_latency_ms=env_number("batch_max_latency_ms", 5, float)
+            )
+            _batchers[version] = batcher
+            # every retrain moves latest to a new version, the batchers of versions nobody asks for anymore are dropped;
+            # an evicted batcher still flushes the requests it already holds
+            while len(_batchers) > max(1, env_number("batch_max_models", 4)):
+                _batchers.popitem(last=False)
+        else:
+            _batchers.move_to_end(version)
+    return batcher
+
+def batching_stats() -> dict:
+    return {version: batcher.stats() for version, batcher in list(_batchers.items())}
+
+def reset_batchers() -> None:
+    with _lock:
+        _batchers.clear()
@@ -1,24 +1,54 @@
-# convert dataset's yes/no to 1/0
+# encode the dataset's yes/no and categorical columns to compact dtypes
 
+import numpy as np
 import pandas as pd
-from src.config.logger import get_logger
+from src.config.logger import get_logger, lazy
 
-def clean_df(df: pd.DataFrame) -> pd.DataFrame:
+BINARY_COLUMNS = ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"]
+CATEGORICAL_COLUMNS = {"furnishingstatus": ["unfurnished", "semi-furnished", "furnished"]}
+
+def encode_binary(series: pd.Series, dtype: str = "int8") -> pd.Series:
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        # rows sent to /model/predict may already be encoded as 0/1 or true/false
+        ones = series.to_numpy() == 1
+        invalid = ~(ones | (series.to_numpy() == 0))
+    else:
+        # plain equality checks run in the string array's native kernels, far faster than a hash lookup per row
+        ones = (series.eq("yes") | series.eq("1")).to_numpy(dtype=bool, na_value=False)
+        zeros = (series.eq("no") | series.eq("0")).to_numpy(dtype=bool, na_value=False)
+        invalid = ~(ones | zeros)
+
+    if invalid.any():
+        raise ValueError(f"column {series.name} has values other than yes/no: {sorted(map(str, pd.unique(series[invalid])))[:5]}")
+    return pd.Series(ones.astype(dtype), index=series.index, name=series.name)
+
+def encode_categorical(series: pd.Series, categories: list) -> pd.Series:
+    # factorize once, then map the handful of distinct labels onto the fixed category order
+    codes, uniques = pd.factorize(series)
+    positions = pd.Index(categories).get_indexer(uniques)
+    if (positions < 0).any():
+        raise ValueError(f"column {series.name} has unknown categories: {sorted(map(str, uniques[positions < 0]))[:5]}")
+    codes = np.where(codes < 0, -1, positions[codes]).astype("int8")
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+
+def clean_df(df: pd.DataFrame, inplace: bool = False, binary_dtype: str = "int8") -> pd.DataFrame:
     logger=get_logger("clean_dataframe")
     logger.info("Attempting to clean dataframe (from Yes/no to 1/0)")
 
-    df_clean = df.copy()
-    target_columns = ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"]
+    # a shallow copy shares the untouched columns, only the encoded ones are new arrays
+    df_clean = df if inplace else df.copy(deep=False)
 
-    logger.debug(f"initial shape: {df.shape}, columns: {list(df.columns)}")
-    logger.debug(f"sum of target columns: {df[target_columns].sum()}")
+    logger.debug("initial shape: %s, columns: %s", df.shape, lazy(lambda: list(df.columns)))
+    logger.debug("sum of target columns: %s", lazy(lambda: (df[BINARY_COLUMNS] == "yes").sum()))
 
-    try: 
-        for col in target_columns:
-            df_clean.loc[df_clean[col] == "yes", col] = "1"
-            df_clean.loc[df_clean[col] == "no", col] = "0"
+    try:
+        for col in BINARY_COLUMNS:
+            df_clean[col] = encode_binary(df[col], binary_dtype)
+        for col, categories in CATEGORICAL_COLUMNS.items():
+            if col in df.columns:
+                df_clean[col] = encode_categorical(df[col], categories)
         logger.info("Successfully cleaned dataframe")
-    
+
     except Exception as e:
         logger.error(f"failed to clean dataframe - {e}")
         raise
@@ -0,0 +1,134 @@
+# versioned model registry: immutable artifacts per version plus a manifest holding metadata and aliases
+
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from botocore.exceptions import ClientError
+from src.config.client import config
+from src.config.cache import invalidate_bucket
+from src.config.logger import get_logger
+from src.core.model.save_model import save_model
+from src.core.model.serialization import artifact_suffix, serialization_spec
+
+REGISTRY_BUCKET = "local-ml-flow-models"
+MANIFEST_KEY = "registry/manifest.json"
+LEGACY_KEYS = {"model": "model.joblib", "scaler": "scaler.joblib"}
+MANIFEST_ATTEMPTS = 5
+
+def is_missing(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+def empty_manifest() -> dict:
+    return {"versions": {}, "aliases": {}}
+
+def new_version() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+def is_conflict(error: ClientError) -> bool:
+    # 412 when the manifest changed since it was read, 409 when another conditional write is in flight
+    return error.response.get("Error", {}).get("Code") in ("412", "PreconditionFailed", "409", "ConditionalRequestConflict")
+
+def read_manifest(s3_client) -> tuple:
+    try:
+        response = s3_client.get_object(Bucket=REGISTRY_BUCKET, Key=MANIFEST_KEY)
+    except ClientError as e:
+        if is_missing(e):
+            return empty_manifest(), None
+        raise
+    return json.loads(response["Body"].read()), response.get("ETag")
+
+def load_manifest(s3_client) -> dict:
+    return read_manifest(s3_client)[0]
+
+def save_manifest(s3_client, manifest: dict, etag: str = None) -> None:
+    # the write only lands if nobody replaced the manifest since it was read, or created it when it did not exist
+    condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+    s3_client.put_object(
+        Bucket=REGISTRY_BUCKET,
+        Key=MANIFEST_KEY,
+        Body=json.dumps(manifest, indent=2).encode("utf-8"),
+        ContentType="application/json",
+        **condition
+    )
+    invalidate_bucket(REGISTRY_BUCKET)
+
+def update_manifest(s3_client, change) -> dict:
+    # ingestions in other processes (lambda) and alias moves from the api write the same manifest,
+    # a lost race re-reads it and applies the change again instead of dropping the other writer's update
+    logger = get_logger("model-registry")
+    for attempt in range(1, MANIFEST_ATTEMPTS + 1):
+        manifest, etag = read_manifest(s3_client)
+        change(manifest)
+        try:
+            save_manifest(s3_client, manifest, etag)
+            return manifest
+        except ClientError as e:
+            if not is_conflict(e) or attempt == MANIFEST_ATTEMPTS:
+                raise
+            logger.warning(f"manifest changed while updating it, retrying ({attempt}/{MANIFEST_ATTEMPTS})")
+            time.sleep(0.05 * attempt)
+
+def resolve(manifest: dict, ref: str) -> str:
+    # a ref is either an alias (latest, champion, ...) or a version id
+    if ref in manifest["aliases"]:
+        return manifest["aliases"][ref]
+    if ref in manifest["versions"]:
+        return ref
+    return None
+
+def register_model(model, scaler=None, metadata: dict = None, aliases: tuple = ("latest",), legacy_copy: bool = True) -> str:
+    logger = get_logger("model-registry")
+    clients = config()
+    s3_client = clients["s3"]
+    version = new_version()
+
+    try:
+        spec = serialization_spec()
+        suffix = artifact_suffix(spec)
+        artifacts = {"model": f"registry/{version}/model{suffix}"}
+        save_model(model=model, filename=artifacts["model"], spec=spec)
+        if scaler is not None:
+            artifacts["scaler"] = f"registry/{version}/scaler{suffix}"
+            save_model(model=scaler, filename=artifacts["scaler"], spec=spec)
+
+        entry = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "artifacts": artifacts,
+            "serialization": spec,
+            "metadata": {"estimator": type(model).__name__, **(metadata or {})}
+        }
+
+        def add_version(manifest: dict) -> None:
+            manifest["versions"][version] = entry
+            for alias in aliases:
+                manifest["aliases"][alias] = version
+
+        update_manifest(s3_client, add_version)
+
+        if legacy_copy:
+            # model.joblib / scaler.joblib keep pointing at the newest version for existing consumers,
+            # copy_object carries the serialization metadata along
+            for name, key in artifacts.items():
+                s3_client.copy_object(Bucket=REGISTRY_BUCKET, Key=LEGACY_KEYS[name], CopySource={"Bucket": REGISTRY_BUCKET, "Key": key})
+        logger.info(f"registered model version {version} with aliases {list(aliases)}")
+
+    except Exception as e:
+        logger.error(f"failed to register model - {e}")
+        raise
+
+    return version
+
+def set_alias(alias: str, version: str) -> dict:
+    logger = get_logger("model-registry")
+    clients = config()
+    s3_client = clients["s3"]
+
+    def move_alias(manifest: dict) -> None:
+        if version not in manifest["versions"]:
+            raise KeyError(f"unknown model version '{version}'")
+        manifest["aliases"][alias] = version
+
+    manifest = update_manifest(s3_client, move_alias)
+    logger.info(f"alias {alias} now points to {version}")
+    return manifest
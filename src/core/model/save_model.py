@@ -1,26 +1,29 @@
 # take the model and serialize it into a binary
 
-import joblib
-import io
 from src.config.client import config
+from src.config.cache import invalidate_bucket
 from src.config.logger import get_logger
+from src.core.model.serialization import serialization_spec, serialize
 
-def save_model(model, filename="model.joblib"):
+def save_model(model, filename="model.joblib", spec: dict = None) -> dict:
     logger = get_logger("save-model")
     clients = config()
     s3_client = clients["s3"]
     bucket_name = "local-ml-flow-models"
+    spec = spec or serialization_spec()
 
     try:
-        logger.info("serialize model w/ a buffer")
-        model_buffer = io.BytesIO()
-        joblib.dump(model, model_buffer)
-        model_buffer.seek(0)
+        logger.info(f"serialize model as {spec['format']} with {spec['compression']} compression")
+        body = serialize(model, spec)
 
         logger.info("attempting to upload it on s3")
-        s3_client.put_object(Bucket=bucket_name, Key=filename, Body=model_buffer.getvalue())
-        logger.info(f"model successfully uploaded to s3://{bucket_name}/{filename}")
+        # the metadata tells every reader which loader and codec to use
+        s3_client.put_object(Bucket=bucket_name, Key=filename, Body=body, Metadata=spec)
+        invalidate_bucket(bucket_name)
+        logger.info(f"model successfully uploaded to s3://{bucket_name}/{filename} ({len(body)} bytes)")
         
     except Exception as e:
         logger.error(f"Failed to save model - {e}")
-        raise
\ No newline at end of file
+        raise
+
+    return spec
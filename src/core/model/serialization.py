@@ -0,0 +1,132 @@
+# model artifact serialization: joblib or a pickle-free npz format, optionally compressed, described by s3 metadata
+
+import io
+import json
+import os
+import zlib
+import joblib
+import numpy as np
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.preprocessing import StandardScaler
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMATS = ("joblib", "npz")
+CODECS = {"none": None, "zlib": 6, "lz4": 0, "zstd": 3}
+SUFFIXES = {"joblib": ".joblib", "npz": ".npz", "zlib": ".zz", "lz4": ".lz4", "zstd": ".zst"}
+# only plain estimators whose fitted state is a handful of arrays can be rebuilt without pickle
+NPZ_ESTIMATORS = {cls.__name__: cls for cls in (LinearRegression, Ridge, Lasso, ElasticNet, StandardScaler)}
+HEADER = "__header__"
+
+def parse_compression(value: str = None) -> tuple:
+    # "zstd-3" / "lz4" / "none", a missing level means the codec's default
+    codec, _, level = (value or "none").lower().partition("-")
+    if codec not in CODECS:
+        raise ValueError(f"unknown compression '{value}', expected one of {list(CODECS)}")
+    if codec == "lz4" and lz4 is None:
+        raise ValueError("lz4 compression needs the lz4 package")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package")
+    return codec, int(level) if level else CODECS[codec]
+
+def serialization_spec(fmt: str = None, compression: str = None) -> dict:
+    fmt = (fmt or os.getenv("model_format") or "joblib").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown model format '{fmt}', expected one of {list(FORMATS)}")
+    codec, level = parse_compression(compression or os.getenv("model_compression"))
+    return {"format": fmt, "compression": codec if level is None else f"{codec}-{level}"}
+
+def artifact_suffix(spec: dict) -> str:
+    codec, _ = parse_compression(spec["compression"])
+    return SUFFIXES[spec["format"]] + SUFFIXES.get(codec, "")
+
+def dump_npz(estimator) -> bytes:
+    name = type(estimator).__name__
+    if NPZ_ESTIMATORS.get(name) is not type(estimator):
+        raise ValueError(f"{name} cannot be stored without pickle, supported estimators are {sorted(NPZ_ESTIMATORS)}")
+
+    arrays, scalars, text_arrays = {}, {}, []
+    # fitted state is the trailing underscore attributes, the constructor arguments come from get_params
+    for attribute, value in vars(estimator).items():
+        if not attribute.endswith("_") or attribute.startswith("_"):
+            continue
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                # feature_names_in_ is an object array of str
+                value = value.astype(str)
+                text_arrays.append(attribute)
+            arrays[attribute] = value
+        elif isinstance(value, np.generic):
+            scalars[attribute] = value.item()
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            scalars[attribute] = value
+        else:
+            raise ValueError(f"{name}.{attribute} of type {type(value).__name__} cannot be stored without pickle")
+
+    try:
+        header = json.dumps({"estimator": name, "params": estimator.get_params(), "scalars": scalars, "text_arrays": text_arrays})
+    except TypeError as e:
+        raise ValueError(f"{name} parameters cannot be stored without pickle - {e}") from e
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **{HEADER: np.frombuffer(header.encode("utf-8"), dtype=np.uint8)}, **arrays)
+    return buffer.getvalue()
+
+def load_npz(data: bytes):
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        header = json.loads(archive[HEADER].tobytes())
+        if header["estimator"] not in NPZ_ESTIMATORS:
+            raise ValueError(f"unsupported estimator '{header['estimator']}' in npz artifact")
+        estimator = NPZ_ESTIMATORS[header["estimator"]](**header["params"])
+        for attribute in archive.files:
+            if attribute != HEADER:
+                value = archive[attribute]
+                setattr(estimator, attribute, value.astype(object) if attribute in header["text_arrays"] else value)
+    for attribute, value in header["scalars"].items():
+        setattr(estimator, attribute, value)
+    return estimator
+
+def compress(data: bytes, codec: str, level: int) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "lz4":
+        return lz4.frame.compress(data, compression_level=level)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return data
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "lz4":
+        return lz4.frame.decompress(data)
+    if codec == "zstd":
+        # frames written by compress() carry their size, so this is a single allocation
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+def serialize(obj, spec: dict) -> bytes:
+    if spec["format"] == "npz":
+        data = dump_npz(obj)
+    else:
+        buffer = io.BytesIO()
+        joblib.dump(obj, buffer)
+        data = buffer.getvalue()
+    return compress(data, *parse_compression(spec["compression"]))
+
+def deserialize(data: bytes, metadata: dict = None):
+    # objects written before the format was recorded are plain joblib pickles
+    metadata = metadata or {}
+    codec, _ = parse_compression(metadata.get("compression"))
+    data = decompress(data, codec)
+    if metadata.get("format", "joblib") == "npz":
+        return load_npz(data)
+    return joblib.load(io.BytesIO(data))
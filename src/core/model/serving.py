@@ -0,0 +1,163 @@
+# keep deserialized model artifacts warm in memory, revalidated against the s3 etag
+
+import json
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from botocore.exceptions import ClientError
+from src.config.client import config, env_number
+from src.config.logger import get_logger
+from src.core.model.conversion import clean_df
+from src.core.model.registry import REGISTRY_BUCKET, MANIFEST_KEY, LEGACY_KEYS, is_missing, resolve
+from src.core.model.serialization import deserialize
+from src.core.model.train_test_split import FEATURE_COLUMNS
+
+MODEL_BUCKET = REGISTRY_BUCKET
+
+class ArtifactCache:
+    def __init__(self, revalidate_seconds: float, max_bytes: int):
+        self.revalidate_seconds = revalidate_seconds
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def _fresh(self, entry: dict) -> bool:
+        return entry["immutable"] or time.monotonic() - entry["checked_at"] < self.revalidate_seconds
+
+    def load(self, s3_client, bucket_name: str, key: str, loader=None, immutable: bool = False, missing_ok: bool = False) -> tuple:
+        # registry versions never change once written, so immutable artifacts skip the HEAD entirely
+        logger = get_logger("artifact-cache")
+        cache_key = (bucket_name, key)
+        entry = self._entries.get(cache_key)
+        if entry is not None and self._fresh(entry):
+            with self._lock:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+            return entry["artifact"], entry["etag"]
+
+        # one loader per artifact, concurrent requests for it wait for the warm copy instead of all downloading it,
+        # while other keys and stats() only contend for the short bookkeeping lock
+        with self._load_lock(cache_key):
+            entry = self._entries.get(cache_key)
+            try:
+                head = s3_client.head_object(Bucket=bucket_name, Key=key)
+            except ClientError as e:
+                if not (missing_ok and is_missing(e)):
+                    raise
+                head = {"ETag": None}
+            if entry is not None and entry["etag"] == head.get("ETag"):
+                with self._lock:
+                    entry["checked_at"] = time.monotonic()
+                    if cache_key in self._entries:
+                        self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                return entry["artifact"], entry["etag"]
+
+            artifact, etag, size = None, None, 0
+            if head.get("ETag") is not None:
+                logger.info(f"loading s3://{bucket_name}/{key}")
+                response = s3_client.get_object(Bucket=bucket_name, Key=key)
+                data = response["Body"].read()
+                # model artifacts describe their format in the object metadata, other loaders only take the bytes
+                artifact = deserialize(data, response.get("Metadata")) if loader is None else loader(data)
+                etag, size = response.get("ETag") or head.get("ETag"), len(data)
+
+            with self._lock:
+                if etag is not None:
+                    self.loads += 1
+                self._store(cache_key, {"artifact": artifact, "etag": etag, "checked_at": time.monotonic(), "immutable": immutable, "size": size})
+            return artifact, etag
+
+    def _load_lock(self, cache_key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(cache_key, threading.Lock())
+
+    def _store(self, cache_key: tuple, entry: dict) -> None:
+        # the serialized size is used as an estimate of the in-memory footprint
+        if cache_key in self._entries:
+            self.current_bytes -= self._entries.pop(cache_key)["size"]
+        self._entries[cache_key] = entry
+        self.current_bytes += entry["size"]
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted["size"]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._load_locks.clear()
+            self.current_bytes = 0
+            self.hits = self.loads = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
+
+_artifact_cache = None
+_lock = threading.Lock()
+
+def artifact_cache() -> ArtifactCache:
+    global _artifact_cache
+    if _artifact_cache is None:
+        with _lock:
+            if _artifact_cache is None:
+                _artifact_cache = ArtifactCache(
+                    revalidate_seconds=env_number("model_revalidate_seconds", 10, float),
+                    max_bytes=env_number("model_cache_mb", 512) * 1024 * 1024
+                )
+    return _artifact_cache
+
+def prepare_features(rows: list) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows)
+    missing = [column for column in FEATURE_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"missing feature column(s): {missing}")
+    # the projection is a fresh frame nobody else holds, so it can be encoded in place
+    return clean_df(df=frame[FEATURE_COLUMNS], inplace=True)
+
+def predict_rows(model, scaler, rows: list) -> np.ndarray:
+    # same encoding and scaling as the training path, then a single vectorized predict for the whole batch
+    features = prepare_features(rows)
+    return model.predict(scaler.transform(features))
+
+def resolve_artifacts(s3_client, ref: str = "latest") -> tuple:
+    manifest, _ = artifact_cache().load(s3_client, MODEL_BUCKET, MANIFEST_KEY, loader=json.loads, missing_ok=True)
+    version = resolve(manifest, ref) if manifest else None
+    if version is not None:
+        return version, manifest["versions"][version]["artifacts"], True
+    if ref == "latest":
+        # models trained before the registry existed only live under the legacy keys
+        return None, LEGACY_KEYS, False
+    raise LookupError(f"unknown model version or alias '{ref}'")
+
+def serving_version(ref: str = "latest") -> str:
+    # models under the legacy keys have no version and keep being served as "latest"
+    version, _, _ = resolve_artifacts(config()["s3"], ref)
+    return version or ref
+
+def load_serving_model(s3_client, ref: str = "latest") -> tuple:
+    version, artifacts, immutable = resolve_artifacts(s3_client, ref)
+    if "scaler" not in artifacts:
+        raise LookupError(f"model version '{version}' was registered without a scaler and cannot serve raw rows")
+    model, model_etag = artifact_cache().load(s3_client, MODEL_BUCKET, artifacts["model"], immutable=immutable)
+    scaler, _ = artifact_cache().load(s3_client, MODEL_BUCKET, artifacts["scaler"], immutable=immutable)
+    return model, scaler, {"version": version, "key": artifacts["model"], "etag": model_etag}
+
+def serve_batch(rows: list, ref: str = "latest") -> tuple:
+    model, scaler, served = load_serving_model(config()["s3"], ref)
+    return predict_rows(model, scaler, rows), served
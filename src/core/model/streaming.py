@@ -0,0 +1,111 @@
+# out-of-core training: stream the csv in chunks and fit the scaler and regression from running sums
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from src.config.logger import get_logger
+from src.core.dataset.schema import schema_options
+from src.core.model.conversion import clean_df
+from src.core.model.train_test_split import FEATURE_COLUMNS
+
+TARGET_COLUMN = "price"
+SAMPLE_ROWS = 1000
+# parsing, encoding and the per-chunk copies need a few times the size of the parsed chunk
+CHUNK_BUDGET_SHARE = 0.25
+
+def holdout_mask(start: int, count: int, test_size: float = 0.2, seed: int = 42) -> np.ndarray:
+    # hashing the global row number keeps the split identical whatever the chunk size
+    rows = np.arange(start, start + count, dtype=np.uint64)
+    hashed = (rows + np.uint64(seed)) * np.uint64(0x9E3779B97F4A7C15)
+    return (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53) < test_size
+
+def chunk_rows_for_budget(sample: pd.DataFrame, budget_bytes: int, minimum: int = 1000) -> int:
+    row_bytes = max(1, sample.memory_usage(deep=True).sum() / max(1, len(sample)))
+    return max(minimum, int(budget_bytes * CHUNK_BUDGET_SHARE / row_bytes))
+
+def iter_chunks(body, budget_bytes: int, usecols: list = None):
+    logger = get_logger("streaming-ingestion")
+    # the pyarrow engine cannot iterate, chunks are parsed by the c engine with the same declared dtypes
+    reader = pd.read_csv(body, iterator=True, **schema_options(usecols))
+    try:
+        sample = reader.get_chunk(SAMPLE_ROWS)
+        yield sample
+        chunk_rows = chunk_rows_for_budget(sample, budget_bytes)
+        logger.info(f"reading the rest of the dataset {chunk_rows} rows at a time")
+        while True:
+            try:
+                yield reader.get_chunk(chunk_rows)
+            except StopIteration:
+                return
+    finally:
+        reader.close()
+
+class SufficientStatistics:
+    def __init__(self, n_features: int):
+        self.n = 0
+        self.shift_x = None
+        self.shift_y = 0.0
+        self.sum_x = np.zeros(n_features)
+        self.sum_y = 0.0
+        self.sum_xx = np.zeros((n_features, n_features))
+        self.sum_xy = np.zeros(n_features)
+        self.scaler = StandardScaler()
+
+    def update(self, x: pd.DataFrame, y: pd.Series) -> None:
+        if not len(x):
+            return
+        self.scaler.partial_fit(x)
+        values = x.to_numpy(dtype=np.float64)
+        target = y.to_numpy(dtype=np.float64)
+        if self.shift_x is None:
+            # sums around the first chunk's means avoid the cancellation of raw x'x - n * mean * mean'
+            self.shift_x = values.mean(axis=0)
+            self.shift_y = target.mean()
+        values = values - self.shift_x
+        target = target - self.shift_y
+        self.n += len(values)
+        self.sum_x += values.sum(axis=0)
+        self.sum_y += target.sum()
+        self.sum_xx += values.T @ values
+        self.sum_xy += values.T @ target
+
+    def fit(self) -> tuple:
+        if self.n < 2:
+            raise ValueError(f"need at least 2 training rows, got {self.n}")
+        mean_x = self.sum_x / self.n
+        mean_y = self.sum_y / self.n
+        sxx = self.sum_xx - self.n * np.outer(mean_x, mean_x)
+        sxy = self.sum_xy - self.n * mean_x * mean_y
+        # least squares on the normal equations gives the same minimum norm solution as LinearRegression
+        coef, *_ = np.linalg.lstsq(sxx, sxy, rcond=None)
+
+        model = LinearRegression()
+        # the model sees standardized features, which are centered on the training mean
+        model.coef_ = coef * self.scaler.scale_
+        model.intercept_ = float(mean_y + self.shift_y)
+        model.n_features_in_ = len(coef)
+        return model, self.scaler
+
+def stream_fit(body, budget_bytes: int, test_size: float = 0.2, seed: int = 42) -> tuple:
+    logger = get_logger("streaming-ingestion")
+    statistics = SufficientStatistics(len(FEATURE_COLUMNS))
+    test_x, test_y = [], []
+    start = 0
+
+    for chunk in iter_chunks(body, budget_bytes, usecols=FEATURE_COLUMNS + [TARGET_COLUMN]):
+        encoded = clean_df(df=chunk, inplace=True)
+        is_test = holdout_mask(start, len(encoded), test_size, seed)
+        start += len(encoded)
+
+        train = ~is_test
+        statistics.update(encoded.loc[train, FEATURE_COLUMNS], encoded.loc[train, TARGET_COLUMN])
+        # the encoded test rows are int8, so keeping them is a fraction of the raw csv size
+        test_x.append(encoded.loc[is_test, FEATURE_COLUMNS])
+        test_y.append(encoded.loc[is_test, TARGET_COLUMN])
+
+    logger.info(f"streamed {start} rows, {statistics.n} used for training")
+    model, scaler = statistics.fit()
+    x_test = pd.concat(test_x) if test_x else pd.DataFrame(columns=FEATURE_COLUMNS)
+    y_test = pd.concat(test_y) if test_y else pd.Series(name=TARGET_COLUMN, dtype="int64")
+    return model, scaler, scaler.transform(x_test), y_test
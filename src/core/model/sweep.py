@@ -0,0 +1,121 @@
+# parallel model sweep: every candidate regressor is fitted in a process pool, the best validation r2 wins
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context, shared_memory
+import numpy as np
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+from src.config.client import env_number
+from src.config.logger import get_logger
+from src.core.model.train import build
+
+ALIGNMENT = 64
+# candidates are ranked on a slice of the training data, the test split stays unseen until the winner is scored
+VALIDATION_PARAMS = {"test_size": 0.2, "random_state": 42}
+
+def default_candidates() -> list:
+    alphas = [0.01, 0.1, 1.0, 10.0, 100.0]
+    return (
+        [{"estimator": "LinearRegression", "params": {}}]
+        + [{"estimator": "Ridge", "params": {"alpha": alpha}} for alpha in alphas]
+        + [{"estimator": "Lasso", "params": {"alpha": alpha * 100, "max_iter": 10000}} for alpha in alphas]
+        + [{"estimator": "ElasticNet", "params": {"alpha": alpha, "l1_ratio": ratio, "max_iter": 10000}} for alpha in alphas[1:4] for ratio in (0.2, 0.5, 0.8)]
+        # ensembles stay single threaded, the pool already has one process per core
+        + [{"estimator": "RandomForestRegressor", "params": {"n_estimators": 200, "max_depth": depth, "n_jobs": 1, "random_state": 42}} for depth in (4, 8, None)]
+        + [{"estimator": "GradientBoostingRegressor", "params": {"n_estimators": 200, "learning_rate": rate, "max_depth": 3, "random_state": 42}} for rate in (0.05, 0.1)]
+    )
+
+def share_arrays(arrays: dict) -> tuple:
+    # one block for all arrays: workers attach once and read them in place, tasks only carry the candidate
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = (offset, array.shape)
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name, array in arrays.items():
+        start, shape = layout[name]
+        np.ndarray(shape, dtype=np.float64, buffer=block.buf, offset=start)[...] = array
+    return block, layout
+
+def attached_arrays(block: shared_memory.SharedMemory, layout: dict) -> dict:
+    return {name: np.ndarray(shape, dtype=np.float64, buffer=block.buf, offset=start) for name, (start, shape) in layout.items()}
+
+_worker = {}
+
+def _attach(block_name: str, layout: dict) -> None:
+    # the block stays referenced for the worker's lifetime, the parent unlinks it once the pool is done
+    block = shared_memory.SharedMemory(name=block_name)
+    _worker["block"] = block
+    _worker["arrays"] = attached_arrays(block, layout)
+
+def evaluate(candidate: dict, arrays: dict = None) -> dict:
+    # pool workers read the block attached at start-up, an in-process sweep passes its own arrays
+    arrays = _worker["arrays"] if arrays is None else arrays
+    result = {"estimator": candidate["estimator"], "params": candidate.get("params", {}), "r2": None, "fit_seconds": None, "predict_seconds": None, "error": None}
+    try:
+        model = build(candidate["estimator"], candidate.get("params"))
+        started = time.perf_counter()
+        model.fit(arrays["x_fit"], arrays["y_fit"])
+        fitted = time.perf_counter()
+        y_pred = model.predict(arrays["x_validation"])
+        result["predict_seconds"] = round(time.perf_counter() - fitted, 6)
+        result["fit_seconds"] = round(fitted - started, 6)
+        result["r2"] = float(r2_score(arrays["y_validation"], y_pred))
+    except Exception as e:
+        # one bad grid point is reported, it does not sink the sweep
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+def sweep_workers(workers: int = None) -> int:
+    # lambda has no /dev/shm and no semaphores for a process pool, whatever its vcpu count
+    default = 1 if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else os.cpu_count() or 1
+    return max(1, workers or env_number("sweep_workers", default))
+
+def pool_context():
+    # the api process runs io and job threads, forking it could copy a lock held by one of them into the workers
+    return get_context("forkserver" if "forkserver" in get_all_start_methods() else "spawn")
+
+def pooled(arrays: dict, candidates: list, workers: int) -> list:
+    block, layout = share_arrays(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_attach, initargs=(block.name, layout)) as pool:
+            return list(pool.map(evaluate, candidates))
+    finally:
+        block.close()
+        block.unlink()
+
+def sweep(x_train, y_train, candidates: list = None, workers: int = None) -> list:
+    logger = get_logger("model-sweep")
+    candidates = candidates or default_candidates()
+    workers = min(sweep_workers(workers), len(candidates))
+    x_fit, x_validation, y_fit, y_validation = train_test_split(x_train, y_train, **VALIDATION_PARAMS)
+    split_arrays = {"x_fit": x_fit, "y_fit": y_fit, "x_validation": x_validation, "y_validation": y_validation}
+    arrays = {name: np.ascontiguousarray(array, dtype=np.float64) for name, array in split_arrays.items()}
+    started = time.perf_counter()
+
+    try:
+        results = None
+        if workers > 1:
+            try:
+                results = pooled(arrays, candidates, workers)
+            except OSError as e:
+                # candidates catch their own errors, an OSError here means the host cannot share memory or start a pool
+                logger.warning(f"process pool unavailable, sweeping in-process - {e}")
+                workers = 1
+        if results is None:
+            results = [evaluate(candidate, arrays) for candidate in candidates]
+    except Exception as e:
+        logger.error(f"error while sweeping models - {e}")
+        raise
+
+    logger.info(f"evaluated {len(candidates)} candidate(s) on {workers} worker(s) in {time.perf_counter() - started:.2f}s")
+    # failed candidates sort last
+    return sorted(results, key=lambda result: result["r2"] if result["r2"] is not None else float("-inf"), reverse=True)
+
+def best_candidate(results: list) -> dict:
+    scored = [result for result in results if result["r2"] is not None]
+    if not scored:
+        raise ValueError(f"every sweep candidate failed, first error: {results[0]['error'] if results else None}")
+    return max(scored, key=lambda result: result["r2"])
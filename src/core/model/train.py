@@ -1,15 +1,27 @@
-# training the model using linear regression 
+# training the model using linear regression, or whichever regressor the sweep picked
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
 from src.config.logger import get_logger
 
-def train(x_train, y_train) -> LinearRegression:
+ESTIMATORS = {cls.__name__: cls for cls in (LinearRegression, Ridge, Lasso, ElasticNet, RandomForestRegressor, GradientBoostingRegressor)}
+
+def build(estimator: str = "LinearRegression", params: dict = None):
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"unknown estimator '{estimator}', expected one of {sorted(ESTIMATORS)}")
+    return ESTIMATORS[estimator](**(params or {}))
+
+def hyperparameters(params: dict = None, estimator: str = "LinearRegression") -> dict:
+    # the full set, defaults included, so a changed sklearn default also changes the stage fingerprint
+    return build(estimator, params).get_params()
+
+def train(x_train, y_train, params: dict = None, estimator: str = "LinearRegression"):
     logger = get_logger("train model")
-    logger.info("attempting to train model")
+    logger.info(f"attempting to train model ({estimator})")
 
-    model = LinearRegression()
+    model = build(estimator, params)
     
     try: 
         model.fit(x_train, y_train)
@@ -5,16 +5,18 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from src.config.logger import get_logger
 
-def split(dataset: pd.DataFrame) -> tuple:
+FEATURE_COLUMNS = ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"]
+# 80% into the training, 20% into tests
+SPLIT_PARAMS = {"test_size": 0.2, "random_state": 42}
+
+def split(dataset: pd.DataFrame, return_scaler: bool = False) -> tuple:
     logger = get_logger("split training data and tests")
     logger.info("attempting to split data")
 
-    target_columns = ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"]
     try:
-        x=pd.DataFrame(dataset, columns=target_columns)
+        x=pd.DataFrame(dataset, columns=FEATURE_COLUMNS)
         y=dataset.price
-        # 80% into the training, 20% into tests
-        x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.2, random_state=42)
+        x_train, x_test, y_train, y_test = train_test_split(x, y, **SPLIT_PARAMS)
 
     except Exception as e:
         logger.error(f"error while splitting train and tests - {e}")
@@ -25,5 +27,9 @@ def split(dataset: pd.DataFrame) -> tuple:
 
     x_train_scaled = scaler.fit_transform(x_train)
     x_test_scaled = scaler.transform(x_test)
+
+    if return_scaler:
+        # the fitted scaler is needed to serve predictions on raw rows
+        return x_train_scaled, x_test_scaled, y_train, y_test, scaler
     
     return x_train_scaled, x_test_scaled, y_train, y_test
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from src.api.v3.bucket.get_all_buckets import router as get_bucket_router
@@ -5,13 +6,44 @@ from src.api.v3.lambdas.get_all_lambdas import router as get_lambda_router
 from src.api.v3.bucket.get_all_models import router as get_models_router
 from src.api.v3.bucket.get_dataset import router as get_dataset_router
 from src.api.v3.result.get_result import router as get_result_router
+from src.api.v3.monitoring.get_cache_stats import router as get_cache_stats_router
+from src.api.v3.monitoring.get_batching_stats import router as get_batching_stats_router
+from src.api.v3.model.predict import router as predict_router
+from src.api.v3.model.registry import router as model_registry_router
+from src.api.v3.jobs.pipeline_jobs import router as jobs_router
+from src.api.v3.monitoring.get_metrics import router as get_metrics_router
+from src.config.client import env_number
+from src.config.compression import CompressionMiddleware
+from src.config.metrics import MetricsMiddleware
+from src.config.storage import shutdown_executor
+from src.core.jobs.queue import shutdown_jobs
 
-app = FastAPI(title="local-ml-testing", description="Api to handle lambdas and ML interactions")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_jobs()
+    shutdown_executor()
+
+app = FastAPI(title="local-ml-testing", description="Api to handle lambdas and ML interactions", lifespan=lifespan)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=env_number("compression_min_bytes", 1024),
+    gzip_level=env_number("gzip_level", 6),
+    zstd_level=env_number("zstd_level", 3)
+)
+# added last so it wraps compression and counts the bytes actually sent
+app.add_middleware(MetricsMiddleware)
 app.include_router(get_bucket_router)
 app.include_router(get_lambda_router)
 app.include_router(get_models_router)
 app.include_router(get_dataset_router)
 app.include_router(get_result_router)
+app.include_router(get_cache_stats_router)
+app.include_router(get_batching_stats_router)
+app.include_router(predict_router)
+app.include_router(model_registry_router)
+app.include_router(jobs_router)
+app.include_router(get_metrics_router)
 
 @app.exception_handler(Exception)
 async def default_exception_handler(request: Request, e: Exception):
@@ -27,12 +59,29 @@ def read_root():
             "Bucket related": {
                 "Get all buckets": "/bucket/get-all-buckets",
                 "Get dataset and its data": "/bucket/dataset",
+                "Stream dataset as NDJSON": "/bucket/dataset?format=ndjson",
                 "Get models": "/bucket/get-all-models"
             },
             "Lambdas related": {
                 "Get all lambdas": "/lambda/get-all-lambdas"
             },
-            "Results": "/result/local-ml-flow-data"
+            "Results": "/result/local-ml-flow-data",
+            "Pipeline jobs": {
+                "Start ingestion (POST)": "/jobs/ingest",
+                "Start inference (POST)": "/jobs/inference",
+                "Job status": "/jobs/{id}",
+                "All jobs": "/jobs"
+            },
+            "Model related": {
+                "Predict prices (POST)": "/model/predict",
+                "Model versions and aliases": "/model/versions",
+                "Point an alias at a version (PUT)": "/model/aliases/{alias}?version="
+            },
+            "Monitoring": {
+                "Cache statistics": "/monitoring/cache",
+                "Prediction batching statistics": "/monitoring/batching",
+                "Prometheus metrics": "/metrics"
+            }
         }
     }
 
@@ -0,0 +1,26 @@
+import pytest
+from src.config.client import reset_clients
+from src.config.cache import metadata_cache
+from src.core.dataset.cache import dataset_cache
+from src.core.model.serving import artifact_cache
+from src.core.model.batching import reset_batchers
+from src.core.jobs.queue import shutdown_jobs
+from src.config.metrics import reset_metrics
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    reset_clients()
+    metadata_cache().clear()
+    dataset_cache().clear()
+    artifact_cache().clear()
+    reset_batchers()
+    shutdown_jobs()
+    reset_metrics()
+    yield
+    reset_clients()
+    metadata_cache().clear()
+    dataset_cache().clear()
+    artifact_cache().clear()
+    reset_batchers()
+    shutdown_jobs()
+    reset_metrics()
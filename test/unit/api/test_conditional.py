@@ -0,0 +1,39 @@
+import pytest
+from datetime import datetime, timezone
+from src.api.v3.conditional import representation_etag, etag_matches, cache_headers
+
+class TestConditional:
+    def test_representation_etag_without_variant_is_object_etag(self):
+        assert representation_etag('"abc"') == '"abc"'
+
+    def test_representation_etag_differs_per_variant(self):
+        json_etag = representation_etag('"abc"', "json", 0)
+        arrow_etag = representation_etag('"abc"', "arrow", 0)
+
+        assert json_etag != arrow_etag
+        assert json_etag.startswith('"abc-')
+        assert representation_etag('"abc"', "json", 0) == json_etag
+
+    def test_representation_etag_missing_object_etag(self):
+        assert representation_etag(None, "json") is None
+
+    def test_etag_matches_list_and_weak_tags(self):
+        assert etag_matches('"other", W/"abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"other"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+    def test_cache_headers_from_s3_metadata(self):
+        metadata = {"ETag": '"abc"', "LastModified": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+
+        headers = cache_headers(metadata)
+
+        assert headers["ETag"] == '"abc"'
+        assert headers["Last-Modified"] == "Fri, 02 Jan 2026 03:04:05 GMT"
+        assert "must-revalidate" in headers["Cache-Control"]
+
+    def test_cache_headers_without_metadata(self):
+        headers = cache_headers({})
+
+        assert "ETag" not in headers
+        assert "Last-Modified" not in headers
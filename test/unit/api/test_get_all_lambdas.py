@@ -11,13 +11,13 @@ class TestGetAllLambdas:
     def test_get_all_lambdas_returns_lambda_list(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.return_value = {
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{
             "Functions": [
                 {"FunctionName": "lambda1"},
                 {"FunctionName": "lambda2"},
                 {"FunctionName": "lambda3"}
             ]
-        }
+        }]
         
         response = client.get("/lambda/get-all-lambdas")
         
@@ -28,7 +28,7 @@ class TestGetAllLambdas:
     def test_get_all_lambdas_returns_empty_list(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.return_value = {"Functions": []}
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{"Functions": []}]
         
         response = client.get("/lambda/get-all-lambdas")
         
@@ -39,7 +39,7 @@ class TestGetAllLambdas:
     def test_get_all_lambdas_handles_missing_functions_key(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.return_value = {}
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{}]
         
         response = client.get("/lambda/get-all-lambdas")
         
@@ -50,9 +50,9 @@ class TestGetAllLambdas:
     def test_get_all_lambdas_single_lambda(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.return_value = {
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{
             "Functions": [{"FunctionName": "only-lambda"}]
-        }
+        }]
         
         response = client.get("/lambda/get-all-lambdas")
         
@@ -63,30 +63,55 @@ class TestGetAllLambdas:
     def test_get_all_lambdas_calls_config(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.return_value = {"Functions": []}
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{"Functions": []}]
         
         client.get("/lambda/get-all-lambdas")
         
         mock_config.assert_called_once()
 
     @patch("src.api.v3.lambdas.get_all_lambdas.config")
-    def test_get_all_lambdas_calls_list_functions(self, mock_config):
+    def test_get_all_lambdas_paginates_list_functions(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.return_value = {"Functions": []}
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{"Functions": []}]
         
         client.get("/lambda/get-all-lambdas")
         
-        mock_lambda.list_functions.assert_called_once()
+        mock_lambda.get_paginator.assert_called_once_with("list_functions")
 
     @patch("src.api.v3.lambdas.get_all_lambdas.config")
     def test_get_all_lambdas_exception_returns_500(self, mock_config):
         mock_lambda = MagicMock()
         mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
-        mock_lambda.list_functions.side_effect = Exception("Test error")
+        mock_lambda.get_paginator.return_value.paginate.side_effect = Exception("Test error")
         
         with TestClient(app, raise_server_exceptions=False) as test_client:
             response = test_client.get("/lambda/get-all-lambdas")
         
         assert response.status_code == 500
         assert "Exception" in response.json()
+
+    @patch("src.api.v3.lambdas.get_all_lambdas.config")
+    def test_get_all_lambdas_follows_markers(self, mock_config):
+        mock_lambda = MagicMock()
+        mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
+        mock_lambda.get_paginator.return_value.paginate.return_value = [
+            {"Functions": [{"FunctionName": "lambda1"}], "NextMarker": "m1"},
+            {"Functions": [{"FunctionName": "lambda2"}]}
+        ]
+        
+        response = client.get("/lambda/get-all-lambdas")
+        
+        assert response.json() == {"lambdas": ["lambda1", "lambda2"]}
+
+    @patch("src.api.v3.lambdas.get_all_lambdas.config")
+    def test_get_all_lambdas_is_cached(self, mock_config):
+        mock_lambda = MagicMock()
+        mock_config.return_value = {"s3": MagicMock(), "lambda": mock_lambda}
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{"Functions": [{"FunctionName": "lambda1"}]}]
+        
+        client.get("/lambda/get-all-lambdas")
+        response = client.get("/lambda/get-all-lambdas")
+        
+        assert response.json() == {"lambdas": ["lambda1"]}
+        mock_lambda.get_paginator.return_value.paginate.assert_called_once()
@@ -1,24 +1,31 @@
 import pytest
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from src.main import app
 
 client = TestClient(app)
 
+def mock_s3_with_pages(pages_by_bucket: dict) -> MagicMock:
+    mock_s3 = MagicMock()
+    mock_s3.list_buckets.return_value = {"Buckets": [{"Name": name} for name in pages_by_bucket]}
+
+    def paginate(Bucket, Prefix=""):
+        pages = pages_by_bucket[Bucket]
+        if isinstance(pages, Exception):
+            raise pages
+        return pages
+
+    mock_s3.get_paginator.return_value.paginate.side_effect = paginate
+    return mock_s3
+
 class TestGetAllModels:
     @patch("src.api.v3.bucket.get_all_models.config")
     def test_get_all_models_success(self, mock_config):
-        mock_s3 = MagicMock()
-        mock_s3.list_buckets.return_value = {
-            "Buckets": [
-                {"Name": "bucket1"},
-                {"Name": "bucket2"}
-            ]
-        }
-        mock_s3.list_objects_v2.side_effect = [
-            {"Contents": [{"Key": "model1.joblib"}, {"Key": "model2.joblib"}]},
-            {"Contents": [{"Key": "model3.pkl"}]}
-        ]
+        mock_s3 = mock_s3_with_pages({
+            "bucket1": [{"Contents": [{"Key": "model1.joblib"}, {"Key": "model2.joblib"}]}],
+            "bucket2": [{"Contents": [{"Key": "model3.pkl"}]}]
+        })
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/get-all-models")
@@ -27,9 +34,12 @@ class TestGetAllModels:
         data = response.json()
         assert "models" in data
         assert len(data["models"]) == 3
-        assert {"bucket": "bucket1", "model": "model1.joblib"} in data["models"]
-        assert {"bucket": "bucket1", "model": "model2.joblib"} in data["models"]
-        assert {"bucket": "bucket2", "model": "model3.pkl"} in data["models"]
+        assert [(model["bucket"], model["model"]) for model in data["models"]] == [
+            ("bucket1", "model1.joblib"),
+            ("bucket1", "model2.joblib"),
+            ("bucket2", "model3.pkl")
+        ]
+        mock_s3.get_paginator.assert_called_with("list_objects_v2")
 
     @patch("src.api.v3.bucket.get_all_models.config")
     def test_get_all_models_empty_buckets(self, mock_config):
@@ -40,35 +50,25 @@ class TestGetAllModels:
         response = client.get("/bucket/get-all-models")
         
         assert response.status_code == 200
-        assert response.json() == {"models": []}
+        assert response.json()["models"] == []
+        assert response.json()["total"] == 0
 
     @patch("src.api.v3.bucket.get_all_models.config")
     def test_get_all_models_bucket_without_contents(self, mock_config):
-        mock_s3 = MagicMock()
-        mock_s3.list_buckets.return_value = {
-            "Buckets": [{"Name": "empty-bucket"}]
-        }
-        mock_s3.list_objects_v2.return_value = {}
+        mock_s3 = mock_s3_with_pages({"empty-bucket": [{}]})
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/get-all-models")
         
         assert response.status_code == 200
-        assert response.json() == {"models": []}
+        assert response.json()["models"] == []
 
     @patch("src.api.v3.bucket.get_all_models.config")
     def test_get_all_models_with_exception(self, mock_config):
-        mock_s3 = MagicMock()
-        mock_s3.list_buckets.return_value = {
-            "Buckets": [
-                {"Name": "bucket1"},
-                {"Name": "bucket2"}
-            ]
-        }
-        mock_s3.list_objects_v2.side_effect = [
-            Exception("Access denied"),
-            {"Contents": [{"Key": "model.joblib"}]}
-        ]
+        mock_s3 = mock_s3_with_pages({
+            "bucket1": Exception("Access denied"),
+            "bucket2": [{"Contents": [{"Key": "model.joblib"}]}]
+        })
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/get-all-models")
@@ -76,7 +76,9 @@ class TestGetAllModels:
         assert response.status_code == 200
         data = response.json()
         assert len(data["models"]) == 1
-        assert {"bucket": "bucket2", "model": "model.joblib"} in data["models"]
+        assert data["models"][0]["bucket"] == "bucket2"
+        assert data["models"][0]["model"] == "model.joblib"
+        assert data["errors"] == [{"bucket": "bucket1", "error": "Access denied"}]
 
     @patch("src.api.v3.bucket.get_all_models.config")
     def test_get_all_models_no_buckets_key(self, mock_config):
@@ -87,4 +89,59 @@ class TestGetAllModels:
         response = client.get("/bucket/get-all-models")
         
         assert response.status_code == 200
-        assert response.json() == {"models": []}
+        assert response.json()["models"] == []
+
+    @patch("src.api.v3.bucket.get_all_models.config")
+    def test_get_all_models_follows_every_page(self, mock_config):
+        pages = [{"Contents": [{"Key": f"model{page}-{i}.joblib"} for i in range(1000)]} for page in range(3)]
+        mock_s3 = mock_s3_with_pages({"bucket1": pages})
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/get-all-models")
+        
+        assert response.json()["total"] == 3000
+
+    @patch("src.api.v3.bucket.get_all_models.config")
+    def test_get_all_models_includes_object_metadata(self, mock_config):
+        modified = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        mock_s3 = mock_s3_with_pages({
+            "bucket1": [{"Contents": [{"Key": "model.joblib", "Size": 2048, "LastModified": modified, "ETag": '"abc123"'}]}]
+        })
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/get-all-models")
+        
+        assert response.json()["models"] == [{
+            "bucket": "bucket1",
+            "model": "model.joblib",
+            "size": 2048,
+            "last_modified": "2026-01-02T03:04:05+00:00",
+            "etag": "abc123"
+        }]
+
+    @patch("src.api.v3.bucket.get_all_models.config")
+    def test_get_all_models_filters_prefix_and_suffix(self, mock_config):
+        mock_s3 = mock_s3_with_pages({
+            "bucket1": [{"Contents": [{"Key": "models/a.joblib"}, {"Key": "models/a.json"}]}]
+        })
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/get-all-models?prefix=models/&suffix=.joblib")
+        
+        assert [model["model"] for model in response.json()["models"]] == ["models/a.joblib"]
+        mock_s3.get_paginator.return_value.paginate.assert_called_once_with(Bucket="bucket1", Prefix="models/")
+
+    @patch("src.api.v3.bucket.get_all_models.config")
+    def test_get_all_models_paginates_output(self, mock_config):
+        mock_s3 = mock_s3_with_pages({
+            "bucket1": [{"Contents": [{"Key": f"model{i}.joblib"} for i in range(5)]}]
+        })
+        mock_config.return_value = {"s3": mock_s3}
+        
+        first = client.get("/bucket/get-all-models?limit=2").json()
+        last = client.get("/bucket/get-all-models?offset=4&limit=2").json()
+        
+        assert [model["model"] for model in first["models"]] == ["model0.joblib", "model1.joblib"]
+        assert first["next_offset"] == 2
+        assert [model["model"] for model in last["models"]] == ["model4.joblib"]
+        assert last["next_offset"] is None
@@ -0,0 +1,24 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from src.main import app
+
+client = TestClient(app)
+
+class TestGetCacheStats:
+    @patch("src.api.v3.bucket.get_all_buckets.config")
+    def test_get_cache_stats_counts_hits_and_misses(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.list_buckets.return_value = {"Buckets": [{"Name": "bucket1"}]}
+        mock_config.return_value = {"s3": mock_s3, "lambda": MagicMock()}
+
+        client.get("/bucket/get-all-buckets")
+        client.get("/bucket/get-all-buckets")
+        response = client.get("/monitoring/cache")
+
+        assert response.status_code == 200
+        stats = response.json()["metadata"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+        mock_s3.list_buckets.assert_called_once()
@@ -3,6 +3,10 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from src.main import app
 import io
+import json
+import threading
+import pandas as pd
+from src.core.dataset.query import query_frame
 
 client = TestClient(app)
 
@@ -11,9 +15,7 @@ class TestGetDataset:
     def test_get_dataset_success(self, mock_config):
         mock_s3 = MagicMock()
         csv_data = "price,area,mainroad\n100000,1000,yes\n200000,2000,no"
-        mock_body = MagicMock()
-        mock_body.read.return_value = csv_data.encode('utf-8')
-        mock_s3.get_object.return_value = {"Body": mock_body}
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(csv_data.encode('utf-8'))}
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/dataset")
@@ -33,9 +35,7 @@ class TestGetDataset:
     def test_get_dataset_empty_csv(self, mock_config):
         mock_s3 = MagicMock()
         csv_data = "price,area,mainroad"
-        mock_body = MagicMock()
-        mock_body.read.return_value = csv_data.encode('utf-8')
-        mock_s3.get_object.return_value = {"Body": mock_body}
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(csv_data.encode('utf-8'))}
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/dataset")
@@ -49,9 +49,7 @@ class TestGetDataset:
     def test_get_dataset_calls_s3_correctly(self, mock_config):
         mock_s3 = MagicMock()
         csv_data = "col1\nval1"
-        mock_body = MagicMock()
-        mock_body.read.return_value = csv_data.encode('utf-8')
-        mock_s3.get_object.return_value = {"Body": mock_body}
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(csv_data.encode('utf-8'))}
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/dataset")
@@ -63,9 +61,7 @@ class TestGetDataset:
     def test_get_dataset_multiple_rows(self, mock_config):
         mock_s3 = MagicMock()
         csv_data = "name,age\nAlice,30\nBob,25\nCharlie,35"
-        mock_body = MagicMock()
-        mock_body.read.return_value = csv_data.encode('utf-8')
-        mock_s3.get_object.return_value = {"Body": mock_body}
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(csv_data.encode('utf-8'))}
         mock_config.return_value = {"s3": mock_s3}
         
         response = client.get("/bucket/dataset")
@@ -76,3 +72,228 @@ class TestGetDataset:
         assert data["values"][0]["name"] == "Alice"
         assert data["values"][1]["name"] == "Bob"
         assert data["values"][2]["name"] == "Charlie"
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_ndjson_streams_rows(self, mock_config):
+        mock_s3 = MagicMock()
+        csv_data = "name,age\nAlice,30\nBob,25\nCharlie,35"
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(csv_data.encode('utf-8'))}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?format=ndjson")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.text.splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"name": "Alice", "age": "30"},
+            {"name": "Bob", "age": "25"},
+            {"name": "Charlie", "age": "35"}
+        ]
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_ndjson_empty_csv(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price,area,mainroad")}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?format=ndjson")
+        
+        assert response.status_code == 200
+        assert response.text == ""
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_rejects_unknown_format(self, mock_config):
+        mock_config.return_value = {"s3": MagicMock()}
+        
+        response = client.get("/bucket/dataset?format=xml")
+        
+        assert response.status_code == 422
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_with_query(self, mock_config):
+        mock_s3 = MagicMock()
+        csv_data = "price,area,bedrooms,mainroad\n100,10,2,yes\n200,20,3,yes\n300,30,4,no\n400,40,5,yes"
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(csv_data.encode('utf-8'))}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?columns=price,area&filter=bedrooms>=3&filter=mainroad=yes&offset=1&limit=5")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["row_count"] == 1
+        assert data["values"] == [{"price": "400", "area": "40"}]
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_custom_bucket_and_key(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"col1\nval1")}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?bucket=other-bucket&key=raw/data.csv")
+        
+        assert response.status_code == 200
+        assert response.json()["dataset_name"] == "data.csv"
+        mock_s3.get_object.assert_called_once_with(Bucket="other-bucket", Key="raw/data.csv")
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_invalid_filter_returns_400(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?filter=bedrooms")
+        
+        assert response.status_code == 400
+        mock_s3.get_object.assert_not_called()
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_unknown_column_returns_400(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price\n100")}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?columns=area&format=ndjson")
+        
+        assert response.status_code == 400
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_columnar_json(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price,mainroad\n100,yes\n200,no")}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset?format=columnar")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["row_count"] == 2
+        assert data["columns"] == {"price": [100, 200], "mainroad": ["yes", "no"]}
+        assert "values" not in data
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_negotiates_arrow_from_accept_header(self, mock_config):
+        pa = pytest.importorskip("pyarrow")
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price,mainroad\n100,yes\n200,no")}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/bucket/dataset", headers={"Accept": "application/vnd.apache.arrow.stream"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.column("price").to_pylist() == [100, 200]
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_parquet_without_pyarrow_returns_406(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price\n100")}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        with patch.dict("src.api.v3.bucket.get_dataset.ENCODERS", {"parquet": MagicMock(side_effect=ImportError)}):
+            response = client.get("/bucket/dataset?format=parquet")
+        
+        assert response.status_code == 406
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_revalidation_returns_304(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price\n100"), "ETag": '"abc"'}
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        first = client.get("/bucket/dataset?limit=1")
+        second = client.get("/bucket/dataset?limit=1", headers={"If-None-Match": first.headers["etag"]})
+        
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert mock_s3.get_object.call_count == 1
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_etag_depends_on_query(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"price\n100"), "ETag": '"abc"'}
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        first = client.get("/bucket/dataset?limit=1")
+        second = client.get("/bucket/dataset?limit=2", headers={"If-None-Match": first.headers["etag"]})
+        
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_reuses_parsed_dataset(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"price,area\n100,10\n200,20"), "ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        first = client.get("/bucket/dataset?limit=1")
+        second = client.get("/bucket/dataset?offset=1&columns=area")
+        
+        assert first.json()["values"] == [{"price": "100", "area": "10"}]
+        assert second.json()["values"] == [{"area": "20"}]
+        assert mock_s3.get_object.call_count == 1
+        # one head of the csv per request, plus one parquet freshness check per csv version
+        assert mock_s3.head_object.call_count == 3
+
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_get_dataset_queries_cached_frame_off_the_event_loop(self, mock_config):
+        threads = []
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"price,area\n100,10\n200,20"), "ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+
+        def recording_query(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return query_frame(*args, **kwargs)
+
+        with patch("src.api.v3.bucket.get_dataset.query_frame", side_effect=recording_query):
+            response = client.get("/bucket/dataset?filter=area>10")
+
+        assert response.json()["values"] == [{"price": "200", "area": "20"}]
+        assert threads and all(name.startswith("storage-io") for name in threads)
+
+    @patch("src.api.v3.bucket.get_dataset.read_parquet_rows")
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_full_reads_use_the_dataset_cache_not_parquet(self, mock_config, mock_read_parquet_rows):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"price,area\n100,10\n200,20"), "ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+
+        first = client.get("/bucket/dataset")
+        second = client.get("/bucket/dataset")
+
+        assert first.json()["row_count"] == second.json()["row_count"] == 2
+        mock_read_parquet_rows.assert_not_called()
+        assert mock_s3.get_object.call_count == 1
+
+    @patch("src.api.v3.bucket.get_dataset.read_parquet_rows")
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_selective_reads_prefer_the_cached_frame_over_parquet(self, mock_config, mock_read_parquet_rows):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"price,area\n100,10\n200,20"), "ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        client.get("/bucket/dataset")
+
+        response = client.get("/bucket/dataset?columns=area&limit=1")
+
+        assert response.json()["values"] == [{"area": "10"}]
+        mock_read_parquet_rows.assert_not_called()
+
+    @patch("src.api.v3.bucket.get_dataset.read_parquet_rows")
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_selective_reads_use_parquet_when_nothing_is_cached(self, mock_config, mock_read_parquet_rows):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        mock_read_parquet_rows.return_value = pd.DataFrame({"area": ["10"]})
+
+        response = client.get("/bucket/dataset?columns=area&limit=1")
+
+        assert response.json()["values"] == [{"area": "10"}]
+        mock_s3.get_object.assert_not_called()
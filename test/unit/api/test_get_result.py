@@ -45,3 +45,45 @@ class TestGetResult:
         assert response.status_code == 200
         assert response.json() == {"content": "92.3%"}
         mock_s3.get_object.assert_called_once_with(Bucket="my-custom-bucket", Key="score.txt")
+
+    @patch("src.api.v3.result.get_result.config")
+    def test_get_result_file_sets_etag(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_body = MagicMock()
+        mock_body.read.return_value = b"85.5%"
+        mock_s3.get_object.return_value = {"Body": mock_body, "ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/result/local-ml-flow-data")
+        
+        assert response.headers["etag"] == '"abc"'
+        assert "cache-control" in response.headers
+        mock_s3.head_object.assert_not_called()
+
+    @patch("src.api.v3.result.get_result.config")
+    def test_get_result_file_not_modified(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"abc"'}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/result/local-ml-flow-data", headers={"If-None-Match": '"abc"'})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        mock_s3.head_object.assert_called_once_with(Bucket="local-ml-flow-data", Key="score.txt")
+        mock_s3.get_object.assert_not_called()
+
+    @patch("src.api.v3.result.get_result.config")
+    def test_get_result_file_modified_returns_body(self, mock_config):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"new"'}
+        mock_body = MagicMock()
+        mock_body.read.return_value = b"90%"
+        mock_s3.get_object.return_value = {"Body": mock_body, "ETag": '"new"'}
+        mock_config.return_value = {"s3": mock_s3}
+        
+        response = client.get("/result/local-ml-flow-data", headers={"If-None-Match": '"old"'})
+        
+        assert response.status_code == 200
+        assert response.json() == {"content": "90%"}
+        assert response.headers["etag"] == '"new"'
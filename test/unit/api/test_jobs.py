@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from src.core.jobs.queue import JobQueueFull
+from src.main import app
+
+client = TestClient(app)
+
+def job(**overrides) -> dict:
+    return {"id": "abc", "kind": "ingest", "params": {}, "priority": "normal", "status": "queued", **overrides}
+
+class TestJobs:
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_post_ingest_returns_202_with_location(self, mock_job_queue):
+        mock_job_queue.return_value.submit.return_value = (job(), True)
+
+        response = client.post("/jobs/ingest")
+
+        assert response.status_code == 202
+        assert response.headers["location"] == "/jobs/abc"
+        assert response.json()["deduplicated"] is False
+        mock_job_queue.return_value.submit.assert_called_once_with("ingest", {}, priority="normal")
+
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_post_inference_passes_priority(self, mock_job_queue):
+        mock_job_queue.return_value.submit.return_value = (job(kind="inference", priority="high"), True)
+
+        response = client.post("/jobs/inference?priority=high")
+
+        assert response.status_code == 202
+        mock_job_queue.return_value.submit.assert_called_once_with("inference", {}, priority="high")
+
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_post_ingest_passes_force(self, mock_job_queue):
+        mock_job_queue.return_value.submit.return_value = (job(params={"force": True}), True)
+
+        response = client.post("/jobs/ingest?force=true")
+
+        assert response.status_code == 202
+        mock_job_queue.return_value.submit.assert_called_once_with("ingest", {"force": True}, priority="normal")
+
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_duplicate_job_is_flagged(self, mock_job_queue):
+        mock_job_queue.return_value.submit.return_value = (job(), False)
+
+        response = client.post("/jobs/ingest")
+
+        assert response.json()["deduplicated"] is True
+
+    def test_invalid_priority_returns_422(self):
+        response = client.post("/jobs/ingest?priority=urgent")
+
+        assert response.status_code == 422
+
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_full_queue_returns_429(self, mock_job_queue):
+        mock_job_queue.return_value.submit.side_effect = JobQueueFull("100 jobs already pending")
+
+        response = client.post("/jobs/ingest")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "5"
+
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_get_job_returns_status(self, mock_job_queue):
+        mock_job_queue.return_value.get.return_value = job(status="succeeded")
+
+        response = client.get("/jobs/abc")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "succeeded"
+
+    @patch("src.api.v3.jobs.pipeline_jobs.job_queue")
+    def test_get_unknown_job_returns_404(self, mock_job_queue):
+        mock_job_queue.return_value.get.return_value = None
+
+        response = client.get("/jobs/missing")
+
+        assert response.status_code == 404
+
+    @patch("src.core.jobs.queue.RUNNERS", {"ingest": MagicMock(), "inference": MagicMock()})
+    def test_submitted_job_can_be_polled(self):
+        response = client.post("/jobs/ingest")
+        job_id = response.json()["id"]
+
+        for _ in range(500):
+            status = client.get(f"/jobs/{job_id}").json()["status"]
+            if status == "succeeded":
+                break
+
+        assert status == "succeeded"
+        assert client.get("/jobs").json()["stats"]["succeeded"] == 1
@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from src.main import app
+
+client = TestClient(app)
+
+class TestModelRegistry:
+    @patch("src.api.v3.model.registry.load_manifest")
+    @patch("src.api.v3.model.registry.config")
+    def test_get_model_versions_returns_manifest(self, mock_config, mock_load_manifest):
+        mock_config.return_value = {"s3": MagicMock()}
+        mock_load_manifest.return_value = {"versions": {"v1": {}}, "aliases": {"latest": "v1"}}
+
+        response = client.get("/model/versions")
+
+        assert response.status_code == 200
+        assert response.json()["aliases"] == {"latest": "v1"}
+
+    @patch("src.api.v3.model.registry.set_alias")
+    def test_put_alias_returns_aliases(self, mock_set_alias):
+        mock_set_alias.return_value = {"versions": {"v1": {}}, "aliases": {"latest": "v1", "champion": "v1"}}
+
+        response = client.put("/model/aliases/champion?version=v1")
+
+        assert response.status_code == 200
+        assert response.json()["aliases"]["champion"] == "v1"
+        mock_set_alias.assert_called_once_with("champion", "v1")
+
+    @patch("src.api.v3.model.registry.set_alias")
+    def test_put_alias_unknown_version_returns_404(self, mock_set_alias):
+        mock_set_alias.side_effect = KeyError("unknown model version 'v9'")
+
+        response = client.put("/model/aliases/champion?version=v9")
+
+        assert response.status_code == 404
@@ -0,0 +1,133 @@
+import pytest
+import io
+import json
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from botocore.exceptions import ClientError
+from src.core.model.train_test_split import FEATURE_COLUMNS
+from src.main import app
+
+client = TestClient(app)
+
+def dump(artifact) -> bytes:
+    buffer = io.BytesIO()
+    joblib.dump(artifact, buffer)
+    return buffer.getvalue()
+
+def mock_s3_with(objects: dict) -> MagicMock:
+    def head_object(Bucket, Key):
+        if Key not in objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ETag": f'"{Key}-v1"'}
+
+    mock_s3 = MagicMock()
+    mock_s3.head_object.side_effect = head_object
+    mock_s3.get_object.side_effect = lambda Bucket, Key: {"Body": io.BytesIO(objects[Key]), "ETag": f'"{Key}-v1"'}
+    return mock_s3
+
+class TestPredict:
+    @pytest.fixture
+    def mock_s3(self):
+        np.random.seed(42)
+        x = pd.DataFrame(np.random.randint(0, 2, size=(50, 6)), columns=FEATURE_COLUMNS)
+        y = x.to_numpy() @ np.arange(1, 7) * 1000 + 5000
+        scaler = StandardScaler().fit(x)
+        model = LinearRegression().fit(scaler.transform(x), y)
+        artifacts = {"model.joblib": dump(model), "scaler.joblib": dump(scaler)}
+
+        return mock_s3_with(artifacts)
+
+    @pytest.fixture
+    def artifacts(self):
+        np.random.seed(42)
+        x = pd.DataFrame(np.random.randint(0, 2, size=(50, 6)), columns=FEATURE_COLUMNS)
+        scaler = StandardScaler().fit(x)
+        return {
+            "v1": LinearRegression().fit(scaler.transform(x), x.to_numpy() @ np.arange(1, 7) * 1000),
+            "v2": LinearRegression().fit(scaler.transform(x), x.to_numpy() @ np.arange(1, 7) * 2000),
+            "scaler": scaler
+        }
+
+    def rows(self, count):
+        return [dict(zip(FEATURE_COLUMNS, ["yes", "no", "yes", "no", "yes", "no"]), area=1000) for _ in range(count)]
+
+    @patch("src.core.model.serving.config")
+    def test_predict_returns_one_prediction_per_row(self, mock_config, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+
+        response = client.post("/model/predict", json={"rows": self.rows(3)})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert data["etag"] == '"model.joblib-v1"'
+        assert data["version"] is None
+        assert data["predictions"][0] == pytest.approx(14000)
+
+    @patch("src.core.model.serving.config")
+    def test_predict_keeps_model_warm(self, mock_config, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+
+        client.post("/model/predict", json={"rows": self.rows(1)})
+        client.post("/model/predict", json={"rows": self.rows(1000)})
+
+        assert mock_s3.get_object.call_count == 2
+
+    @patch("src.core.model.serving.config")
+    def test_predict_missing_features_returns_400(self, mock_config, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+
+        response = client.post("/model/predict", json={"rows": [{"mainroad": "yes"}]})
+
+        assert response.status_code == 400
+
+    @patch("src.core.model.serving.config")
+    def test_predict_empty_rows_returns_400(self, mock_config, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+
+        response = client.post("/model/predict", json={"rows": []})
+
+        assert response.status_code == 400
+
+    @patch("src.core.model.serving.config")
+    def test_predict_serves_registry_versions(self, mock_config, artifacts):
+        manifest = {
+            "versions": {
+                version: {"artifacts": {"model": f"registry/{version}/model.joblib", "scaler": "registry/scaler.joblib"}}
+                for version in ("v1", "v2")
+            },
+            "aliases": {"latest": "v2", "champion": "v1"}
+        }
+        objects = {
+            "registry/manifest.json": json.dumps(manifest).encode(),
+            "registry/v1/model.joblib": dump(artifacts["v1"]),
+            "registry/v2/model.joblib": dump(artifacts["v2"]),
+            "registry/scaler.joblib": dump(artifacts["scaler"])
+        }
+        mock_s3 = mock_s3_with(objects)
+        mock_config.return_value = {"s3": mock_s3}
+        rows = self.rows(1)
+
+        latest = client.post("/model/predict", json={"rows": rows}).json()
+        champion = client.post("/model/predict?model=champion", json={"rows": rows}).json()
+        again = client.post("/model/predict?model=v2", json={"rows": rows}).json()
+
+        assert latest["version"] == "v2"
+        assert latest["predictions"][0] == pytest.approx(18000)
+        assert champion["version"] == "v1"
+        assert champion["predictions"][0] == pytest.approx(9000)
+        assert again["predictions"] == latest["predictions"]
+        assert mock_s3.get_object.call_count == 4
+
+    @patch("src.core.model.serving.config")
+    def test_predict_unknown_version_returns_404(self, mock_config, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+
+        response = client.post("/model/predict?model=unknown", json={"rows": self.rows(1)})
+
+        assert response.status_code == 404
@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import patch
+from src.config.cache import TTLCache, metadata_cache, invalidate_bucket
+
+class TestTTLCache:
+    def test_lookup_miss_then_hit(self):
+        cache = TTLCache(ttl=60, maxsize=10)
+
+        assert cache.lookup("key") == (False, None)
+        cache.set("key", ["value"])
+        assert cache.lookup("key") == (True, ["value"])
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @patch("src.config.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, mock_monotonic):
+        cache = TTLCache(ttl=10, maxsize=10)
+        mock_monotonic.return_value = 100
+        cache.set("key", "value")
+
+        mock_monotonic.return_value = 111
+
+        assert cache.lookup("key") == (False, None)
+        assert cache.stats()["size"] == 0
+
+    def test_size_bound_evicts_least_recently_used(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.lookup("a")
+
+        cache.set("c", 3)
+
+        assert cache.lookup("b") == (False, None)
+        assert cache.lookup("a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_removes_matching_prefix(self):
+        cache = TTLCache(ttl=60, maxsize=10)
+        cache.set(("models", "bucket1", ""), [1])
+        cache.set(("models", "bucket1", "prefix/"), [2])
+        cache.set(("models", "bucket2", ""), [3])
+
+        removed = cache.invalidate(("models", "bucket1"))
+
+        assert removed == 2
+        assert cache.lookup(("models", "bucket2", "")) == (True, [3])
+
+    def test_clear_resets_counters(self):
+        cache = TTLCache(ttl=60, maxsize=10)
+        cache.set("key", "value")
+        cache.lookup("key")
+
+        cache.clear()
+
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["hits"] == 0
+
+    def test_stats_hit_ratio(self):
+        cache = TTLCache(ttl=60, maxsize=10)
+        cache.set("key", "value")
+        cache.lookup("key")
+        cache.lookup("other")
+
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_metadata_cache_is_shared(self):
+        assert metadata_cache() is metadata_cache()
+
+    def test_invalidate_bucket_drops_model_listings(self):
+        metadata_cache().set(("models", "local-ml-flow-models", "", None), ["model.joblib"])
+        metadata_cache().set(("buckets",), ["local-ml-flow-models"])
+
+        invalidate_bucket("local-ml-flow-models")
+
+        assert metadata_cache().lookup(("models", "local-ml-flow-models", "", None)) == (False, None)
+        assert metadata_cache().lookup(("buckets",))[0] is True
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from src.config.client import config
+from concurrent.futures import ThreadPoolExecutor
+from src.config.client import config, get_client, reset_clients, client_config
 
 class TestConfig:
     @patch("src.config.client.get_logger")
@@ -153,4 +154,69 @@ class TestConfig:
         
         config()
         
-        mock_get_logger.assert_called_once_with("client-configuration")
\ No newline at end of file
+        mock_get_logger.assert_called_once_with("client-configuration")
+
+class TestClientRegistry:
+    @patch("src.config.client.get_logger")
+    @patch("src.config.client.load_dotenv")
+    @patch("src.config.client.boto3.client")
+    def test_config_reuses_clients_across_calls(self, mock_boto_client, mock_load_dotenv, mock_get_logger):
+        mock_boto_client.side_effect = lambda service, **kwargs: MagicMock(name=service)
+
+        first = config()
+        second = config()
+
+        assert first["s3"] is second["s3"]
+        assert first["lambda"] is second["lambda"]
+        assert mock_boto_client.call_count == 2
+        mock_load_dotenv.assert_called_once()
+
+    @patch("src.config.client.get_logger")
+    @patch("src.config.client.load_dotenv")
+    @patch("src.config.client.boto3.client")
+    def test_get_client_is_lazy_per_service(self, mock_boto_client, mock_load_dotenv, mock_get_logger):
+        mock_boto_client.return_value = MagicMock()
+
+        get_client("s3")
+
+        services = [call[0][0] for call in mock_boto_client.call_args_list]
+        assert services == ["s3"]
+
+    @patch("src.config.client.get_logger")
+    @patch("src.config.client.load_dotenv")
+    @patch("src.config.client.boto3.client")
+    def test_reset_clients_forces_new_clients(self, mock_boto_client, mock_load_dotenv, mock_get_logger):
+        mock_boto_client.side_effect = lambda service, **kwargs: MagicMock(name=service)
+
+        first = get_client("s3")
+        reset_clients()
+        second = get_client("s3")
+
+        assert first is not second
+        assert mock_load_dotenv.call_count == 2
+
+    @patch("src.config.client.get_logger")
+    @patch("src.config.client.load_dotenv")
+    @patch("src.config.client.boto3.client")
+    def test_get_client_is_thread_safe(self, mock_boto_client, mock_load_dotenv, mock_get_logger):
+        mock_boto_client.side_effect = lambda service, **kwargs: MagicMock(name=service)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: get_client("s3"), range(32)))
+
+        assert all(client is clients[0] for client in clients)
+        assert mock_boto_client.call_count == 1
+
+    @patch.dict("src.config.client.os.environ", {"max_pool_connections": "128", "read_timeout": "12"})
+    def test_client_config_reads_pool_settings(self):
+        result = client_config()
+
+        assert result.max_pool_connections == 128
+        assert result.read_timeout == 12.0
+        assert result.tcp_keepalive is True
+
+    @patch.dict("src.config.client.os.environ", {"max_pool_connections": "not-a-number"})
+    def test_client_config_falls_back_on_invalid_values(self):
+        result = client_config()
+
+        assert result.max_pool_connections == 50
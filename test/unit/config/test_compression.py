@@ -0,0 +1,169 @@
+import pytest
+import gzip
+import json
+import numpy as np
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from src.config.compression import CompressionMiddleware, FastJSONResponse, choose_encoding, encoded_etag, strip_encoded_etags
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+routes = []
+
+@app.middleware("http")
+async def record_route(request: Request, call_next):
+    # registered last so it wraps the compression middleware, like the metrics middleware in the app
+    response = await call_next(request)
+    routes.append(getattr(request.scope.get("route"), "path", "unmatched"))
+    return response
+
+@app.get("/large")
+async def large():
+    return FastJSONResponse({"values": [{"price": str(i), "mainroad": "yes"} for i in range(500)]})
+
+@app.get("/tagged")
+async def tagged(request: Request):
+    if request.headers.get("if-none-match") == '"v1"':
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+    return FastJSONResponse({"values": list(range(500))}, headers={"ETag": '"v1"'})
+
+@app.get("/parquet")
+async def parquet():
+    return Response(content=b"PAR1" + b"0" * 1000, media_type="application/vnd.apache.parquet")
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        for i in range(50):
+            yield f"line {i}\n".encode()
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+client = TestClient(app)
+
+class TestChooseEncoding:
+    def test_prefers_zstd_when_available(self):
+        pytest.importorskip("zstandard")
+
+        assert choose_encoding("gzip, deflate, br, zstd") == "zstd"
+
+    def test_respects_quality_values(self):
+        assert choose_encoding("zstd;q=0.1, gzip;q=0.9") == "gzip"
+
+    def test_identity_when_nothing_supported(self):
+        assert choose_encoding("br") == "identity"
+        assert choose_encoding(None) == "identity"
+        assert choose_encoding("gzip;q=0") == "identity"
+
+    def test_wildcard_accepts_any(self):
+        assert choose_encoding("*") in ("zstd", "gzip")
+
+    @patch("src.config.compression.zstandard", None)
+    def test_falls_back_to_gzip_without_zstandard(self):
+        assert choose_encoding("zstd, gzip") == "gzip"
+
+
+class TestCompressionMiddleware:
+    def test_gzip_large_response(self):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()["values"]) == 500
+
+    def test_zstd_large_response(self):
+        zstandard = pytest.importorskip("zstandard")
+
+        with client.stream("GET", "/large", headers={"Accept-Encoding": "zstd"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "zstd"
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+        assert len(json.loads(body)["values"]) == 500
+
+    def test_small_response_not_compressed(self):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip, zstd"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_gzip_streamed_response(self):
+        with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw).decode().splitlines() == [f"line {i}" for i in range(50)]
+
+    def test_zstd_streamed_response(self):
+        zstandard = pytest.importorskip("zstandard")
+
+        with client.stream("GET", "/stream", headers={"Accept-Encoding": "zstd"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "zstd"
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(raw).decode().count("\n") == 50
+
+    def test_identity_when_not_accepted(self):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+
+
+class TestEncodedETags:
+    def test_suffix_keeps_strength(self):
+        assert encoded_etag('"v1"', "gzip") == '"v1-gzip"'
+        assert encoded_etag('W/"v1"', "zstd") == 'W/"v1-zstd"'
+
+    def test_strip_only_the_chosen_encoding(self):
+        assert strip_encoded_etags('"v1-gzip", "v2-zstd"', "gzip") == ('"v1", "v2-zstd"', True)
+        assert strip_encoded_etags('"v1"', "gzip") == ('"v1"', False)
+
+    def test_compressed_body_gets_its_own_etag(self):
+        identity = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+        gzipped = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+        assert identity.headers["etag"] == '"v1"'
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.headers["etag"] == '"v1-gzip"'
+
+    def test_revalidation_with_encoded_etag_returns_304(self):
+        response = client.get("/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"v1-gzip"'
+
+    def test_conditional_request_keeps_the_route_for_outer_middleware(self):
+        routes.clear()
+
+        client.get("/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+
+        assert routes == ["/tagged"]
+
+    def test_identity_etag_does_not_validate_a_compressed_body(self):
+        response = client.get("/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-zstd"'})
+
+        assert response.status_code == 200
+
+    def test_precompressed_media_types_are_not_compressed(self):
+        response = client.get("/parquet", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content.startswith(b"PAR1")
+
+class TestFastJSONResponse:
+    def test_renders_numpy_and_nan(self):
+        response = FastJSONResponse({"values": np.array([1, 2]), "missing": float("nan")})
+
+        assert json.loads(response.body) == {"values": [1, 2], "missing": None}
+
+    @patch("src.config.compression.orjson", None)
+    def test_falls_back_to_standard_json(self):
+        response = FastJSONResponse({"values": [1, 2]})
+
+        assert json.loads(response.body) == {"values": [1, 2]}
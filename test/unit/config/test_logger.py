@@ -1,8 +1,11 @@
 import pytest
+import io
+import json
 import logging
 import sys
+from logging.handlers import QueueHandler
 from unittest.mock import patch, MagicMock
-from src.config.logger import get_logger
+from src.config.logger import _queue, get_logger, flush_logs, listener, lazy, log_level, output_handler, JsonFormatter
 
 class TestGetLogger:
     def test_get_logger_returns_logger_instance(self):
@@ -28,23 +31,23 @@ class TestGetLogger:
         
         assert len(logger.handlers) >= 1
 
-    def test_get_logger_adds_stream_handler(self):
-        logger_name = "stream_handler_logger"
+    def test_get_logger_adds_queue_handler(self):
+        logger_name = "queue_handler_logger"
         logging.getLogger(logger_name).handlers.clear()
         
         logger = get_logger(logger_name)
         
-        stream_handlers = [h for h in logger.handlers if isinstance(h, logging.StreamHandler)]
-        assert len(stream_handlers) >= 1
+        assert isinstance(logger.handlers[0], QueueHandler)
 
-    def test_get_logger_handler_uses_stdout(self):
-        logger_name = "stdout_logger"
-        logging.getLogger(logger_name).handlers.clear()
-        
-        logger = get_logger(logger_name)
-        
-        stream_handlers = [h for h in logger.handlers if isinstance(h, logging.StreamHandler)]
-        assert any(h.stream == sys.stdout for h in stream_handlers)
+    def test_listener_writes_to_stdout(self):
+        flush_logs()
+
+        with patch("src.config.logger.sys.stdout") as mock_stdout:
+            handlers = listener().handlers
+        flush_logs()
+
+        assert isinstance(handlers[0], logging.StreamHandler)
+        assert handlers[0].stream is mock_stdout
 
     def test_get_logger_does_not_add_duplicate_handlers(self):
         logger_name = "duplicate_handler_logger"
@@ -71,12 +74,8 @@ class TestGetLogger:
         assert logger1.name != logger2.name
 
     def test_get_logger_formatter_format(self):
-        logger_name = "formatter_test_logger"
-        logging.getLogger(logger_name).handlers.clear()
-        
-        logger = get_logger(logger_name)
+        handler = output_handler()
         
-        handler = logger.handlers[0]
         expected_format = '[%(asctime)s][%(levelname)s]: %(name)s - %(message)s'
         assert handler.formatter._fmt == expected_format
 
@@ -104,4 +103,86 @@ class TestGetLogger:
         logger = get_logger("")
         
         assert isinstance(logger, logging.Logger)
-        assert logger.name == "root"
\ No newline at end of file
+        assert logger.name == "root"
+
+
+class TestLoggingConfiguration:
+    @patch.dict("os.environ", {"log_level": "warning"})
+    def test_level_comes_from_env(self):
+        assert log_level("any_logger") == logging.WARNING
+
+    @patch.dict("os.environ", {"log_level": "WARNING", "log_levels": "clean_dataframe=DEBUG, job-queue=ERROR"})
+    def test_per_logger_levels_override_default(self):
+        assert log_level("clean_dataframe") == logging.DEBUG
+        assert log_level("job-queue") == logging.ERROR
+        assert log_level("other") == logging.WARNING
+
+    @patch.dict("os.environ", {"log_level": "LOUD"})
+    def test_unknown_level_falls_back_to_info(self):
+        assert log_level("any_logger") == logging.INFO
+
+    @patch.dict("os.environ", {"log_format": "json"})
+    def test_json_output(self):
+        handler = output_handler()
+        record = logging.LogRecord("json_logger", logging.INFO, __file__, 1, "rows: %s", (3,), None)
+
+        entry = json.loads(handler.formatter.format(record))
+
+        assert isinstance(handler.formatter, JsonFormatter)
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "json_logger"
+        assert entry["message"] == "rows: 3"
+
+    def test_json_output_includes_exception(self):
+        try:
+            raise ValueError("bad row")
+        except ValueError:
+            record = logging.LogRecord("json_logger", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "ValueError: bad row" in entry["exception"]
+
+    def test_records_reach_stdout_after_flush(self):
+        flush_logs()
+        stream = io.StringIO()
+        logger_name = "flushed_logger"
+        logging.getLogger(logger_name).handlers.clear()
+
+        with patch("src.config.logger.sys.stdout", stream):
+            get_logger(logger_name).info("queued message")
+            flush_logs()
+
+        assert "flushed_logger - queued message" in stream.getvalue()
+
+    def test_existing_logger_still_reaches_stdout_after_flush(self):
+        stream = io.StringIO()
+
+        with patch("src.config.logger.sys.stdout", stream):
+            flush_logs()
+            logger = get_logger("warm_invocation_logger")
+            logger.info("first invocation")
+            flush_logs()
+            get_logger("warm_invocation_logger").info("second invocation")
+            flush_logs()
+
+        assert "warm_invocation_logger - first invocation" in stream.getvalue()
+        assert "warm_invocation_logger - second invocation" in stream.getvalue()
+        assert _queue.qsize() == 0
+
+    def test_lazy_payload_is_skipped_below_level(self):
+        expensive = MagicMock(return_value="summary")
+        logger_name = "lazy_logger"
+        logging.getLogger(logger_name).handlers.clear()
+        logger = get_logger(logger_name)
+
+        logger.debug("payload: %s", lazy(expensive))
+
+        expensive.assert_not_called()
+
+    def test_lazy_payload_is_rendered_when_enabled(self):
+        expensive = MagicMock(return_value="summary")
+        record = logging.LogRecord("lazy_logger", logging.DEBUG, __file__, 1, "payload: %s", (lazy(expensive),), None)
+
+        assert record.getMessage() == "payload: summary"
+        expensive.assert_called_once()
@@ -0,0 +1,120 @@
+import boto3
+import pytest
+from botocore.config import Config
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.stub import Stubber
+from fastapi.testclient import TestClient
+from src.config.client import get_client
+from src.config.metrics import (
+    Counter, Histogram, AWS_CALLS, AWS_LATENCY, HTTP_LATENCY, HTTP_REQUESTS, HTTP_RESPONSE_BYTES,
+    instrument_client, render
+)
+from src.main import app
+
+client = TestClient(app)
+
+@pytest.fixture
+def s3():
+    s3_client = boto3.client(
+        "s3", region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test",
+        config=Config(retries={"max_attempts": 1, "mode": "standard"})
+    )
+    instrument_client(s3_client)
+    return s3_client
+
+class TestMetricTypes:
+    def test_counter_labels_are_separate(self):
+        counter = Counter("test_total", "test", ("route",))
+        counter.inc("/a")
+        counter.inc("/a")
+        counter.inc("/b", amount=5)
+
+        assert counter.value("/a") == 2
+        assert counter.samples() == ['test_total{route="/a"} 2', 'test_total{route="/b"} 5']
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("test_seconds", "test", ("route",), buckets=(0.1, 1))
+        histogram.observe("/a", value=0.05)
+        histogram.observe("/a", value=0.5)
+        histogram.observe("/a", value=3)
+
+        assert histogram.samples() == [
+            'test_seconds_bucket{route="/a",le="0.1"} 1',
+            'test_seconds_bucket{route="/a",le="1"} 2',
+            'test_seconds_bucket{route="/a",le="+Inf"} 3',
+            'test_seconds_count{route="/a"} 3',
+            'test_seconds_sum{route="/a"} 3.55'
+        ]
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("test_total", "test", ("key",))
+        counter.inc('a"b')
+
+        assert counter.samples() == ['test_total{key="a\\"b"} 1']
+
+class TestClientInstrumentation:
+    def test_successful_call_is_timed(self, s3):
+        with Stubber(s3) as stubber:
+            stubber.add_response("list_buckets", {"Buckets": []})
+            s3.list_buckets()
+
+        assert AWS_CALLS.value("s3", "ListBuckets", "success") == 1
+        assert AWS_LATENCY.value("s3", "ListBuckets")["count"] == 1
+
+    def test_error_response_is_counted(self, s3):
+        with Stubber(s3) as stubber:
+            stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+            with pytest.raises(ClientError):
+                s3.head_object(Bucket="bucket", Key="missing")
+
+        assert AWS_CALLS.value("s3", "HeadObject", "error") == 1
+
+    def test_connection_failure_is_counted(self, s3):
+        s3.meta.events.register(
+            "before-send.s3.GetObject",
+            MagicMock(side_effect=EndpointConnectionError(endpoint_url="http://localhost:4566"))
+        )
+
+        with pytest.raises(EndpointConnectionError):
+            s3.get_object(Bucket="bucket", Key="key")
+
+        assert AWS_CALLS.value("s3", "GetObject", "exception") == 1
+
+    @patch("src.config.client.instrument_client")
+    @patch("src.config.client.load_dotenv")
+    @patch("src.config.client.boto3.client")
+    def test_clients_are_instrumented_on_creation(self, mock_boto_client, mock_load_dotenv, mock_instrument_client):
+        s3_client = get_client("s3", MagicMock())
+
+        mock_instrument_client.assert_called_once_with(s3_client)
+
+class TestMetricsEndpoint:
+    def test_requests_are_recorded_per_route_template(self):
+        client.get("/jobs/one")
+        client.get("/jobs/two")
+
+        assert HTTP_REQUESTS.value("GET", "/jobs/{job_id}", "404") == 2
+        assert HTTP_LATENCY.value("GET", "/jobs/{job_id}")["count"] == 2
+        assert HTTP_RESPONSE_BYTES.value("GET", "/jobs/{job_id}") > 0
+
+    def test_unknown_paths_share_one_label(self):
+        client.get("/does/not/exist")
+
+        assert HTTP_REQUESTS.value("GET", "unmatched", "404") == 1
+
+    def test_metrics_endpoint_exposes_text_format(self):
+        client.get("/")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert '# TYPE http_request_duration_seconds histogram' in response.text
+        assert 'http_requests_total{method="GET",route="/",status="200"} 1' in response.text
+
+    def test_render_lists_every_metric(self):
+        text = render()
+
+        for name in ("http_requests_total", "http_response_bytes_total", "aws_client_calls_total", "aws_client_call_duration_seconds"):
+            assert f"# TYPE {name}" in text
@@ -0,0 +1,67 @@
+import pytest
+import asyncio
+import threading
+from unittest.mock import patch, MagicMock
+from src.config.storage import run_io, read_body, get_executor, shutdown_executor
+
+class TestStorage:
+    @pytest.fixture(autouse=True)
+    def fresh_executor(self):
+        shutdown_executor()
+        yield
+        shutdown_executor()
+
+    def test_run_io_returns_result(self):
+        func = MagicMock(return_value={"Buckets": []})
+
+        result = asyncio.run(run_io(func, Bucket="bucket"))
+
+        assert result == {"Buckets": []}
+        func.assert_called_once_with(Bucket="bucket")
+
+    def test_run_io_runs_off_the_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+
+        worker_thread = asyncio.run(run_io(threading.get_ident))
+
+        assert worker_thread != loop_thread
+
+    def test_run_io_propagates_exceptions(self):
+        func = MagicMock(side_effect=Exception("S3 error"))
+
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(run_io(func))
+
+        assert "S3 error" in str(exc_info.value)
+
+    def test_run_io_runs_calls_concurrently(self):
+        barrier = threading.Barrier(4, timeout=5)
+
+        async def gather():
+            return await asyncio.gather(*[run_io(barrier.wait) for _ in range(4)])
+
+        results = asyncio.run(gather())
+
+        assert sorted(results) == [0, 1, 2, 3]
+
+    def test_read_body_reads_streaming_body(self):
+        body = MagicMock()
+        body.read.return_value = b"85.5%"
+
+        result = asyncio.run(read_body({"Body": body}))
+
+        assert result == b"85.5%"
+
+    @patch.dict("os.environ", {"io_max_workers": "3"})
+    def test_get_executor_is_bounded_by_env(self):
+        executor = get_executor()
+
+        assert executor._max_workers == 3
+        assert get_executor() is executor
+
+    def test_shutdown_executor_resets_pool(self):
+        executor = get_executor()
+
+        shutdown_executor()
+
+        assert get_executor() is not executor
@@ -0,0 +1,102 @@
+import pytest
+import io
+import pandas as pd
+from unittest.mock import patch, MagicMock
+from src.core.dataset.cache import DatasetCache, dataset_cache, load_dataset
+
+class TestDatasetCache:
+    @pytest.fixture
+    def frame(self):
+        return pd.DataFrame({"price": list(range(100))})
+
+    def frame_size(self, frame):
+        return int(frame.memory_usage(deep=True).sum())
+
+    def test_get_miss_then_hit(self, frame):
+        cache = DatasetCache(max_bytes=10 ** 6)
+
+        assert cache.get("key") is None
+        cache.put("key", frame)
+
+        assert cache.get("key") is frame
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_put_evicts_least_recently_used_over_budget(self, frame):
+        cache = DatasetCache(max_bytes=self.frame_size(frame) * 2)
+        cache.put("a", frame)
+        cache.put("b", frame.copy())
+        cache.get("a")
+
+        cache.put("c", frame.copy())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is frame
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+    def test_put_skips_frames_larger_than_budget(self, frame):
+        cache = DatasetCache(max_bytes=10)
+
+        cache.put("key", frame)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_zero_budget_disables_cache(self):
+        assert not DatasetCache(max_bytes=0).enabled
+
+    def test_dataset_cache_is_shared(self):
+        assert dataset_cache() is dataset_cache()
+
+
+class TestLoadDataset:
+    @pytest.fixture
+    def mock_s3(self):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"v1"'}
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"price\n100\n200"), "ETag": '"v1"'}
+        return mock_s3
+
+    def test_load_dataset_parses_on_miss(self, mock_s3):
+        frame, metadata = load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+
+        assert frame["price"].tolist() == [100, 200]
+        assert metadata["ETag"] == '"v1"'
+        mock_s3.get_object.assert_called_once_with(Bucket="bucket", Key="housing.csv")
+
+    def test_load_dataset_revalidates_with_head_only(self, mock_s3):
+        first, _ = load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+        second, _ = load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+
+        assert second is first
+        assert mock_s3.head_object.call_count == 2
+        assert mock_s3.get_object.call_count == 1
+
+    def test_load_dataset_reloads_when_etag_changes(self, mock_s3):
+        load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+        mock_s3.head_object.return_value = {"ETag": '"v2"'}
+
+        load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+
+        assert mock_s3.get_object.call_count == 2
+
+    def test_load_dataset_variants_are_cached_separately(self, mock_s3):
+        typed, _ = load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+        raw, _ = load_dataset(mock_s3, "bucket", "housing.csv", lambda body: pd.read_csv(body, dtype=str), "raw")
+
+        assert typed["price"].tolist() == [100, 200]
+        assert raw["price"].tolist() == ["100", "200"]
+
+    def test_load_dataset_uses_provided_head(self, mock_s3):
+        load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed", head={"ETag": '"v1"'})
+
+        mock_s3.head_object.assert_not_called()
+
+    @patch("src.core.dataset.cache.dataset_cache")
+    def test_load_dataset_without_cache_skips_head(self, mock_dataset_cache, mock_s3):
+        mock_dataset_cache.return_value = DatasetCache(max_bytes=0)
+
+        load_dataset(mock_s3, "bucket", "housing.csv", pd.read_csv, "typed")
+
+        mock_s3.head_object.assert_not_called()
+        mock_s3.get_object.assert_called_once()
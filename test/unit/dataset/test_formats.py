@@ -0,0 +1,60 @@
+import pytest
+import io
+import pandas as pd
+from src.core.dataset.formats import negotiate, infer_types, to_columnar, to_arrow, to_parquet
+
+class TestFormats:
+    @pytest.fixture
+    def raw_dataframe(self):
+        return pd.DataFrame({
+            "price": ["100000", "200000"],
+            "area": ["1000.5", ""],
+            "mainroad": ["yes", "no"]
+        })
+
+    def test_negotiate_defaults_to_json(self):
+        assert negotiate(None) == "json"
+        assert negotiate("*/*") == "json"
+        assert negotiate("text/html") == "json"
+
+    def test_negotiate_picks_known_media_type(self):
+        assert negotiate("application/vnd.apache.arrow.stream") == "arrow"
+        assert negotiate("application/x-parquet") == "parquet"
+
+    def test_negotiate_respects_quality(self):
+        accept = "application/json;q=0.5, application/vnd.apache.parquet;q=0.9"
+
+        assert negotiate(accept) == "parquet"
+
+    def test_negotiate_ignores_zero_quality(self):
+        assert negotiate("application/vnd.apache.parquet;q=0, application/x-ndjson") == "ndjson"
+
+    def test_infer_types_converts_numeric_columns(self, raw_dataframe):
+        result = infer_types(raw_dataframe)
+
+        assert pd.api.types.is_integer_dtype(result["price"])
+        assert pd.api.types.is_float_dtype(result["area"])
+        assert result["mainroad"].tolist() == ["yes", "no"]
+
+    def test_to_columnar_groups_values_by_column(self, raw_dataframe):
+        result = to_columnar(infer_types(raw_dataframe))
+
+        assert result["columns"]["price"] == [100000, 200000]
+        assert result["columns"]["area"] == [1000.5, None]
+        assert result["dtypes"]["price"] == "int64"
+
+    def test_to_arrow_round_trips(self, raw_dataframe):
+        pa = pytest.importorskip("pyarrow")
+
+        table = pa.ipc.open_stream(to_arrow(infer_types(raw_dataframe))).read_all()
+
+        assert table.column("price").to_pylist() == [100000, 200000]
+        assert pa.types.is_integer(table.schema.field("price").type)
+
+    def test_to_parquet_round_trips(self, raw_dataframe):
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        table = pq.read_table(io.BytesIO(to_parquet(infer_types(raw_dataframe))))
+
+        assert table.column_names == ["price", "area", "mainroad"]
+        assert table.num_rows == 2
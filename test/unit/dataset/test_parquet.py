@@ -0,0 +1,160 @@
+import io
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from src.core.dataset.parquet import (
+    S3RangeFile, materialize_parquet, open_parquet, parquet_key, prune_row_groups, read_parquet_columns, read_parquet_rows
+)
+from src.core.dataset.reader import read_rows
+from src.core.dataset.schema import read_dataset
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+        self.ranges = []
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        self.objects[Key] = (Body, Metadata or {}, f'"{Key}-{len(Body)}"')
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        body, metadata, etag = self.objects[Key]
+        return {"ContentLength": len(body), "ETag": etag, "Metadata": metadata}
+
+    def get_object(self, Bucket, Key, Range=None):
+        body, metadata, etag = self.objects[Key]
+        if Range:
+            self.ranges.append(Range)
+            start, end = map(int, Range.removeprefix("bytes=").split("-"))
+            body = body[start:end + 1]
+        return {"Body": io.BytesIO(body), "ETag": etag}
+
+@pytest.fixture
+def housing_csv():
+    housing = pd.read_csv("src/config/housing.csv")
+    return housing.to_csv(index=False).encode()
+
+@pytest.fixture
+def s3(housing_csv):
+    fake = FakeS3()
+    fake.put_object(Bucket="data", Key="housing.csv", Body=housing_csv)
+    return fake
+
+def materialize(s3, row_group_rows: int = 100) -> dict:
+    head = s3.head_object(Bucket="data", Key="housing.csv")
+    frame = read_dataset(io.BytesIO(s3.objects["housing.csv"][0]), flags="category")
+    with patch.dict("os.environ", {"parquet_row_group_rows": str(row_group_rows)}):
+        materialize_parquet(s3, "data", "housing.csv", frame, head["ETag"])
+    return head
+
+class TestS3RangeFile:
+    def test_reads_ranges(self, s3):
+        source = S3RangeFile(s3, "data", "housing.csv", len(s3.objects["housing.csv"][0]))
+
+        source.seek(6)
+        assert source.read(4) == b"area"
+        source.seek(-3, io.SEEK_END)
+        assert source.read() == s3.objects["housing.csv"][0][-3:]
+        assert source.read() == b""
+        assert s3.ranges[0] == "bytes=6-9"
+        assert source.requests == 2
+
+@patch("src.core.dataset.parquet.get_logger")
+class TestParquetCopy:
+    def test_copy_is_tagged_with_source_etag(self, mock_get_logger, s3):
+        head = materialize(s3)
+
+        assert s3.objects[parquet_key("housing.csv")][1] == {"source-etag": head["ETag"]}
+
+    def test_rows_match_the_csv_route(self, mock_get_logger, s3, housing_csv):
+        head = materialize(s3)
+        query = {"columns": ["price", "mainroad", "furnishingstatus"], "filters": [("bedrooms", ">=", "4")], "offset": 2, "limit": 5}
+
+        from_parquet = read_parquet_rows(s3, "data", "housing.csv", head, **query)
+        from_csv = read_rows(io.BytesIO(housing_csv), **query)
+
+        pd.testing.assert_frame_equal(from_parquet, from_csv, check_dtype=False)
+
+    def test_stale_copy_is_ignored(self, mock_get_logger, s3, housing_csv):
+        materialize(s3)
+        s3.put_object(Bucket="data", Key="housing.csv", Body=housing_csv + b"1,1,1,1,1,no,no,no,no,no,1,no,furnished\n")
+        head = s3.head_object(Bucket="data", Key="housing.csv")
+
+        assert read_parquet_rows(s3, "data", "housing.csv", head) is None
+
+    def test_missing_copy_is_ignored(self, mock_get_logger, s3):
+        head = s3.head_object(Bucket="data", Key="housing.csv")
+
+        assert read_parquet_rows(s3, "data", "housing.csv", head) is None
+
+    def test_row_groups_are_pruned_with_statistics(self, mock_get_logger, s3):
+        materialize(s3, row_group_rows=50)
+        parquet_file, _ = open_parquet(s3, "data", "housing.csv", s3.head_object(Bucket="data", Key=parquet_key("housing.csv")))
+
+        # the csv is sorted by price descending, so only the first groups can hold prices above 9M
+        kept = prune_row_groups(parquet_file.metadata, [("price", ">", "9000000")])
+
+        assert parquet_file.metadata.num_row_groups == 11
+        assert kept == [0]
+        assert prune_row_groups(parquet_file.metadata, [("mainroad", "=", "yes"), ("area", "<", "0")]) == []
+
+    def test_only_needed_row_groups_and_columns_are_fetched(self, mock_get_logger, s3):
+        head = materialize(s3, row_group_rows=50)
+        read_parquet_rows(s3, "data", "housing.csv", head)
+        full_requests = len(s3.ranges)
+        s3.ranges.clear()
+
+        rows = read_parquet_rows(s3, "data", "housing.csv", head, columns=["price"], filters=[("price", ">", "9000000")])
+
+        assert (rows["price"].astype(int) > 9000000).all()
+        assert len(s3.ranges) == 1
+        assert full_requests == 12
+
+    def test_limit_stops_reading_row_groups(self, mock_get_logger, s3):
+        head = materialize(s3, row_group_rows=50)
+
+        rows = read_parquet_rows(s3, "data", "housing.csv", head, limit=60)
+
+        assert len(rows) == 60
+        # footer, then the first two row groups
+        assert len(s3.ranges) == 3
+
+    def test_footer_is_cached(self, mock_get_logger, s3):
+        head = materialize(s3)
+        read_parquet_rows(s3, "data", "housing.csv", head, limit=1)
+        s3.ranges.clear()
+
+        read_parquet_rows(s3, "data", "housing.csv", head, limit=1)
+
+        assert len(s3.ranges) == 1
+
+    def test_unknown_column_raises(self, mock_get_logger, s3):
+        head = materialize(s3)
+
+        with pytest.raises(ValueError, match="lotsize"):
+            read_parquet_rows(s3, "data", "housing.csv", head, columns=["lotsize"])
+
+    def test_training_columns_keep_yes_no_categories(self, mock_get_logger, s3):
+        head = materialize(s3)
+
+        frame = read_parquet_columns(s3, "data", "housing.csv", head, ["price", "mainroad"])
+
+        assert list(frame.columns) == ["price", "mainroad"]
+        assert set(frame["mainroad"].cat.categories) == {"yes", "no"}
+
+class TestDatasetRoute:
+    @patch("src.core.dataset.parquet.get_logger")
+    @patch("src.api.v3.bucket.get_dataset.config")
+    def test_route_serves_fresh_copy_with_ranged_reads(self, mock_config, mock_get_logger, s3):
+        from fastapi.testclient import TestClient
+        from src.main import app
+        materialize(s3, row_group_rows=50)
+        mock_config.return_value = {"s3": s3}
+
+        response = TestClient(app).get("/bucket/dataset?bucket=data&columns=price,mainroad&filter=price>9000000")
+
+        assert response.status_code == 200
+        assert response.json()["values"][0] == {"price": "13300000", "mainroad": "yes"}
+        assert s3.ranges and all(r.startswith("bytes=") for r in s3.ranges)
@@ -0,0 +1,76 @@
+import pytest
+import pandas as pd
+from src.core.dataset.query import parse_columns, parse_filters, required_columns, filter_mask, select_rows
+
+class TestQuery:
+    @pytest.fixture
+    def housing_chunk(self):
+        return pd.DataFrame({
+            "price": ["100000", "200000", "300000", "400000"],
+            "area": ["1000", "2000", "3000", "4000"],
+            "bedrooms": ["2", "3", "4", "3"],
+            "mainroad": ["yes", "no", "yes", "yes"]
+        })
+
+    def test_parse_columns_splits_and_deduplicates(self):
+        assert parse_columns(" price, area,price ") == ["price", "area"]
+
+    def test_parse_columns_empty_returns_none(self):
+        assert parse_columns("") is None
+        assert parse_columns(None) is None
+
+    def test_parse_filters_supports_all_operators(self):
+        result = parse_filters(["bedrooms>=3", "area < 2000", "mainroad=yes", "basement!=no"])
+
+        assert result == [("bedrooms", ">=", "3"), ("area", "<", "2000"), ("mainroad", "=", "yes"), ("basement", "!=", "no")]
+
+    def test_parse_filters_rejects_invalid_expression(self):
+        with pytest.raises(ValueError):
+            parse_filters(["bedrooms"])
+
+    def test_required_columns_includes_filter_columns(self):
+        assert required_columns(["price"], [("bedrooms", ">=", "3")]) == ["price", "bedrooms"]
+        assert required_columns(None, [("bedrooms", ">=", "3")]) is None
+
+    def test_filter_mask_numeric_comparison(self, housing_chunk):
+        mask = filter_mask(housing_chunk, [("bedrooms", ">=", "3")])
+
+        assert mask.tolist() == [False, True, True, True]
+
+    def test_filter_mask_combines_predicates(self, housing_chunk):
+        mask = filter_mask(housing_chunk, [("bedrooms", ">=", "3"), ("mainroad", "=", "yes")])
+
+        assert mask.tolist() == [False, False, True, True]
+
+    def test_filter_mask_rejects_ordered_string_comparison(self, housing_chunk):
+        with pytest.raises(ValueError):
+            filter_mask(housing_chunk, [("mainroad", ">", "yes")])
+
+    def test_filter_mask_rejects_unknown_column(self, housing_chunk):
+        with pytest.raises(ValueError):
+            filter_mask(housing_chunk, [("unknown", "=", "yes")])
+
+    def test_select_rows_paginates_across_chunks(self, housing_chunk):
+        chunks = [housing_chunk.iloc[:2], housing_chunk.iloc[2:]]
+
+        result = pd.concat(select_rows(chunks, offset=1, limit=2))
+
+        assert result["price"].tolist() == ["200000", "300000"]
+
+    def test_select_rows_projects_columns_after_filtering(self, housing_chunk):
+        result = pd.concat(select_rows([housing_chunk], columns=["area", "price"], filters=[("mainroad", "=", "no")]))
+
+        assert list(result.columns) == ["area", "price"]
+        assert result.to_dict(orient="records") == [{"area": "2000", "price": "200000"}]
+
+    def test_select_rows_stops_consuming_chunks_after_limit(self, housing_chunk):
+        consumed = []
+
+        def chunks():
+            for i in range(4):
+                consumed.append(i)
+                yield housing_chunk.iloc[i:i + 1]
+
+        list(select_rows(chunks(), limit=1))
+
+        assert consumed == [0]
@@ -0,0 +1,71 @@
+import pytest
+import asyncio
+import io
+import json
+import pandas as pd
+from unittest.mock import MagicMock
+from src.core.dataset.reader import read_csv_chunks, read_rows, to_ndjson, stream_ndjson
+
+class TestReader:
+    @pytest.fixture
+    def csv_body(self):
+        rows = "\n".join(f"{i},{'yes' if i % 2 else 'no'}" for i in range(25))
+        return io.BytesIO(("price,mainroad\n" + rows).encode())
+
+    def collect(self, body, chunk_rows, **query):
+        async def run():
+            return [part async for part in await stream_ndjson(body, chunk_rows=chunk_rows, **query)]
+        return asyncio.run(run())
+
+    def test_read_csv_chunks_keeps_raw_strings(self, csv_body):
+        chunk = next(iter(read_csv_chunks(csv_body, chunk_rows=5)))
+
+        assert chunk["price"].tolist() == ["0", "1", "2", "3", "4"]
+
+    def test_read_csv_chunks_respects_chunk_size(self, csv_body):
+        sizes = [len(chunk) for chunk in read_csv_chunks(csv_body, chunk_rows=10)]
+
+        assert sizes == [10, 10, 5]
+
+    def test_to_ndjson_one_line_per_row(self):
+        result = to_ndjson(pd.DataFrame({"a": ["1", "2"]}))
+
+        assert result == '{"a":"1"}\n{"a":"2"}\n'
+
+    def test_stream_ndjson_yields_one_part_per_chunk(self, csv_body):
+        parts = self.collect(csv_body, 10)
+
+        assert len(parts) == 3
+        rows = [json.loads(line) for part in parts for line in part.splitlines()]
+        assert len(rows) == 25
+        assert rows[1] == {"price": "1", "mainroad": "yes"}
+
+    def test_stream_ndjson_closes_body(self):
+        body = MagicMock(wraps=io.BytesIO(b"a\n1\n"))
+
+        self.collect(body, 10)
+
+        body.close.assert_called_once()
+
+    def test_stream_ndjson_applies_query(self, csv_body):
+        parts = self.collect(csv_body, 10, columns=["price"], filters=[("mainroad", "=", "yes")], offset=2, limit=3)
+
+        rows = [json.loads(line) for part in parts for line in part.splitlines()]
+        assert rows == [{"price": "5"}, {"price": "7"}, {"price": "9"}]
+
+    def test_stream_ndjson_raises_before_streaming_on_unknown_column(self, csv_body):
+        with pytest.raises(ValueError):
+            self.collect(csv_body, 10, columns=["unknown"])
+
+    def test_read_rows_stops_reading_once_limit_is_reached(self):
+        body = MagicMock(wraps=io.BytesIO(("price\n" + "\n".join(str(i) for i in range(100000))).encode()))
+
+        result = read_rows(body, limit=5, chunk_rows=10)
+
+        assert result["price"].tolist() == ["0", "1", "2", "3", "4"]
+        body.close.assert_called_once()
+
+    def test_read_rows_empty_result(self, csv_body):
+        result = read_rows(csv_body, filters=[("price", ">", "1000")])
+
+        assert result.empty
@@ -0,0 +1,49 @@
+import io
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from src.core.dataset.schema import HOUSING_DTYPES, csv_engine, read_dataset, schema_options
+
+CSV = b"""price,area,bedrooms,bathrooms,stories,mainroad,guestroom,basement,hotwaterheating,airconditioning,parking,prefarea,furnishingstatus
+13300000,7420,4,2,3,yes,no,no,no,yes,2,yes,furnished
+12250000,8960,4,4,4,yes,no,no,no,yes,3,no,semi-furnished
+"""
+
+class TestReadDataset:
+    @pytest.mark.parametrize("engine", ["c", "pyarrow"])
+    def test_declared_dtypes(self, engine):
+        frame = read_dataset(io.BytesIO(CSV), engine=engine)
+
+        assert frame["price"].dtype == "int64"
+        assert frame["bedrooms"].dtype == "int8"
+        assert frame["mainroad"].dtype == bool
+        assert frame["guestroom"].tolist() == [False, False]
+        assert isinstance(frame["furnishingstatus"].dtype, pd.CategoricalDtype)
+
+    @pytest.mark.parametrize("engine", ["c", "pyarrow"])
+    def test_only_requested_columns_are_parsed(self, engine):
+        frame = read_dataset(io.BytesIO(CSV), columns=["price", "prefarea"], engine=engine)
+
+        assert list(frame.columns) == ["price", "prefarea"]
+        assert frame["prefarea"].tolist() == [True, False]
+
+    def test_unknown_column_raises(self):
+        with pytest.raises(ValueError, match="lotsize"):
+            schema_options(["price", "lotsize"])
+
+    def test_every_column_is_declared(self):
+        header = CSV.split(b"\n")[0].decode().split(",")
+
+        assert list(HOUSING_DTYPES) == header
+
+class TestCsvEngine:
+    def test_defaults_to_pyarrow(self):
+        assert csv_engine() == "pyarrow"
+
+    @patch.dict("os.environ", {"csv_engine": "c"})
+    def test_engine_from_env(self):
+        assert csv_engine() == "c"
+
+    @patch("src.core.dataset.schema.pyarrow", None)
+    def test_falls_back_without_pyarrow(self):
+        assert csv_engine("pyarrow") == "c"
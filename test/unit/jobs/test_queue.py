@@ -0,0 +1,162 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from src.core.jobs.queue import JobQueue, JobQueueFull
+
+def wait_for(jobs: JobQueue, job_id: str, statuses: tuple = ("succeeded", "failed"), timeout: float = 5) -> dict:
+    for _ in range(int(timeout / 0.01)):
+        job = jobs.get(job_id)
+        if job["status"] in statuses:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} never reached {statuses}")
+
+class TestJobQueue:
+    @pytest.fixture
+    def gate(self):
+        return threading.Event()
+
+    @pytest.fixture
+    def blocked(self, gate):
+        # the first job holds the only worker until the gate opens
+        return JobQueue({"block": lambda: gate.wait(5), "ingest": MagicMock(), "inference": MagicMock()}, workers=1, max_pending=2)
+
+    def test_job_runs_and_succeeds(self):
+        runner = MagicMock(return_value={"run_id": "run"})
+        jobs = JobQueue({"ingest": runner}, workers=1)
+
+        job, created = jobs.submit("ingest")
+        finished = wait_for(jobs, job["id"])
+
+        assert created is True
+        assert finished["status"] == "succeeded"
+        assert finished["duration_seconds"] is not None
+        assert finished["result"] == {"run_id": "run"}
+        runner.assert_called_once_with()
+        jobs.shutdown()
+
+    def test_failed_job_records_error(self):
+        jobs = JobQueue({"ingest": MagicMock(side_effect=Exception("no dataset"))}, workers=1)
+
+        job, _ = jobs.submit("ingest")
+        finished = wait_for(jobs, job["id"])
+
+        assert finished["status"] == "failed"
+        assert finished["error"] == "no dataset"
+        jobs.shutdown()
+
+    def test_unknown_kind_raises(self):
+        with pytest.raises(KeyError):
+            JobQueue({"ingest": MagicMock()}).submit("train")
+
+    def test_identical_pending_jobs_are_deduplicated(self, blocked, gate):
+        blocked.submit("block")
+        first, first_created = blocked.submit("ingest")
+        second, second_created = blocked.submit("ingest")
+
+        assert first_created is True
+        assert second_created is False
+        assert second["id"] == first["id"]
+        gate.set()
+        wait_for(blocked, first["id"])
+        assert blocked.runners["ingest"].call_count == 1
+        blocked.shutdown()
+
+    def test_jobs_of_one_kind_never_overlap(self):
+        active, overlaps = [], []
+        lock = threading.Lock()
+
+        def runner(**params):
+            with lock:
+                active.append(params)
+                overlaps.append(len(active))
+            threading.Event().wait(0.05)
+            with lock:
+                active.remove(params)
+
+        jobs = JobQueue({"ingest": runner}, workers=2)
+        first, _ = jobs.submit("ingest")
+        second, _ = jobs.submit("ingest", {"force": True})
+        wait_for(jobs, first["id"])
+        wait_for(jobs, second["id"])
+
+        assert overlaps == [1, 1]
+        jobs.shutdown()
+
+    def test_busy_kind_does_not_hold_a_worker(self, gate):
+        inference = MagicMock()
+        jobs = JobQueue({"ingest": lambda **params: gate.wait(5), "inference": inference}, workers=2)
+        first, _ = jobs.submit("ingest")
+        wait_for(jobs, first["id"], statuses=("running",))
+        second, _ = jobs.submit("ingest", {"force": True})
+        scored, _ = jobs.submit("inference")
+
+        finished = wait_for(jobs, scored["id"])
+
+        assert finished["status"] == "succeeded"
+        assert jobs.get(second["id"])["status"] == "queued"
+        assert jobs.get(second["id"])["started_at"] is None
+        gate.set()
+        assert wait_for(jobs, second["id"])["status"] == "succeeded"
+        jobs.shutdown()
+
+    def test_higher_priority_runs_first(self, gate):
+        order = []
+        jobs = JobQueue({
+            "block": lambda: gate.wait(5),
+            "ingest": lambda: order.append("ingest"),
+            "inference": lambda: order.append("inference")
+        }, workers=1)
+        jobs.submit("block")
+        low, _ = jobs.submit("ingest", priority="low")
+        high, _ = jobs.submit("inference", priority="high")
+
+        gate.set()
+        wait_for(jobs, low["id"])
+
+        assert order == ["inference", "ingest"]
+        jobs.shutdown()
+
+    def test_duplicate_with_higher_priority_bumps_pending_job(self, gate):
+        order = []
+        jobs = JobQueue({
+            "block": lambda: gate.wait(5),
+            "ingest": lambda: order.append("ingest"),
+            "inference": lambda: order.append("inference")
+        }, workers=1)
+        jobs.submit("block")
+        jobs.submit("ingest", priority="low")
+        jobs.submit("inference")
+        bumped, created = jobs.submit("ingest", priority="high")
+
+        gate.set()
+        wait_for(jobs, bumped["id"])
+        jobs.shutdown()
+
+        assert created is False
+        assert bumped["priority"] == "high"
+        assert order[0] == "ingest"
+        assert order.count("ingest") == 1
+
+    def test_full_queue_raises(self, blocked, gate):
+        job, _ = blocked.submit("block")
+        wait_for(blocked, job["id"], statuses=("running",))
+        blocked.submit("ingest")
+        blocked.submit("inference")
+
+        with pytest.raises(JobQueueFull):
+            blocked.submit("ingest", params={"other": True})
+        gate.set()
+        blocked.shutdown()
+
+    def test_history_keeps_newest_finished_jobs(self):
+        jobs = JobQueue({"ingest": MagicMock()}, workers=1, history=2)
+        ids = []
+        for i in range(4):
+            job, _ = jobs.submit("ingest", params={"run": i})
+            wait_for(jobs, job["id"])
+            ids.append(job["id"])
+
+        assert [job["id"] for job in jobs.list()] == ids[:1:-1]
+        assert jobs.get(ids[0]) is None
+        jobs.shutdown()
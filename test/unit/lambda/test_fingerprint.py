@@ -0,0 +1,98 @@
+import io
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+from src.core.lambdas.fingerprint import code_version, fingerprint, load_stage, object_etag, save_stage, stage_cache_enabled, stage_key
+from src.core.lambdas.ingestion import ingestion_fingerprints
+
+def missing(operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": "404"}}, operation)
+
+class TestFingerprint:
+    def test_is_stable_and_ignores_key_order(self):
+        assert fingerprint("train", {"a": 1, "b": 2}) == fingerprint("train", {"b": 2, "a": 1})
+
+    def test_changes_with_any_part(self):
+        assert fingerprint("train", '"etag1"') != fingerprint("train", '"etag2"')
+        assert fingerprint("train", '"etag1"') != fingerprint("split", '"etag1"')
+
+    def test_code_version_can_be_pinned(self):
+        code_version.cache_clear()
+        try:
+            with patch.dict("os.environ", {"code_version": "abc123"}):
+                assert code_version() == "abc123"
+        finally:
+            code_version.cache_clear()
+
+    def test_code_version_hashes_pipeline_sources(self):
+        code_version.cache_clear()
+        try:
+            with patch.dict("os.environ", {"code_version": ""}):
+                assert len(code_version()) == 16
+        finally:
+            code_version.cache_clear()
+
+    def test_stage_cache_can_be_disabled(self):
+        assert stage_cache_enabled() is True
+        assert stage_cache_enabled(force=True) is False
+        with patch.dict("os.environ", {"stage_cache": "0"}):
+            assert stage_cache_enabled() is False
+
+class TestIngestionFingerprints:
+    def test_new_csv_invalidates_every_stage(self):
+        first = ingestion_fingerprints('"v1"', "memory")
+        second = ingestion_fingerprints('"v2"', "memory")
+
+        assert all(first[stage] != second[stage] for stage in first)
+
+    @patch("src.core.lambdas.ingestion.hyperparameters")
+    def test_hyperparameters_only_invalidate_training(self, mock_hyperparameters):
+        mock_hyperparameters.return_value = {"fit_intercept": True}
+        first = ingestion_fingerprints('"v1"', "memory")
+        mock_hyperparameters.return_value = {"fit_intercept": False}
+        second = ingestion_fingerprints('"v1"', "memory")
+
+        assert first["split"] == second["split"]
+        assert first["train"] != second["train"]
+
+class TestStageRecords:
+    def test_save_then_load_round_trip(self):
+        store = {}
+        mock_s3 = MagicMock()
+        mock_s3.put_object.side_effect = lambda Bucket, Key, Body, **kwargs: store.__setitem__(Key, Body)
+        mock_s3.get_object.side_effect = lambda Bucket, Key: {"Body": io.BytesIO(store[Key])}
+
+        save_stage(mock_s3, "ingestion", "train", "abc", {"version": "v1"})
+
+        assert list(store) == [stage_key("ingestion", "train", "abc")] == ["stages/ingestion/train/abc.json"]
+        assert load_stage(mock_s3, "ingestion", "train", "abc") == {"version": "v1"}
+
+    @patch("src.core.lambdas.fingerprint.get_logger")
+    def test_missing_record_is_none(self, mock_get_logger):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+        assert load_stage(mock_s3, "ingestion", "train", "abc") is None
+        mock_get_logger.return_value.warning.assert_not_called()
+
+    @patch("src.core.lambdas.fingerprint.get_logger")
+    def test_unreadable_record_is_a_miss(self, mock_get_logger):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"not json")}
+
+        assert load_stage(mock_s3, "ingestion", "train", "abc") is None
+        mock_get_logger.return_value.warning.assert_called_once()
+
+    @patch("src.core.lambdas.fingerprint.get_logger")
+    def test_save_failure_is_not_raised(self, mock_get_logger):
+        mock_s3 = MagicMock()
+        mock_s3.put_object.side_effect = Exception("denied")
+
+        save_stage(mock_s3, "ingestion", "train", "abc", {})
+
+        mock_get_logger.return_value.warning.assert_called_once()
+
+    def test_object_etag_of_missing_object_is_none(self):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.side_effect = missing("HeadObject")
+
+        assert object_etag(mock_s3, "bucket", "x_test.npy") is None
@@ -1,11 +1,23 @@
+import json
 import pytest
 import numpy as np
 import io
 from unittest.mock import patch, MagicMock
-import joblib
 from src.core.lambdas.inference import inference, handler
 
+def npy_body(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    buffer.seek(0)
+    return buffer
+
 class TestInference:
+    @pytest.fixture(autouse=True)
+    def no_stage_record(self):
+        # get_object is mocked with a fixed sequence of bodies, the stage lookup must not take one
+        with patch("src.core.lambdas.inference.load_stage", return_value=None) as mock_load_stage:
+            yield mock_load_stage
+
     @pytest.fixture
     def mock_model(self):
         model = MagicMock()
@@ -19,10 +31,10 @@ class TestInference:
         return x_test, y_test
 
     @patch("src.core.lambdas.inference.r2")
-    @patch("src.core.lambdas.inference.joblib.load")
+    @patch("src.core.lambdas.inference.deserialize")
     @patch("src.core.lambdas.inference.config")
     @patch("src.core.lambdas.inference.get_logger")
-    def test_inference_success(self, mock_get_logger, mock_config, mock_joblib_load, mock_r2, mock_model, mock_test_data):
+    def test_inference_success(self, mock_get_logger, mock_config, mock_deserialize, mock_r2, mock_model, mock_test_data):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         
@@ -32,30 +44,65 @@ class TestInference:
         # Mock S3 responses
         model_body = MagicMock()
         model_body.read.return_value = b"model_binary"
-        x_test_body = MagicMock()
-        x_test_body.read.return_value = b"x_test_binary"
-        y_test_body = MagicMock()
-        y_test_body.read.return_value = b"y_test_binary"
         
         mock_s3.get_object.side_effect = [
             {"Body": model_body},
-            {"Body": x_test_body},
-            {"Body": y_test_body}
+            {"Body": npy_body(x_test)},
+            {"Body": npy_body(y_test)}
         ]
         mock_config.return_value = {"s3": mock_s3}
         
-        mock_joblib_load.side_effect = [mock_model, x_test, y_test]
+        mock_deserialize.return_value = mock_model
         mock_r2.return_value = 0.85
         
         inference()
         
         assert mock_s3.get_object.call_count == 3
         mock_s3.get_object.assert_any_call(Bucket="local-ml-flow-models", Key="model.joblib")
-        mock_s3.get_object.assert_any_call(Bucket="local-ml-flow-data", Key="x_test.joblib")
-        mock_s3.get_object.assert_any_call(Bucket="local-ml-flow-data", Key="y_test.joblib")
+        mock_s3.get_object.assert_any_call(Bucket="local-ml-flow-data", Key="x_test.npy")
+        mock_s3.get_object.assert_any_call(Bucket="local-ml-flow-data", Key="y_test.npy")
         mock_model.predict.assert_called_once()
+        np.testing.assert_array_equal(mock_model.predict.call_args[0][0], x_test)
         mock_r2.assert_called_once()
-        mock_s3.put_object.assert_called_once_with(Bucket="local-ml-flow-data", Key="score.txt", Body="85.0%")
+        np.testing.assert_array_equal(mock_r2.call_args[0][0], y_test)
+        mock_s3.put_object.assert_any_call(Bucket="local-ml-flow-data", Key="score.txt", Body="85.0%")
+
+    @patch("src.core.lambdas.inference.config")
+    @patch("src.core.lambdas.inference.get_logger")
+    def test_inference_reuses_score_for_unchanged_inputs(self, mock_get_logger, mock_config, no_stage_record):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.side_effect = lambda Bucket, Key: {"ETag": f'"{Key}"'}
+        mock_config.return_value = {"s3": mock_s3}
+        no_stage_record.return_value = {"r2": 0.85, "score": '"score.txt"'}
+
+        result = inference()
+
+        mock_s3.get_object.assert_not_called()
+        assert result["r2"] == 0.85
+        assert result["reused"] == ["load_model", "load_test_data", "predict", "r2", "save_score"]
+
+    @patch("src.core.lambdas.inference.save_stage")
+    @patch("src.core.lambdas.inference.r2")
+    @patch("src.core.lambdas.inference.deserialize")
+    @patch("src.core.lambdas.inference.config")
+    @patch("src.core.lambdas.inference.get_logger")
+    def test_inference_rescores_when_score_was_overwritten(self, mock_get_logger, mock_config, mock_deserialize, mock_r2, mock_save_stage, no_stage_record, mock_model, mock_test_data):
+        x_test, y_test = mock_test_data
+        mock_s3 = MagicMock()
+        mock_s3.head_object.side_effect = lambda Bucket, Key: {"ETag": f'"{Key}"'}
+        mock_s3.get_object.side_effect = [{"Body": io.BytesIO(b"model")}, {"Body": npy_body(x_test)}, {"Body": npy_body(y_test)}]
+        mock_s3.put_object.return_value = {"ETag": '"new-score"'}
+        mock_config.return_value = {"s3": mock_s3}
+        no_stage_record.return_value = {"r2": 0.5, "score": '"old-score"'}
+        mock_deserialize.return_value = mock_model
+        mock_r2.return_value = 0.85
+
+        result = inference()
+
+        assert result["r2"] == 0.85
+        assert result["reused"] == []
+        assert mock_save_stage.call_args[0][1:3] == ("inference", "evaluation")
+        assert mock_save_stage.call_args[0][4] == {"r2": 0.85, "score": '"new-score"'}
 
     @patch("src.core.lambdas.inference.config")
     @patch("src.core.lambdas.inference.get_logger")
@@ -74,10 +121,10 @@ class TestInference:
         mock_logger.error.assert_called_once()
 
     @patch("src.core.lambdas.inference.r2")
-    @patch("src.core.lambdas.inference.joblib.load")
+    @patch("src.core.lambdas.inference.deserialize")
     @patch("src.core.lambdas.inference.config")
     @patch("src.core.lambdas.inference.get_logger")
-    def test_inference_logs_messages(self, mock_get_logger, mock_config, mock_joblib_load, mock_r2, mock_model, mock_test_data):
+    def test_inference_logs_messages(self, mock_get_logger, mock_config, mock_deserialize, mock_r2, mock_model, mock_test_data):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         
@@ -86,19 +133,15 @@ class TestInference:
         
         model_body = MagicMock()
         model_body.read.return_value = b"model_binary"
-        x_test_body = MagicMock()
-        x_test_body.read.return_value = b"x_test_binary"
-        y_test_body = MagicMock()
-        y_test_body.read.return_value = b"y_test_binary"
         
         mock_s3.get_object.side_effect = [
             {"Body": model_body},
-            {"Body": x_test_body},
-            {"Body": y_test_body}
+            {"Body": npy_body(x_test)},
+            {"Body": npy_body(y_test)}
         ]
         mock_config.return_value = {"s3": mock_s3}
         
-        mock_joblib_load.side_effect = [mock_model, x_test, y_test]
+        mock_deserialize.return_value = mock_model
         mock_r2.return_value = 0.92
         
         inference()
@@ -110,12 +153,12 @@ class TestInference:
 class TestHandler:
     @patch("src.core.lambdas.inference.inference")
     def test_handler_success_returns_200(self, mock_inference):
-        mock_inference.return_value = None
+        mock_inference.return_value = {"run_id": "run", "stages": []}
         
         result = handler({}, {})
         
         assert result["statusCode"] == 200
-        assert result["body"] == "success"
+        assert json.loads(result["body"]) == {"status": "success", "profile": {"run_id": "run", "stages": []}}
 
     @patch("src.core.lambdas.inference.inference")
     def test_handler_calls_inference(self, mock_inference):
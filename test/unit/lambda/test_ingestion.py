@@ -1,11 +1,19 @@
+import json
 import pytest
 import pandas as pd
 import numpy as np
 import io
 from unittest.mock import patch, MagicMock
-from src.core.lambdas.ingestion import ingest, handler, save_test_data
+from sklearn.preprocessing import StandardScaler
+from src.core.lambdas.ingestion import TRAINING_COLUMNS, ingest, handler, save_test_data, sweep_candidates
 
 class TestIngest:
+    @pytest.fixture(autouse=True)
+    def no_stage_record(self):
+        # the mocked get_object serves the csv for every key, the stage lookup must not consume it
+        with patch("src.core.lambdas.ingestion.load_stage", return_value=None) as mock_load_stage:
+            yield mock_load_stage
+
     @pytest.fixture
     def mock_csv_content(self):
         csv_data = """price,area,mainroad,guestroom,basement,hotwaterheating,airconditioning,prefarea
@@ -14,12 +22,12 @@ class TestIngest:
 300000,3000,yes,no,no,yes,yes,no"""
         return io.BytesIO(csv_data.encode())
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_calls_config(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_calls_config(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -32,12 +40,12 @@ class TestIngest:
         
         mock_config.assert_called_once()
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_retrieves_from_s3(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_retrieves_from_s3(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -50,12 +58,12 @@ class TestIngest:
         
         mock_s3.get_object.assert_called_once_with(Bucket="local-ml-flow-data", Key="housing.csv")
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_calls_clean_df(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_calls_clean_df(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -68,12 +76,12 @@ class TestIngest:
         
         mock_clean_df.assert_called_once()
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_calls_train(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_calls_train(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -87,12 +95,12 @@ class TestIngest:
         
         mock_train.assert_called_once()
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_calls_save_model(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_registers_model(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -104,14 +112,33 @@ class TestIngest:
         
         ingest()
         
-        mock_save_model.assert_called_once_with(model=mock_model)
+        mock_register_model.assert_called_once()
+        assert mock_register_model.call_args[1]["model"] is mock_model
+
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.train")
+    @patch("src.core.lambdas.ingestion.clean_df")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_ingest_registers_fitted_scaler(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": mock_csv_content}
+        mock_config.return_value = {"s3": mock_s3, "lambdas": MagicMock()}
+        mock_clean_df.return_value = pd.DataFrame({"price": [100]*10, "mainroad": [0]*10, "guestroom": [0]*10, "basement": [0]*10, "hotwaterheating": [0]*10, "airconditioning": [0]*10, "prefarea": [0]*10})
+        mock_train.return_value = MagicMock()
+        
+        ingest()
+        
+        assert isinstance(mock_register_model.call_args[1]["scaler"], StandardScaler)
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_returns_none(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_returns_stage_profile(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -122,14 +149,18 @@ class TestIngest:
         
         result = ingest()
         
-        assert result is None
+        assert result["status"] == "success"
+        assert [stage["name"] for stage in result["stages"]] == [
+            "read_csv", "load_dataset", "clean_df", "split", "train", "materialize_parquet", "register_model", "save_test_data"
+        ]
+        assert result["stages"][0]["parent"] == "load_dataset"
 
-    @patch("src.core.lambdas.ingestion.save_model")
+    @patch("src.core.lambdas.ingestion.register_model")
     @patch("src.core.lambdas.ingestion.train")
     @patch("src.core.lambdas.ingestion.clean_df")
     @patch("src.core.lambdas.ingestion.config")
     @patch("src.core.lambdas.ingestion.get_logger")
-    def test_ingest_logs_info_messages(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_save_model, mock_csv_content):
+    def test_ingest_logs_info_messages(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_csv_content):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         mock_s3 = MagicMock()
@@ -159,6 +190,217 @@ class TestIngest:
         mock_logger.error.assert_called_once()
 
 
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.stream_fit")
+    @patch("src.core.lambdas.ingestion.load_dataset")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_ingest_streaming_mode(self, mock_get_logger, mock_config, mock_load_dataset, mock_stream_fit, mock_register_model, mock_csv_content):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": mock_csv_content}
+        mock_config.return_value = {"s3": mock_s3}
+        model, scaler = MagicMock(), MagicMock()
+        mock_stream_fit.return_value = (model, scaler, np.zeros((2, 6)), pd.Series([1, 2]))
+
+        result = ingest(mode="streaming")
+
+        mock_load_dataset.assert_not_called()
+        assert mock_stream_fit.call_args.args[0] is mock_csv_content
+        mock_register_model.assert_called_once_with(model=model, scaler=scaler, metadata=None)
+        assert result["mode"] == "streaming"
+        assert [stage["name"] for stage in result["stages"]] == ["stream_fit", "register_model", "save_test_data"]
+
+    @patch.dict("os.environ", {"ingest_mode": "auto", "ingest_memory_mb": "100"})
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.stream_fit")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_auto_mode_streams_objects_larger_than_the_budget(self, mock_get_logger, mock_config, mock_stream_fit, mock_register_model):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ContentLength": 50 * 1024 * 1024}
+        mock_config.return_value = {"s3": mock_s3}
+        mock_stream_fit.return_value = (MagicMock(), MagicMock(), np.zeros((2, 6)), pd.Series([1, 2]))
+
+        result = ingest()
+
+        assert result["mode"] == "streaming"
+        assert mock_stream_fit.call_args.args[1] == 100 * 1024 * 1024
+
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_unknown_mode_raises(self, mock_get_logger, mock_config):
+        mock_config.return_value = {"s3": MagicMock()}
+
+        with pytest.raises(ValueError, match="ingestion mode"):
+            ingest(mode="distributed")
+
+    @patch("src.core.lambdas.ingestion.materialize_parquet")
+    @patch("src.core.lambdas.ingestion.read_parquet_columns")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.train")
+    @patch("src.core.lambdas.ingestion.clean_df")
+    @patch("src.core.lambdas.ingestion.load_dataset")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_ingest_reads_fresh_parquet_copy(self, mock_get_logger, mock_config, mock_load_dataset, mock_clean_df, mock_train, mock_register_model, mock_read_parquet_columns, mock_materialize_parquet):
+        mock_config.return_value = {"s3": MagicMock()}
+        frame = pd.DataFrame({"price": [100]*10, "mainroad": [0]*10, "guestroom": [0]*10, "basement": [0]*10, "hotwaterheating": [0]*10, "airconditioning": [0]*10, "prefarea": [0]*10})
+        mock_read_parquet_columns.return_value = frame
+        mock_clean_df.return_value = frame
+
+        result = ingest()
+
+        mock_load_dataset.assert_not_called()
+        mock_materialize_parquet.assert_not_called()
+        assert "materialize_parquet" not in [stage["name"] for stage in result["stages"]]
+
+    @patch("src.core.lambdas.ingestion.materialize_parquet")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.train")
+    @patch("src.core.lambdas.ingestion.clean_df")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_parquet_copy_failure_does_not_fail_ingest(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_materialize_parquet, mock_csv_content):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": mock_csv_content, "ETag": '"csv"'}
+        mock_config.return_value = {"s3": mock_s3}
+        mock_clean_df.return_value = pd.DataFrame({"price": [100]*10, "mainroad": [0]*10, "guestroom": [0]*10, "basement": [0]*10, "hotwaterheating": [0]*10, "airconditioning": [0]*10, "prefarea": [0]*10})
+        mock_materialize_parquet.side_effect = Exception("access denied")
+
+        result = ingest()
+
+        assert result["status"] == "success"
+        assert mock_materialize_parquet.call_args.args[4] == '"csv"'
+        mock_logger.warning.assert_called_once()
+
+    @patch("src.core.lambdas.ingestion.parquet_writable", return_value=False)
+    @patch("src.core.lambdas.ingestion.materialize_parquet")
+    @patch("src.core.lambdas.ingestion.read_dataset")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.train")
+    @patch("src.core.lambdas.ingestion.clean_df")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_without_pyarrow_only_training_columns_are_parsed(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_read_dataset, mock_materialize_parquet, mock_parquet_writable, mock_csv_content):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": mock_csv_content, "ETag": '"csv"'}
+        mock_config.return_value = {"s3": mock_s3}
+        mock_clean_df.return_value = pd.DataFrame({"price": [100]*10, "mainroad": [0]*10, "guestroom": [0]*10, "basement": [0]*10, "hotwaterheating": [0]*10, "airconditioning": [0]*10, "prefarea": [0]*10})
+
+        result = ingest()
+
+        assert mock_read_dataset.call_args.kwargs["columns"] == TRAINING_COLUMNS
+        mock_materialize_parquet.assert_not_called()
+        assert "materialize_parquet" not in [stage["name"] for stage in result["stages"]]
+
+class TestSweep:
+    @patch("src.core.lambdas.ingestion.load_stage", return_value=None)
+    @patch("src.core.lambdas.ingestion.sweep")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.train")
+    @patch("src.core.lambdas.ingestion.clean_df")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_sweep_trains_and_registers_only_the_winner(self, mock_get_logger, mock_config, mock_clean_df, mock_train, mock_register_model, mock_sweep, mock_load_stage):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {"Body": io.BytesIO(b"price,mainroad\n1,yes\n")}
+        mock_config.return_value = {"s3": mock_s3}
+        mock_clean_df.return_value = pd.DataFrame({"price": range(10), **{column: [0, 1] * 5 for column in ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"]}})
+        results = [
+            {"estimator": "Ridge", "params": {"alpha": 1.0}, "r2": 0.9, "fit_seconds": 0.1, "predict_seconds": 0.01, "error": None},
+            {"estimator": "LinearRegression", "params": {}, "r2": 0.8, "fit_seconds": 0.1, "predict_seconds": 0.01, "error": None}
+        ]
+        mock_sweep.return_value = results
+
+        result = ingest(sweep_models=True)
+
+        mock_train.assert_called_once()
+        assert mock_train.call_args.kwargs["estimator"] == "Ridge"
+        assert mock_train.call_args.kwargs["params"] == {"alpha": 1.0}
+        mock_register_model.assert_called_once()
+        assert mock_register_model.call_args.kwargs["metadata"] == {"validation_r2": 0.9, "params": {"alpha": 1.0}, "candidates": 2}
+        # selection only ever sees the training split
+        x_train, y_train, _ = mock_sweep.call_args.args
+        assert len(x_train) == len(y_train) == 8
+        assert result["sweep"] == results
+        assert "sweep" in [stage["name"] for stage in result["stages"]]
+
+    def test_streaming_never_sweeps(self):
+        assert sweep_candidates("streaming", True) is None
+        assert sweep_candidates("memory", False) is None
+        assert sweep_candidates("memory", True)
+
+    @patch.dict("os.environ", {"model_format": "npz"})
+    def test_npz_format_only_sweeps_pickle_free_estimators(self):
+        estimators = {candidate["estimator"] for candidate in sweep_candidates("memory", True)}
+
+        assert estimators == {"LinearRegression", "Ridge", "Lasso", "ElasticNet"}
+
+class TestStageReuse:
+    @pytest.fixture
+    def mock_s3(self):
+        etags = {"housing.csv": '"csv"', "x_test.npy": '"x"', "y_test.npy": '"y"'}
+        mock_s3 = MagicMock()
+        mock_s3.head_object.side_effect = lambda Bucket, Key: {"ETag": etags[Key], "ContentLength": 100}
+        return mock_s3
+
+    @patch("src.core.lambdas.ingestion.load_manifest")
+    @patch("src.core.lambdas.ingestion.load_stage")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.train")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_unchanged_inputs_reuse_the_registered_model(self, mock_get_logger, mock_config, mock_train, mock_register_model, mock_load_stage, mock_load_manifest, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+        mock_load_stage.return_value = {"version": "v1", "x_test": '"x"', "y_test": '"y"'}
+        mock_load_manifest.return_value = {"versions": {"v1": {}}, "aliases": {"latest": "v1"}}
+
+        result = ingest()
+
+        mock_train.assert_not_called()
+        mock_register_model.assert_not_called()
+        mock_s3.get_object.assert_not_called()
+        assert result["version"] == "v1"
+        assert result["reused"] == ["load_dataset", "clean_df", "split", "train", "register_model", "save_test_data"]
+        assert mock_load_stage.call_args[0][3] == result["fingerprints"]["train"]
+
+    @patch("src.core.lambdas.ingestion.load_manifest")
+    @patch("src.core.lambdas.ingestion.load_stage")
+    @patch("src.core.lambdas.ingestion.stream_fit")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_replaced_outputs_are_not_reused(self, mock_get_logger, mock_config, mock_register_model, mock_stream_fit, mock_load_stage, mock_load_manifest, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+        mock_load_stage.return_value = {"version": "v1", "x_test": '"x"', "y_test": '"y"'}
+        mock_load_manifest.return_value = {"versions": {"v1": {}, "v2": {}}, "aliases": {"latest": "v2"}}
+        mock_stream_fit.return_value = (MagicMock(), MagicMock(), np.zeros((2, 6)), np.zeros(2))
+
+        result = ingest(mode="streaming")
+
+        mock_register_model.assert_called_once()
+        assert result["reused"] == []
+
+    @patch("src.core.lambdas.ingestion.save_stage")
+    @patch("src.core.lambdas.ingestion.load_stage")
+    @patch("src.core.lambdas.ingestion.stream_fit")
+    @patch("src.core.lambdas.ingestion.register_model")
+    @patch("src.core.lambdas.ingestion.config")
+    @patch("src.core.lambdas.ingestion.get_logger")
+    def test_force_runs_every_stage_and_records_outputs(self, mock_get_logger, mock_config, mock_register_model, mock_stream_fit, mock_load_stage, mock_save_stage, mock_s3):
+        mock_config.return_value = {"s3": mock_s3}
+        mock_register_model.return_value = "v3"
+        mock_stream_fit.return_value = (MagicMock(), MagicMock(), np.zeros((2, 6)), np.zeros(2))
+
+        result = ingest(mode="streaming", force=True)
+
+        mock_load_stage.assert_not_called()
+        pipeline, stage, fingerprint, outputs = mock_save_stage.call_args[0][1:]
+        assert (pipeline, stage, fingerprint) == ("ingestion", "train", result["fingerprints"]["train"])
+        assert outputs == {"version": "v3", "x_test": '"x"', "y_test": '"y"'}
+
 class TestSaveTestData:
     def test_save_test_data_saves_both_files(self):
         mock_s3 = MagicMock()
@@ -170,9 +412,9 @@ class TestSaveTestData:
         assert mock_s3.put_object.call_count == 2
         calls = mock_s3.put_object.call_args_list
         assert calls[0][1]["Bucket"] == "local-ml-flow-data"
-        assert calls[0][1]["Key"] == "x_test.joblib"
+        assert calls[0][1]["Key"] == "x_test.npy"
         assert calls[1][1]["Bucket"] == "local-ml-flow-data"
-        assert calls[1][1]["Key"] == "y_test.joblib"
+        assert calls[1][1]["Key"] == "y_test.npy"
 
     def test_save_test_data_calls_with_correct_data(self):
         mock_s3 = MagicMock()
@@ -183,16 +425,26 @@ class TestSaveTestData:
         
         assert mock_s3.put_object.call_count == 2
 
+    def test_save_test_data_writes_npy_without_pickle(self):
+        mock_s3 = MagicMock()
+        x_test = np.array([[1.5, 0.0], [0.0, 1.5]])
+        y_test = np.array([50, 60])
+
+        save_test_data(mock_s3, x_test, y_test)
+
+        body = mock_s3.put_object.call_args_list[0][1]["Body"]
+        np.testing.assert_array_equal(np.load(body, allow_pickle=False), x_test)
+
 
 class TestHandler:
     @patch("src.core.lambdas.ingestion.ingest")
     def test_handler_success_returns_200(self, mock_ingest):
-        mock_ingest.return_value = None
+        mock_ingest.return_value = {"run_id": "run", "stages": []}
         
         result = handler({}, {})
         
         assert result["statusCode"] == 200
-        assert result["body"] == "success"
+        assert json.loads(result["body"]) == {"status": "success", "profile": {"run_id": "run", "stages": []}}
 
     @patch("src.core.lambdas.ingestion.ingest")
     def test_handler_calls_ingest(self, mock_ingest):
@@ -220,3 +472,19 @@ class TestHandler:
         result = handler(event, context)
         
         assert result["statusCode"] == 200
+
+    @patch("src.core.lambdas.ingestion.ingest")
+    def test_handler_passes_mode_from_event(self, mock_ingest):
+        mock_ingest.return_value = {}
+
+        handler({"mode": "streaming"}, {})
+
+        mock_ingest.assert_called_once_with(mode="streaming", force=False, sweep_models=None)
+
+    @patch("src.core.lambdas.ingestion.ingest")
+    def test_handler_passes_force_from_event(self, mock_ingest):
+        mock_ingest.return_value = {}
+
+        handler({"force": True}, {})
+
+        mock_ingest.assert_called_once_with(mode=None, force=True, sweep_models=None)
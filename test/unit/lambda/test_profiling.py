@@ -0,0 +1,191 @@
+import io
+import json
+import time
+import tracemalloc
+import boto3
+import pytest
+from unittest.mock import patch, MagicMock
+from botocore.awsrequest import AWSResponse
+from src.core.lambdas.profiling import StageProfiler, body_size, track_client, save_run_record, _count_received
+
+class EmptyBody:
+    def stream(self, **kwargs):
+        yield b""
+
+def s3_client():
+    # a real client whose requests are answered before they leave the process
+    client = boto3.client("s3", region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test")
+    client.meta.events.register("before-send.s3.*", lambda request, **kwargs: AWSResponse(request.url, 200, {"ETag": '"etag"'}, EmptyBody()))
+    return client
+
+def response(length: str) -> MagicMock:
+    received = MagicMock()
+    received.headers = {"content-length": length}
+    return received
+
+class TestStageProfiler:
+    @pytest.fixture(autouse=True)
+    def tracing(self):
+        # profilers that never report keep their tracing session, each test starts from none
+        with patch.dict("src.core.lambdas.profiling._tracing", {"users": 0, "started": False}):
+            yield
+        tracemalloc.stop()
+
+    def test_stage_records_timings_and_memory(self):
+        profiler = StageProfiler("ingestion", trace_memory=True)
+
+        with profiler.stage("allocate"):
+            data = bytearray(4 * 1024 * 1024)
+            time.sleep(0.01)
+        del data
+
+        stage = profiler.stages[0]
+        assert stage["name"] == "allocate"
+        assert stage["wall_seconds"] >= 0.01
+        assert stage["cpu_seconds"] >= 0
+        assert stage["peak_traced_mb"] >= 4
+        assert stage["max_rss_mb"] > 0
+
+    def test_memory_tracing_can_be_disabled(self):
+        profiler = StageProfiler("ingestion", trace_memory=False)
+
+        with profiler.stage("train"):
+            pass
+
+        assert profiler.stages[0]["peak_traced_mb"] is None
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_memory_tracing_is_off_by_default(self):
+        profiler = StageProfiler("ingestion")
+
+        with profiler.stage("train"):
+            tracing = tracemalloc.is_tracing()
+
+        assert profiler.trace_memory is False
+        assert tracing is False
+
+    def test_overlapping_profilers_share_tracing(self):
+        first = StageProfiler("ingestion", trace_memory=True)
+        second = StageProfiler("inference", trace_memory=True)
+
+        with first.stage("load"):
+            pass
+        with second.stage("score"):
+            first.report()
+            data = bytearray(2 * 1024 * 1024)
+            still_tracing = tracemalloc.is_tracing()
+        del data
+        second.report()
+
+        assert still_tracing is True
+        assert second.stages[0]["peak_traced_mb"] >= 2
+        assert tracemalloc.is_tracing() is False
+
+    def test_bytes_are_attributed_to_the_active_stage(self):
+        profiler = StageProfiler("inference", trace_memory=False)
+        client = s3_client()
+        track_client(client)
+
+        with profiler.stage("load_model"):
+            _count_received(response("2048"))
+        with profiler.stage("save_score"):
+            client.put_object(Bucket="bucket", Key="score.txt", Body=b"85.0%")
+        client.put_object(Bucket="bucket", Key="outside.txt", Body=b"outside any stage")
+
+        load_model, save_score = profiler.stages
+        assert (load_model["bytes_read"], load_model["bytes_written"]) == (2048, 0)
+        assert (save_score["bytes_read"], save_score["bytes_written"]) == (0, 5)
+        assert profiler.report()["bytes_written"] == 5
+
+    def test_file_bodies_are_counted_from_their_position(self):
+        profiler = StageProfiler("ingestion", trace_memory=False)
+        client = s3_client()
+        track_client(client)
+        buffer = io.BytesIO(b"header" + b"0" * 1000)
+        buffer.seek(6)
+
+        with profiler.stage("save_test_data"):
+            client.put_object(Bucket="bucket", Key="x_test.npy", Body=buffer)
+
+        assert profiler.stages[0]["bytes_written"] == 1000
+        assert body_size("score") == 5
+
+    def test_nested_stage_rolls_up_into_parent(self):
+        profiler = StageProfiler("ingestion", trace_memory=True)
+
+        with profiler.stage("load_dataset"):
+            _count_received(response("100"))
+            parse = profiler.wrap("read_csv", lambda: bytearray(2 * 1024 * 1024))
+            parse()
+
+        read_csv, load_dataset = profiler.stages
+        assert read_csv["parent"] == "load_dataset"
+        assert load_dataset["bytes_read"] == 100
+        assert load_dataset["peak_traced_mb"] >= read_csv["peak_traced_mb"] >= 2
+        assert load_dataset["wall_seconds"] >= read_csv["wall_seconds"]
+
+    def test_report_summarizes_top_level_stages(self):
+        profiler = StageProfiler("ingestion", trace_memory=False)
+        with profiler.stage("load_dataset"):
+            with profiler.stage("read_csv"):
+                _count_received(response("10"))
+
+        report = profiler.report("failed", "boom")
+
+        assert report["pipeline"] == "ingestion"
+        assert report["status"] == "failed"
+        assert report["error"] == "boom"
+        assert report["bytes_read"] == 10
+        assert len(report["stages"]) == 2
+
+    def test_stage_is_recorded_when_it_raises(self):
+        profiler = StageProfiler("ingestion", trace_memory=False)
+
+        with pytest.raises(ValueError):
+            with profiler.stage("clean_df"):
+                raise ValueError("bad column")
+
+        assert profiler.stages[0]["name"] == "clean_df"
+
+    def test_reused_stage_is_reported_without_cost(self):
+        profiler = StageProfiler("ingestion", trace_memory=False)
+        with profiler.stage("load"):
+            pass
+        profiler.reuse("train", "abc")
+
+        report = profiler.report()
+
+        assert report["reused"] == ["train"]
+        assert report["stages"][-1]["fingerprint"] == "abc"
+        assert report["stages"][-1]["wall_seconds"] == 0.0
+
+class TestRunRecord:
+    def test_track_client_registers_idempotent_handlers(self):
+        mock_s3 = MagicMock()
+
+        track_client(mock_s3)
+
+        unique_ids = {call.kwargs["unique_id"] for call in mock_s3.meta.events.register.call_args_list}
+        assert unique_ids == {"profiling-bytes-written", "profiling-bytes-read"}
+
+    @patch("src.core.lambdas.profiling.get_logger")
+    def test_save_run_record_writes_json(self, mock_get_logger):
+        mock_s3 = MagicMock()
+        report = StageProfiler("ingestion", trace_memory=False).report()
+
+        key = save_run_record(mock_s3, report)
+
+        assert key == f"runs/ingestion/{report['run_id']}.json"
+        kwargs = mock_s3.put_object.call_args.kwargs
+        assert kwargs["Bucket"] == "local-ml-flow-data"
+        assert json.loads(kwargs["Body"])["run_id"] == report["run_id"]
+
+    @patch("src.core.lambdas.profiling.get_logger")
+    def test_save_run_record_failure_is_not_raised(self, mock_get_logger):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        mock_s3 = MagicMock()
+        mock_s3.put_object.side_effect = Exception("access denied")
+
+        assert save_run_record(mock_s3, StageProfiler("inference", trace_memory=False).report()) is None
+        mock_logger.warning.assert_called_once()
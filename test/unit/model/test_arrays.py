@@ -0,0 +1,59 @@
+import io
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from src.core.model.arrays import save_array, load_array, NPY_FORMAT
+
+def s3_returning(body: bytes):
+    s3 = MagicMock()
+    s3.get_object.return_value = {"Body": io.BytesIO(body)}
+    return s3
+
+class TestSaveArray:
+    def test_writes_npy_with_metadata(self):
+        s3 = MagicMock()
+        array = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+        size = save_array(s3, "bucket", "x_test.npy", array)
+
+        kwargs = s3.put_object.call_args[1]
+        assert kwargs["Key"] == "x_test.npy"
+        assert kwargs["Metadata"] == {"format": NPY_FORMAT, "dtype": "<f8", "shape": "3x2"}
+        assert isinstance(kwargs["Body"], io.BytesIO)
+        assert size == len(kwargs["Body"].getbuffer())
+        np.testing.assert_array_equal(np.load(kwargs["Body"], allow_pickle=False), array)
+
+    def test_accepts_pandas_series(self):
+        s3 = MagicMock()
+
+        save_array(s3, "bucket", "y_test.npy", pd.Series([1, 2, 3], dtype="int64"))
+
+        assert s3.put_object.call_args[1]["Metadata"]["shape"] == "3"
+
+    def test_rejects_object_arrays(self):
+        s3 = MagicMock()
+
+        with pytest.raises(ValueError):
+            save_array(s3, "bucket", "x_test.npy", np.array(["a", None], dtype=object))
+        s3.put_object.assert_not_called()
+
+class TestLoadArray:
+    def test_round_trip_is_memory_mapped(self, tmp_path):
+        saver = MagicMock()
+        array = np.random.default_rng(0).normal(size=(100, 6))
+        save_array(saver, "bucket", "x_test.npy", array)
+
+        loaded = load_array(s3_returning(saver.put_object.call_args[1]["Body"].getvalue()), "bucket", "x_test.npy", str(tmp_path))
+
+        assert isinstance(loaded, np.memmap)
+        assert not loaded.flags.writeable
+        np.testing.assert_array_equal(loaded, array)
+        assert (tmp_path / "x_test.npy").exists()
+
+    def test_refuses_pickled_payloads(self, tmp_path):
+        buffer = io.BytesIO()
+        np.save(buffer, np.array([{"a": 1}], dtype=object), allow_pickle=True)
+
+        with pytest.raises(ValueError):
+            load_array(s3_returning(buffer.getvalue()), "bucket", "x_test.npy", str(tmp_path))
@@ -0,0 +1,93 @@
+import pytest
+import asyncio
+import numpy as np
+from unittest.mock import patch, MagicMock
+from src.core.model.batching import MicroBatcher, _batchers, prediction_batcher
+
+def double(rows):
+    return np.array([row["x"] * 2 for row in rows]), "etag"
+
+class TestMicroBatcher:
+    def run_concurrently(self, batcher, requests):
+        async def run():
+            return await asyncio.gather(*[batcher.submit(rows) for rows in requests], return_exceptions=True)
+        return asyncio.run(run())
+
+    def test_concurrent_requests_share_one_predict_call(self):
+        predict_fn = MagicMock(side_effect=double)
+        batcher = MicroBatcher(predict_fn, max_batch_rows=100, max_latency_ms=20)
+
+        results = self.run_concurrently(batcher, [[{"x": i}] for i in range(10)])
+
+        assert predict_fn.call_count == 1
+        assert [predictions.tolist() for predictions, _ in results] == [[i * 2] for i in range(10)]
+        assert batcher.stats()["avg_requests_per_batch"] == 10
+
+    def test_results_are_split_back_per_request(self):
+        batcher = MicroBatcher(double, max_batch_rows=100, max_latency_ms=20)
+
+        results = self.run_concurrently(batcher, [[{"x": 1}, {"x": 2}], [{"x": 3}], [{"x": 4}, {"x": 5}, {"x": 6}]])
+
+        assert [predictions.tolist() for predictions, _ in results] == [[2, 4], [6], [8, 10, 12]]
+        assert all(etag == "etag" for _, etag in results)
+
+    def test_full_batch_is_flushed_without_waiting(self):
+        predict_fn = MagicMock(side_effect=double)
+        batcher = MicroBatcher(predict_fn, max_batch_rows=4, max_latency_ms=10000)
+
+        results = self.run_concurrently(batcher, [[{"x": i}] for i in range(8)])
+
+        assert predict_fn.call_count == 2
+        assert len(results) == 8
+        assert batcher.stats()["full_batches"] == 2
+        assert batcher.stats()["avg_fill_ratio"] == 1.0
+
+    def test_failing_request_does_not_fail_the_batch(self):
+        def strict(rows):
+            if any("x" not in row for row in rows):
+                raise ValueError("missing feature column(s): ['x']")
+            return double(rows)
+
+        batcher = MicroBatcher(strict, max_batch_rows=100, max_latency_ms=20)
+
+        good, bad = self.run_concurrently(batcher, [[{"x": 1}], [{"y": 1}]])
+
+        assert good[0].tolist() == [2]
+        assert isinstance(bad, ValueError)
+
+    def test_stats_before_any_batch(self):
+        stats = MicroBatcher(double).stats()
+
+        assert stats["batches"] == 0
+        assert stats["avg_fill_ratio"] == 0.0
+
+
+@patch("src.core.model.batching.serving_version")
+class TestPredictionBatcher:
+    def test_aliases_of_one_version_share_a_batcher(self, mock_version):
+        mock_version.return_value = "v1"
+
+        latest = asyncio.run(prediction_batcher("latest"))
+        champion = asyncio.run(prediction_batcher("champion"))
+
+        assert latest is champion
+        assert list(_batchers) == ["v1"]
+        assert latest.predict_fn.keywords == {"ref": "v1"}
+
+    def test_unknown_ref_creates_no_batcher(self, mock_version):
+        mock_version.side_effect = LookupError("unknown model version or alias 'nope'")
+
+        for i in range(3):
+            with pytest.raises(LookupError):
+                asyncio.run(prediction_batcher(f"nope-{i}"))
+
+        assert _batchers == {}
+
+
+    @patch.dict("os.environ", {"batch_max_models": "2"})
+    def test_least_recently_used_versions_are_evicted(self, mock_version):
+        for version in ("v1", "v2", "v1", "v3"):
+            mock_version.return_value = version
+            asyncio.run(prediction_batcher("latest"))
+
+        assert list(_batchers) == ["v1", "v3"]
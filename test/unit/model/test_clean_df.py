@@ -1,6 +1,8 @@
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
+from src.config.logger import lazy
 from src.core.model.conversion import clean_df
 
 class TestCleanDf:
@@ -137,4 +139,81 @@ class TestCleanDf:
         
         result = clean_df(df)
         
-        assert isinstance(result, pd.DataFrame)
\ No newline at end of file
+        assert isinstance(result, pd.DataFrame)
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_encodes_binary_columns_to_int8(self, mock_get_logger, sample_dataframe):
+        result = clean_df(sample_dataframe)
+        
+        assert result["mainroad"].dtype == "int8"
+        assert result["mainroad"].tolist() == [1, 0, 1]
+        assert result["prefarea"].tolist() == [0, 1, 0]
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_binary_dtype_can_be_bool(self, mock_get_logger, sample_dataframe):
+        result = clean_df(sample_dataframe, binary_dtype="bool")
+        
+        assert result["guestroom"].dtype == bool
+        assert result["guestroom"].tolist() == [False, True, False]
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_encodes_furnishingstatus_as_category(self, mock_get_logger, sample_dataframe):
+        sample_dataframe["furnishingstatus"] = ["furnished", "unfurnished", "semi-furnished"]
+        
+        result = clean_df(sample_dataframe)
+        
+        assert isinstance(result["furnishingstatus"].dtype, pd.CategoricalDtype)
+        assert result["furnishingstatus"].cat.codes.tolist() == [2, 0, 1]
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_accepts_already_encoded_values(self, mock_get_logger):
+        df = pd.DataFrame({column: values for column, values in zip(
+            ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"],
+            [[1, 0], ["1", "0"], [True, False], [0, 1], ["yes", "0"], [1.0, 0.0]]
+        )})
+        
+        result = clean_df(df)
+        
+        assert result.dtypes.unique().tolist() == ["int8"]
+        assert result.iloc[0].tolist() == [1, 1, 1, 0, 1, 1]
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_rejects_unknown_values(self, mock_get_logger, sample_dataframe):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        sample_dataframe.loc[1, "basement"] = "maybe"
+        
+        with pytest.raises(ValueError, match="basement"):
+            clean_df(sample_dataframe)
+        
+        mock_logger.error.assert_called_once()
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_rejects_unknown_categories(self, mock_get_logger, sample_dataframe):
+        sample_dataframe["furnishingstatus"] = ["furnished", "luxury", "furnished"]
+        
+        with pytest.raises(ValueError, match="furnishingstatus"):
+            clean_df(sample_dataframe)
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_inplace_reuses_the_frame(self, mock_get_logger, sample_dataframe):
+        result = clean_df(sample_dataframe, inplace=True)
+        
+        assert result is sample_dataframe
+        assert sample_dataframe["mainroad"].dtype == "int8"
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_shares_untouched_columns(self, mock_get_logger, sample_dataframe):
+        result = clean_df(sample_dataframe)
+        
+        assert np.shares_memory(result["area"].to_numpy(), sample_dataframe["area"].to_numpy())
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_clean_df_debug_payload_is_lazy(self, mock_get_logger, sample_dataframe):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        
+        clean_df(sample_dataframe)
+        
+        _, payload = mock_logger.debug.call_args_list[1].args
+        assert isinstance(payload, lazy)
+        assert "mainroad" in str(payload)
@@ -0,0 +1,219 @@
+import io
+import itertools
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+from sklearn.linear_model import LinearRegression
+from src.core.model.registry import MANIFEST_ATTEMPTS, MANIFEST_KEY, empty_manifest, load_manifest, resolve, register_model, set_alias
+
+def manifest_store(manifest: dict = None) -> MagicMock:
+    # honours IfMatch / IfNoneMatch like s3 does, the etag changes with every write
+    store, etags, writes = {}, {}, itertools.count(1)
+    if manifest is not None:
+        store[MANIFEST_KEY] = json.dumps(manifest).encode()
+        etags[MANIFEST_KEY] = '"0"'
+
+    def get_object(Bucket, Key):
+        if Key not in store:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(store[Key]), "ETag": etags[Key]}
+
+    def put_object(Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        if (IfMatch is not None and etags.get(Key) != IfMatch) or (IfNoneMatch == "*" and Key in store):
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        store[Key] = Body
+        etags[Key] = f'"{next(writes)}"'
+
+    mock_s3 = MagicMock()
+    mock_s3.get_object.side_effect = get_object
+    mock_s3.put_object.side_effect = put_object
+    mock_s3.store = store
+    mock_s3.etags = etags
+    return mock_s3
+
+def race_once(mock_s3, manifest: dict) -> None:
+    # another writer replaces the manifest right after the first read
+    read = mock_s3.get_object.side_effect
+    raced = []
+
+    def get_object(Bucket, Key):
+        response = read(Bucket=Bucket, Key=Key)
+        if not raced:
+            raced.append(Key)
+            mock_s3.store[Key] = json.dumps(manifest).encode()
+            mock_s3.etags[Key] = '"other-writer"'
+        return response
+
+    mock_s3.get_object.side_effect = get_object
+
+class TestManifest:
+    def test_missing_manifest_is_empty(self):
+        assert load_manifest(manifest_store()) == empty_manifest()
+
+    def test_other_errors_are_raised(self):
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = ClientError({"Error": {"Code": "AccessDenied"}}, "GetObject")
+
+        with pytest.raises(ClientError):
+            load_manifest(mock_s3)
+
+    def test_resolve_alias_and_version(self):
+        manifest = {"versions": {"v1": {}, "v2": {}}, "aliases": {"latest": "v2"}}
+
+        assert resolve(manifest, "latest") == "v2"
+        assert resolve(manifest, "v1") == "v1"
+        assert resolve(manifest, "champion") is None
+
+class TestRegisterModel:
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_writes_versioned_artifacts(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store()
+        mock_config.return_value = {"s3": mock_s3}
+
+        version = register_model(LinearRegression(), scaler="scaler")
+
+        keys = [call.kwargs["filename"] for call in mock_save_model.call_args_list]
+        assert keys == [f"registry/{version}/model.joblib", f"registry/{version}/scaler.joblib"]
+
+    @patch.dict("os.environ", {"model_format": "npz", "model_compression": "zstd-3"})
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_records_serialization(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store()
+        mock_config.return_value = {"s3": mock_s3}
+
+        version = register_model(LinearRegression(), scaler="scaler")
+
+        manifest = json.loads(mock_s3.store[MANIFEST_KEY])
+        assert manifest["versions"][version]["serialization"] == {"format": "npz", "compression": "zstd-3"}
+        assert manifest["versions"][version]["artifacts"]["model"] == f"registry/{version}/model.npz.zst"
+        assert mock_save_model.call_args.kwargs["spec"] == {"format": "npz", "compression": "zstd-3"}
+
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_updates_manifest_and_aliases(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store({"versions": {"old": {}}, "aliases": {"latest": "old", "champion": "old"}})
+        mock_config.return_value = {"s3": mock_s3}
+
+        version = register_model(LinearRegression(), metadata={"rmse": 1.5})
+
+        manifest = json.loads(mock_s3.store[MANIFEST_KEY])
+        assert set(manifest["versions"]) == {"old", version}
+        assert manifest["versions"][version]["metadata"] == {"estimator": "LinearRegression", "rmse": 1.5}
+        assert manifest["aliases"] == {"latest": version, "champion": "old"}
+
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_concurrent_registration_is_not_lost(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store({"versions": {"old": {}}, "aliases": {"latest": "old"}})
+        race_once(mock_s3, {"versions": {"old": {}, "other": {}}, "aliases": {"latest": "other"}})
+        mock_config.return_value = {"s3": mock_s3}
+
+        version = register_model(LinearRegression())
+
+        manifest = json.loads(mock_s3.store[MANIFEST_KEY])
+        assert set(manifest["versions"]) == {"old", "other", version}
+        assert manifest["aliases"]["latest"] == version
+        assert mock_s3.put_object.call_count == 2
+        assert mock_s3.put_object.call_args.kwargs["IfMatch"] == '"other-writer"'
+
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_first_registration_only_creates_the_manifest(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store()
+        mock_config.return_value = {"s3": mock_s3}
+
+        register_model(LinearRegression())
+
+        assert mock_s3.put_object.call_args.kwargs["IfNoneMatch"] == "*"
+
+    @patch("src.core.model.registry.time.sleep")
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_gives_up_after_repeated_conflicts(self, mock_config, mock_get_logger, mock_save_model, mock_sleep):
+        mock_s3 = manifest_store({"versions": {}, "aliases": {}})
+        mock_s3.put_object.side_effect = ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        mock_config.return_value = {"s3": mock_s3}
+
+        with pytest.raises(ClientError):
+            register_model(LinearRegression())
+
+        assert mock_s3.put_object.call_count == MANIFEST_ATTEMPTS
+
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_keeps_legacy_keys_in_sync(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store()
+        mock_config.return_value = {"s3": mock_s3}
+
+        version = register_model(LinearRegression(), scaler="scaler")
+
+        copies = {call.kwargs["Key"]: call.kwargs["CopySource"]["Key"] for call in mock_s3.copy_object.call_args_list}
+        assert copies == {"model.joblib": f"registry/{version}/model.joblib", "scaler.joblib": f"registry/{version}/scaler.joblib"}
+
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_without_legacy_copy(self, mock_config, mock_get_logger, mock_save_model):
+        mock_s3 = manifest_store()
+        mock_config.return_value = {"s3": mock_s3}
+
+        register_model(LinearRegression(), legacy_copy=False)
+
+        mock_s3.copy_object.assert_not_called()
+
+    @patch("src.core.model.registry.save_model")
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_register_logs_and_raises_on_error(self, mock_config, mock_get_logger, mock_save_model):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        mock_config.return_value = {"s3": manifest_store()}
+        mock_save_model.side_effect = Exception("upload failed")
+
+        with pytest.raises(Exception, match="upload failed"):
+            register_model(LinearRegression())
+
+        mock_logger.error.assert_called_once()
+
+class TestSetAlias:
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_set_alias_moves_pointer(self, mock_config, mock_get_logger):
+        mock_s3 = manifest_store({"versions": {"v1": {}, "v2": {}}, "aliases": {"latest": "v2"}})
+        mock_config.return_value = {"s3": mock_s3}
+
+        manifest = set_alias("champion", "v1")
+
+        assert manifest["aliases"] == {"latest": "v2", "champion": "v1"}
+        assert json.loads(mock_s3.store[MANIFEST_KEY])["aliases"]["champion"] == "v1"
+
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_set_alias_unknown_version_raises(self, mock_config, mock_get_logger):
+        mock_config.return_value = {"s3": manifest_store()}
+
+        with pytest.raises(KeyError):
+            set_alias("champion", "v9")
+
+    @patch("src.core.model.registry.get_logger")
+    @patch("src.core.model.registry.config")
+    def test_alias_move_keeps_a_concurrent_registration(self, mock_config, mock_get_logger):
+        mock_s3 = manifest_store({"versions": {"v1": {}}, "aliases": {"latest": "v1"}})
+        race_once(mock_s3, {"versions": {"v1": {}, "v2": {}}, "aliases": {"latest": "v2"}})
+        mock_config.return_value = {"s3": mock_s3}
+
+        set_alias("champion", "v1")
+
+        manifest = json.loads(mock_s3.store[MANIFEST_KEY])
+        assert set(manifest["versions"]) == {"v1", "v2"}
+        assert manifest["aliases"] == {"latest": "v2", "champion": "v1"}
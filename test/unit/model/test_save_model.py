@@ -1,13 +1,15 @@
+import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock
 from sklearn.linear_model import LinearRegression
 from src.core.model.save_model import save_model
+from src.core.model.serialization import deserialize
 
 class TestSaveModel:
     @pytest.fixture
     def mock_model(self):
         model = LinearRegression()
-        model.coef_ = [1.0, 2.0, 3.0]
+        model.coef_ = np.array([1.0, 2.0, 3.0])
         model.intercept_ = 0.5
         return model
 
@@ -114,3 +116,17 @@ class TestSaveModel:
         
         call_kwargs = mock_s3.put_object.call_args[1]
         assert isinstance(call_kwargs["Body"], bytes)
+
+    @patch("src.core.model.save_model.get_logger")
+    @patch("src.core.model.save_model.config")
+    def test_save_model_records_serialization_metadata(self, mock_config, mock_get_logger, mock_model):
+        mock_s3 = MagicMock()
+        mock_config.return_value = {"s3": mock_s3, "lambda": MagicMock()}
+        spec = {"format": "npz", "compression": "zstd-3"}
+
+        result = save_model(mock_model, filename="model.npz.zst", spec=spec)
+
+        call_kwargs = mock_s3.put_object.call_args[1]
+        assert result == spec
+        assert call_kwargs["Metadata"] == spec
+        assert deserialize(call_kwargs["Body"], call_kwargs["Metadata"]).intercept_ == 0.5
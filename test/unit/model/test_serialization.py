@@ -0,0 +1,97 @@
+import io
+import zlib
+import joblib
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+from src.core.model.serialization import artifact_suffix, deserialize, parse_compression, serialization_spec, serialize
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.normal(size=(200, 4)), columns=["a", "b", "c", "d"])
+    y = x.to_numpy() @ np.array([1.0, -2.0, 0.5, 3.0]) + 10
+    scaler = StandardScaler().fit(x)
+    model = LinearRegression().fit(scaler.transform(x), y)
+    return model, scaler, x
+
+class TestSpec:
+    def test_defaults_to_uncompressed_joblib(self):
+        with patch.dict("os.environ", {}, clear=True):
+            assert serialization_spec() == {"format": "joblib", "compression": "none"}
+
+    def test_reads_environment(self):
+        with patch.dict("os.environ", {"model_format": "npz", "model_compression": "zstd"}):
+            assert serialization_spec() == {"format": "npz", "compression": "zstd-3"}
+
+    def test_explicit_level(self):
+        assert parse_compression("zlib-9") == ("zlib", 9)
+        assert parse_compression(None) == ("none", None)
+
+    def test_rejects_unknown_values(self):
+        with pytest.raises(ValueError):
+            serialization_spec(fmt="onnx")
+        with pytest.raises(ValueError):
+            parse_compression("brotli")
+
+    def test_suffix_reflects_format_and_codec(self):
+        assert artifact_suffix({"format": "joblib", "compression": "none"}) == ".joblib"
+        assert artifact_suffix({"format": "npz", "compression": "zstd-3"}) == ".npz.zst"
+
+class TestRoundTrip:
+    @pytest.mark.parametrize("fmt", ["joblib", "npz"])
+    @pytest.mark.parametrize("compression", ["none", "zlib-3", "lz4", "zstd-3"])
+    def test_predictions_survive(self, fitted, fmt, compression):
+        if compression == "lz4":
+            pytest.importorskip("lz4")
+        model, scaler, x = fitted
+        spec = {"format": fmt, "compression": compression}
+
+        loaded_model = deserialize(serialize(model, spec), spec)
+        loaded_scaler = deserialize(serialize(scaler, spec), spec)
+
+        np.testing.assert_allclose(loaded_model.predict(loaded_scaler.transform(x)), model.predict(scaler.transform(x)))
+        assert list(loaded_scaler.feature_names_in_) == ["a", "b", "c", "d"]
+
+    def test_missing_metadata_reads_plain_joblib(self, fitted):
+        model, _, _ = fitted
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+
+        np.testing.assert_array_equal(deserialize(buffer.getvalue()).coef_, model.coef_)
+
+    def test_compressed_artifact_is_smaller(self):
+        model = Ridge().fit(np.zeros((10, 5000)), np.zeros(10))
+        plain = serialize(model, {"format": "joblib", "compression": "none"})
+
+        assert len(serialize(model, {"format": "joblib", "compression": "zlib-6"})) < len(plain) / 10
+
+class TestNpz:
+    def test_contains_no_pickle(self, fitted):
+        model, _, _ = fitted
+        data = serialize(model, {"format": "npz", "compression": "none"})
+
+        with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+            assert all(archive[name].dtype != object for name in archive.files)
+
+    def test_rejects_unsupported_estimators(self):
+        with pytest.raises(ValueError):
+            serialize(DecisionTreeRegressor().fit([[0], [1]], [0, 1]), {"format": "npz", "compression": "none"})
+
+    def test_rejects_unknown_estimator_in_header(self):
+        buffer = io.BytesIO()
+        header = b'{"estimator": "DecisionTreeRegressor", "params": {}, "scalars": {}, "text_arrays": []}'
+        np.savez(buffer, __header__=np.frombuffer(header, dtype=np.uint8))
+
+        with pytest.raises(ValueError, match="unsupported estimator"):
+            deserialize(buffer.getvalue(), {"format": "npz", "compression": "none"})
+
+    def test_zlib_metadata_uses_zlib(self, fitted):
+        model, _, _ = fitted
+        data = serialize(model, {"format": "npz", "compression": "zlib-6"})
+
+        assert zlib.decompress(data)[:2] == b"PK"
@@ -0,0 +1,214 @@
+import pytest
+import io
+import threading
+import joblib
+import numpy as np
+import pandas as pd
+from unittest.mock import patch, MagicMock
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from botocore.exceptions import ClientError
+from src.core.model.serving import ArtifactCache, prepare_features, predict_rows, resolve_artifacts, serving_version
+from src.core.model.serialization import serialize
+from src.core.model.train_test_split import FEATURE_COLUMNS
+
+def dump(artifact) -> bytes:
+    buffer = io.BytesIO()
+    joblib.dump(artifact, buffer)
+    return buffer.getvalue()
+
+class TestArtifactCache:
+    @pytest.fixture
+    def mock_s3(self):
+        mock_s3 = MagicMock()
+        mock_s3.head_object.return_value = {"ETag": '"v1"'}
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(dump({"version": 1})), "ETag": '"v1"'}
+        return mock_s3
+
+    def test_load_downloads_once_while_etag_is_unchanged(self, mock_s3):
+        cache = ArtifactCache(revalidate_seconds=0, max_bytes=10 ** 6)
+
+        first, etag = cache.load(mock_s3, "bucket", "model.joblib")
+        second, _ = cache.load(mock_s3, "bucket", "model.joblib")
+
+        assert first == {"version": 1}
+        assert second is first
+        assert etag == '"v1"'
+        assert mock_s3.get_object.call_count == 1
+        assert mock_s3.head_object.call_count == 2
+
+    def test_load_uses_serialization_metadata(self, mock_s3):
+        spec = {"format": "npz", "compression": "zstd-3"}
+        model = LinearRegression().fit([[0.0], [1.0]], [1.0, 3.0])
+        mock_s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(serialize(model, spec)), "ETag": '"v1"', "Metadata": spec}
+        cache = ArtifactCache(revalidate_seconds=0, max_bytes=10 ** 6)
+
+        loaded, _ = cache.load(mock_s3, "bucket", "registry/v1/model.npz.zst")
+
+        assert loaded.predict([[2.0]])[0] == pytest.approx(5.0)
+
+    def test_load_reloads_when_etag_changes(self, mock_s3):
+        cache = ArtifactCache(revalidate_seconds=0, max_bytes=10 ** 6)
+        cache.load(mock_s3, "bucket", "model.joblib")
+        mock_s3.head_object.return_value = {"ETag": '"v2"'}
+
+        cache.load(mock_s3, "bucket", "model.joblib")
+
+        assert mock_s3.get_object.call_count == 2
+
+    def test_load_skips_revalidation_within_interval(self, mock_s3):
+        cache = ArtifactCache(revalidate_seconds=60, max_bytes=10 ** 6)
+
+        cache.load(mock_s3, "bucket", "model.joblib")
+        cache.load(mock_s3, "bucket", "model.joblib")
+
+        assert mock_s3.head_object.call_count == 1
+
+    def test_immutable_artifacts_are_never_revalidated(self, mock_s3):
+        cache = ArtifactCache(revalidate_seconds=0, max_bytes=10 ** 6)
+
+        cache.load(mock_s3, "bucket", "registry/v1/model.joblib", immutable=True)
+        cache.load(mock_s3, "bucket", "registry/v1/model.joblib", immutable=True)
+
+        assert mock_s3.head_object.call_count == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_memory_budget_evicts_least_recently_used_version(self, mock_s3):
+        size = len(dump({"version": 1}))
+        cache = ArtifactCache(revalidate_seconds=60, max_bytes=size * 2)
+        cache.load(mock_s3, "bucket", "v1", immutable=True)
+        cache.load(mock_s3, "bucket", "v2", immutable=True)
+        cache.load(mock_s3, "bucket", "v1", immutable=True)
+
+        cache.load(mock_s3, "bucket", "v3", immutable=True)
+
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= size * 2
+        cache.load(mock_s3, "bucket", "v1", immutable=True)
+        assert mock_s3.get_object.call_count == 3
+
+    def test_missing_artifact_returns_none_when_allowed(self, mock_s3):
+        mock_s3.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        cache = ArtifactCache(revalidate_seconds=60, max_bytes=10 ** 6)
+
+        assert cache.load(mock_s3, "bucket", "manifest.json", missing_ok=True) == (None, None)
+        with pytest.raises(ClientError):
+            ArtifactCache(revalidate_seconds=60, max_bytes=10 ** 6).load(mock_s3, "bucket", "manifest.json")
+
+    def test_slow_load_does_not_block_other_keys(self, mock_s3):
+        started, release = threading.Event(), threading.Event()
+
+        def get_object(Bucket, Key):
+            if Key == "slow.joblib":
+                started.set()
+                release.wait(5)
+            return {"Body": io.BytesIO(dump({"key": Key})), "ETag": '"v1"'}
+
+        mock_s3.get_object.side_effect = get_object
+        cache = ArtifactCache(revalidate_seconds=60, max_bytes=10 ** 6)
+        slow = threading.Thread(target=cache.load, args=(mock_s3, "bucket", "slow.joblib"))
+        slow.start()
+        started.wait(5)
+
+        fast, _ = cache.load(mock_s3, "bucket", "fast.joblib")
+        stats = cache.stats()
+        release.set()
+        slow.join(5)
+
+        assert fast == {"key": "fast.joblib"}
+        assert stats["loads"] == 1
+        assert cache.stats()["loads"] == 2
+
+    def test_concurrent_loads_of_one_key_download_once(self, mock_s3):
+        cache = ArtifactCache(revalidate_seconds=60, max_bytes=10 ** 6)
+        threads = [threading.Thread(target=cache.load, args=(mock_s3, "bucket", "model.joblib")) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert mock_s3.get_object.call_count == 1
+
+
+class TestResolveArtifacts:
+    @pytest.fixture
+    def manifest(self):
+        return {
+            "versions": {
+                "v1": {"artifacts": {"model": "registry/v1/model.joblib", "scaler": "registry/v1/scaler.joblib"}},
+                "v2": {"artifacts": {"model": "registry/v2/model.joblib", "scaler": "registry/v2/scaler.joblib"}}
+            },
+            "aliases": {"latest": "v2", "champion": "v1"}
+        }
+
+    @patch("src.core.model.serving.artifact_cache")
+    def test_resolves_alias_to_versioned_keys(self, mock_artifact_cache, manifest):
+        mock_artifact_cache.return_value.load.return_value = (manifest, '"m1"')
+
+        version, artifacts, immutable = resolve_artifacts(MagicMock(), "champion")
+
+        assert version == "v1"
+        assert artifacts["model"] == "registry/v1/model.joblib"
+        assert immutable is True
+
+    @patch("src.core.model.serving.artifact_cache")
+    def test_latest_falls_back_to_legacy_keys_without_manifest(self, mock_artifact_cache):
+        mock_artifact_cache.return_value.load.return_value = (None, None)
+
+        version, artifacts, immutable = resolve_artifacts(MagicMock(), "latest")
+
+        assert version is None
+        assert artifacts == {"model": "model.joblib", "scaler": "scaler.joblib"}
+        assert immutable is False
+
+    @patch("src.core.model.serving.artifact_cache")
+    def test_unknown_ref_raises_lookup_error(self, mock_artifact_cache, manifest):
+        mock_artifact_cache.return_value.load.return_value = (manifest, '"m1"')
+
+        with pytest.raises(LookupError):
+            resolve_artifacts(MagicMock(), "v9")
+
+    @patch("src.core.model.serving.config")
+    @patch("src.core.model.serving.artifact_cache")
+    def test_serving_version_keeps_legacy_models_on_latest(self, mock_artifact_cache, mock_config, manifest):
+        mock_artifact_cache.return_value.load.return_value = (manifest, '"m1"')
+        assert serving_version("champion") == "v1"
+
+        mock_artifact_cache.return_value.load.return_value = (None, None)
+        assert serving_version("latest") == "latest"
+
+
+class TestPredictRows:
+    @pytest.fixture
+    def fitted(self):
+        np.random.seed(42)
+        x = pd.DataFrame(np.random.randint(0, 2, size=(50, 6)), columns=FEATURE_COLUMNS)
+        y = x.to_numpy() @ np.arange(1, 7) * 1000 + 5000
+        scaler = StandardScaler().fit(x)
+        model = LinearRegression().fit(scaler.transform(x), y)
+        return model, scaler
+
+    def row(self, flags):
+        return dict(zip(FEATURE_COLUMNS, ["yes" if flag else "no" for flag in flags]), price=0, area=1000)
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_prepare_features_encodes_yes_no(self, mock_get_logger):
+        features = prepare_features([self.row([1, 0, 1, 0, 1, 0])])
+
+        assert list(features.columns) == FEATURE_COLUMNS
+        assert features.astype(int).iloc[0].tolist() == [1, 0, 1, 0, 1, 0]
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_prepare_features_rejects_missing_columns(self, mock_get_logger):
+        with pytest.raises(ValueError):
+            prepare_features([{"mainroad": "yes"}])
+
+    @patch("src.core.model.conversion.get_logger")
+    def test_predict_rows_matches_training_pipeline(self, mock_get_logger, fitted):
+        model, scaler = fitted
+        rows = [self.row([1, 1, 1, 1, 1, 1]), self.row([0, 0, 0, 0, 0, 0])]
+
+        predictions = predict_rows(model, scaler, rows)
+
+        np.testing.assert_array_almost_equal(predictions, [26000, 5000])
@@ -0,0 +1,98 @@
+import io
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from src.core.model.conversion import clean_df
+from src.core.model.streaming import SufficientStatistics, chunk_rows_for_budget, iter_chunks, stream_fit, holdout_mask
+from src.core.model.train_test_split import FEATURE_COLUMNS
+
+@pytest.fixture
+def housing():
+    np.random.seed(0)
+    n = 3000
+    frame = pd.DataFrame({column: np.random.choice(["yes", "no"], n) for column in FEATURE_COLUMNS})
+    encoded = (frame == "yes").astype(int).to_numpy()
+    frame.insert(0, "price", (encoded @ np.array([5, 3, 2, 1, 4, 6]) * 100000 + np.random.randint(0, 50000, n)).astype("int64"))
+    frame["area"] = np.random.randint(1000, 9000, n)
+    return frame
+
+def csv_body(frame: pd.DataFrame) -> io.BytesIO:
+    return io.BytesIO(frame.to_csv(index=False).encode())
+
+class TestHoldoutMask:
+    def test_split_does_not_depend_on_chunking(self):
+        whole = holdout_mask(0, 10000)
+        chunked = np.concatenate([holdout_mask(start, 700) for start in range(0, 10000, 700)])[:10000]
+
+        assert (whole == chunked).all()
+
+    def test_split_ratio_and_seed(self):
+        mask = holdout_mask(0, 100000, test_size=0.2)
+
+        assert abs(mask.mean() - 0.2) < 0.01
+        assert not (mask == holdout_mask(0, 100000, test_size=0.2, seed=7)).all()
+
+class TestChunking:
+    def test_chunk_rows_follow_memory_budget(self):
+        sample = pd.DataFrame({"a": np.zeros(1000, dtype="int64")})
+
+        small = chunk_rows_for_budget(sample, budget_bytes=8 * 1024 * 1024)
+        large = chunk_rows_for_budget(sample, budget_bytes=80 * 1024 * 1024)
+
+        assert large == pytest.approx(small * 10, rel=0.01)
+        assert chunk_rows_for_budget(sample, budget_bytes=1) == 1000
+
+    @patch("src.core.model.streaming.get_logger")
+    def test_iter_chunks_reads_every_row(self, mock_get_logger, housing):
+        chunks = list(iter_chunks(csv_body(housing), budget_bytes=20_000, usecols=["price", "mainroad"]))
+
+        assert len(chunks) > 2
+        assert len(chunks[0]) == 1000
+        assert sum(len(chunk) for chunk in chunks) == len(housing)
+        assert list(chunks[1].columns) == ["price", "mainroad"]
+
+class TestStreamFit:
+    @patch("src.core.model.streaming.get_logger")
+    @patch("src.core.model.conversion.get_logger")
+    def test_matches_in_memory_fit_on_the_same_rows(self, mock_clean_logger, mock_get_logger, housing):
+        model, scaler, x_test, y_test = stream_fit(csv_body(housing), budget_bytes=100_000)
+
+        encoded = clean_df(housing)
+        train = encoded[~holdout_mask(0, len(encoded))]
+        reference_scaler = StandardScaler().fit(train[FEATURE_COLUMNS])
+        reference = LinearRegression().fit(reference_scaler.transform(train[FEATURE_COLUMNS]), train["price"])
+
+        assert np.allclose(scaler.mean_, reference_scaler.mean_)
+        assert np.allclose(scaler.scale_, reference_scaler.scale_)
+        assert np.allclose(model.coef_, reference.coef_)
+        assert model.intercept_ == pytest.approx(reference.intercept_)
+        assert len(x_test) == len(y_test) == holdout_mask(0, len(housing)).sum()
+
+    @patch("src.core.model.streaming.get_logger")
+    @patch("src.core.model.conversion.get_logger")
+    def test_streamed_model_predicts_like_in_memory_model(self, mock_clean_logger, mock_get_logger, housing):
+        model, scaler, x_test, y_test = stream_fit(csv_body(housing), budget_bytes=100_000)
+
+        encoded = clean_df(housing)
+        train = encoded[~holdout_mask(0, len(encoded))]
+        reference = LinearRegression().fit(scaler.transform(train[FEATURE_COLUMNS]), train["price"])
+
+        assert np.allclose(model.predict(x_test), reference.predict(x_test))
+
+    def test_constant_column_gets_minimum_norm_solution(self):
+        statistics = SufficientStatistics(2)
+        x = pd.DataFrame({"a": [0, 1, 0, 1, 1], "b": [1, 1, 1, 1, 1]})
+        y = pd.Series([1.0, 3.0, 1.0, 3.0, 3.0])
+        statistics.update(x, y)
+
+        model, scaler = statistics.fit()
+
+        assert np.allclose(model.predict(scaler.transform(x)), y)
+        assert model.coef_[1] == pytest.approx(0)
+
+    def test_fit_without_rows_raises(self):
+        with pytest.raises(ValueError):
+            SufficientStatistics(6).fit()
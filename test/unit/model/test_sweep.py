@@ -0,0 +1,126 @@
+import os
+import threading
+import pytest
+import numpy as np
+from unittest.mock import patch
+from src.core.model.sweep import VALIDATION_PARAMS, _worker, attached_arrays, best_candidate, default_candidates, share_arrays, sweep, sweep_workers
+
+CANDIDATES = [
+    {"estimator": "LinearRegression", "params": {}},
+    {"estimator": "Ridge", "params": {"alpha": 1000.0}},
+    {"estimator": "Lasso", "params": {"alpha": 5.0}}
+]
+
+@pytest.fixture
+def split_arrays():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(240, 6))
+    y = x @ np.array([5.0, 3.0, 2.0, 1.0, 4.0, 6.0]) + rng.normal(scale=0.1, size=240)
+    return x, y
+
+class TestSharedArrays:
+    def test_arrays_round_trip_through_one_block(self):
+        arrays = {"x": np.arange(12, dtype=np.float64).reshape(4, 3), "y": np.arange(5, dtype=np.float64)}
+        block, layout = share_arrays(arrays)
+        try:
+            views = attached_arrays(block, layout)
+            np.testing.assert_array_equal(views["x"], arrays["x"])
+            np.testing.assert_array_equal(views["y"], arrays["y"])
+            assert all(start % 64 == 0 for start, _ in layout.values())
+            del views
+        finally:
+            block.close()
+            block.unlink()
+
+class TestSweep:
+    def test_results_are_ranked_by_r2_with_timings(self, split_arrays):
+        results = sweep(*split_arrays, candidates=CANDIDATES, workers=1)
+
+        assert [result["estimator"] for result in results][0] == "LinearRegression"
+        assert [result["r2"] for result in results] == sorted([result["r2"] for result in results], reverse=True)
+        assert all(result["fit_seconds"] >= 0 and result["predict_seconds"] >= 0 for result in results)
+
+    def test_process_pool_matches_in_process_results(self, split_arrays):
+        in_process = sweep(*split_arrays, candidates=CANDIDATES, workers=1)
+        pooled = sweep(*split_arrays, candidates=CANDIDATES, workers=2)
+
+        assert [(result["estimator"], result["r2"]) for result in pooled] == [(result["estimator"], result["r2"]) for result in in_process]
+
+    def test_concurrent_in_process_sweeps_keep_their_own_data(self, split_arrays):
+        x_train, y_train = split_arrays
+        # the second sweep fits a target no linear model can explain, its scores must stay its own
+        noise = np.random.default_rng(1).normal(size=len(y_train))
+        results = {}
+
+        def run(name, y):
+            results[name] = sweep(x_train, y, candidates=CANDIDATES[:1] * 20, workers=1)
+
+        threads = [threading.Thread(target=run, args=("signal", y_train)), threading.Thread(target=run, args=("noise", noise))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        assert all(result["r2"] > 0.99 for result in results["signal"])
+        assert all(result["r2"] < 0.5 for result in results["noise"])
+        assert _worker == {}
+
+    def test_failing_candidate_is_reported_not_raised(self, split_arrays):
+        results = sweep(*split_arrays, candidates=CANDIDATES + [{"estimator": "Ridge", "params": {"alpha": "high"}}], workers=1)
+
+        failed = results[-1]
+        assert failed["r2"] is None
+        assert failed["error"]
+        assert best_candidate(results)["estimator"] == "LinearRegression"
+
+    def test_candidates_are_scored_on_a_validation_slice_of_the_training_data(self, split_arrays):
+        x_train, y_train = split_arrays
+        fitted = []
+
+        class Recorder:
+            def fit(self, x, y):
+                fitted.append(len(x))
+                return self
+
+            def predict(self, x):
+                fitted.append(len(x))
+                return np.zeros(len(x))
+
+        with patch("src.core.model.sweep.build", return_value=Recorder()):
+            sweep(x_train, y_train, candidates=CANDIDATES[:1], workers=1)
+
+        validation_rows = int(np.ceil(len(x_train) * VALIDATION_PARAMS["test_size"]))
+        assert fitted == [len(x_train) - validation_rows, validation_rows]
+
+    def test_best_candidate_needs_one_success(self):
+        with pytest.raises(ValueError):
+            best_candidate([{"r2": None, "error": "boom"}])
+
+    def test_shared_block_is_released(self, split_arrays):
+        before = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+        sweep(*split_arrays, candidates=CANDIDATES, workers=2)
+
+        after = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+        assert after <= before
+
+    def test_workers_default_to_env_then_cpu_count(self):
+        with patch.dict("os.environ", {"sweep_workers": "3"}):
+            assert sweep_workers() == 3
+        assert sweep_workers(2) == 2
+
+    def test_lambda_defaults_to_one_worker(self):
+        with patch.dict("os.environ", {"AWS_LAMBDA_FUNCTION_NAME": "ingestion"}), patch("src.core.model.sweep.os.cpu_count", return_value=6):
+            assert sweep_workers() == 1
+
+    def test_falls_back_in_process_without_shared_memory(self, split_arrays):
+        with patch("src.core.model.sweep.share_arrays", side_effect=FileNotFoundError(2, "No such file or directory", "/dev/shm")):
+            results = sweep(*split_arrays, candidates=CANDIDATES, workers=2)
+
+        in_process = sweep(*split_arrays, candidates=CANDIDATES, workers=1)
+        assert [(result["estimator"], result["r2"]) for result in results] == [(result["estimator"], result["r2"]) for result in in_process]
+
+    def test_default_grid_covers_linear_and_ensembles(self):
+        estimators = {candidate["estimator"] for candidate in default_candidates()}
+
+        assert {"LinearRegression", "Ridge", "Lasso", "ElasticNet", "RandomForestRegressor", "GradientBoostingRegressor"} <= estimators
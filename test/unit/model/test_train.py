@@ -2,7 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 from unittest.mock import patch, MagicMock
-from sklearn.linear_model import LinearRegression
+from sklearn.linear_model import LinearRegression, Ridge
 from src.core.model.train import train
 
 class TestTrain:
@@ -62,20 +62,35 @@ class TestTrain:
         assert len(model.coef_) == 6
 
     @patch("src.core.model.train.get_logger")
-    @patch("src.core.model.train.LinearRegression")
-    def test_train_logs_error_on_fit_failure(self, mock_linear_regression, mock_get_logger):
+    def test_train_logs_error_on_fit_failure(self, mock_get_logger):
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
         
         # Mock LinearRegression to raise exception on fit
         mock_model = MagicMock()
         mock_model.fit.side_effect = Exception("Fit error")
-        mock_linear_regression.return_value = mock_model
+        mock_linear_regression = MagicMock(return_value=mock_model)
         
         x_train = np.random.rand(80, 6)
         y_train = np.random.rand(80)
         
-        with pytest.raises(Exception):
-            train(x_train=x_train, y_train=y_train)
+        with patch.dict("src.core.model.train.ESTIMATORS", {"LinearRegression": mock_linear_regression}):
+            with pytest.raises(Exception):
+                train(x_train=x_train, y_train=y_train)
         
         mock_logger.error.assert_called_once()
+
+    @patch("src.core.model.train.get_logger")
+    def test_train_builds_requested_estimator(self, mock_get_logger, sample_training_data):
+        x_train, y_train = sample_training_data
+
+        result = train(x_train=x_train, y_train=y_train, params={"alpha": 10.0}, estimator="Ridge")
+
+        assert isinstance(result, Ridge)
+        assert result.alpha == 10.0
+
+    def test_train_rejects_unknown_estimator(self, sample_training_data):
+        x_train, y_train = sample_training_data
+
+        with pytest.raises(ValueError):
+            train(x_train=x_train, y_train=y_train, estimator="SVR")
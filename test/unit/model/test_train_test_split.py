@@ -2,7 +2,8 @@ import pytest
 import pandas as pd
 import numpy as np
 from unittest.mock import patch, MagicMock
-from src.core.model.train_test_split import split
+from sklearn.preprocessing import StandardScaler
+from src.core.model.train_test_split import split, FEATURE_COLUMNS
 
 class TestSplit:
     @pytest.fixture
@@ -104,3 +105,14 @@ class TestSplit:
         # Training data should be approximately normalized (mean ~0, std ~1)
         # Due to binary data, this might not be exact but should be close
         assert np.abs(np.mean(x_train_scaled)) < 0.5
+
+    @patch("src.core.model.train_test_split.get_logger")
+    def test_split_can_return_fitted_scaler(self, mock_get_logger, sample_dataset):
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        
+        x_train_scaled, x_test_scaled, y_train, y_test, scaler = split(sample_dataset, return_scaler=True)
+        
+        assert isinstance(scaler, StandardScaler)
+        raw_test = pd.DataFrame(sample_dataset.loc[y_test.index], columns=FEATURE_COLUMNS)
+        np.testing.assert_array_almost_equal(scaler.transform(raw_test), x_test_scaled)